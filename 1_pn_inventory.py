@@ -5,6 +5,7 @@ import json
 import math
 import time
 import sys  # Needed for sys.exit()
+import numpy as np
 import pandas as pd
 from web3 import Web3
 from decimal import Decimal
@@ -19,6 +20,18 @@ GET_ENERGY_BALANCE = True
 # Maximum number of threads you want to run in parallel.
 MAX_THREADS = 2
 
+# Fields of each game item and nft the inventory needs, shared by the inventory query and its follow up pages
+INVENTORY_GAME_ITEM_FIELDS = "id amount gameItem{ worldEntity{ name } }"
+INVENTORY_NFT_FIELDS = "id name nftType"
+
+# Where --incremental runs keep the last inventory per wallet, and how old that may get before a full rescan
+INVENTORY_SNAPSHOT_DIR = "inventory_snapshots/"
+INVENTORY_FULL_REFRESH_AGE = 24 * 60 * 60
+
+# Balances and energy prefetched for every wallet in batched RPC calls, keyed by lowercase address
+_prefetched_eth_balances = {}
+_prefetched_energy = {}
+
 
 def fetch_user_inputs():
     global GET_ETH_BALANCE, GET_ENERGY_BALANCE
@@ -39,7 +52,9 @@ def merge_data(data_list):
     return merged_data
 
 
-def excel_sheet(json_string, ordered_addresses, file_name_start, max_thread_count=MAX_THREADS):
+def excel_sheet(json_string, ordered_addresses, file_name_start, max_thread_count=MAX_THREADS, stream_excel=False):
+    global _prefetched_eth_balances, _prefetched_energy
+
     print(f"Beginning to construct Excel({max_thread_count} threads)")
     
     # Parse JSON data
@@ -53,23 +68,9 @@ def excel_sheet(json_string, ordered_addresses, file_name_start, max_thread_coun
         # all additional items not listed will appear as their traditional name loaded from the jsaon and after the specified items
         df_data_mappings = pd.read_csv(pn.data_path('InventoryMapping.csv')) 
         data_name_to_display_name = df_data_mappings.set_index('data_name')['display_name'].to_dict()    
-        columns = df_data_mappings['data_name'].tolist() # Define initial columns in the order we want
         mapping_file_loaded = True  # Set flag to True if file is successfully loaded
     except FileNotFoundError:
         print("InventoryMapping.csv not found. Skipping renaming and reordering.")
-        columns = []  # Set to an empty list or a default list of columns if necessary
-
-    # Initialize empty DataFrame with initial columns if mapping file is loaded, else with columns from data
-    if mapping_file_loaded:
-        df = pd.DataFrame(columns=columns)
-    else:
-        # If mapping file is not loaded, initialize DataFrame with default columns from the data
-        if 'accounts' in data['data'] and len(data['data']['accounts']) > 0:
-            df = pd.DataFrame(columns=data['data']['accounts'][0].keys())
-        else:
-            df = pd.DataFrame()
-
-    df = df.dropna(axis=1, how='all')  
 
     eth_to_usd_price = 0
     if GET_ETH_BALANCE:
@@ -93,31 +94,46 @@ def excel_sheet(json_string, ordered_addresses, file_name_start, max_thread_coun
 
     pn.Web3Singleton.get_EnergySystem() # Lets preload this 
 
+    # Prefetch the balances and energy for the whole wallet set in a few batched round trips
+    account_addresses = df_accounts['address'].astype(str).tolist()
+    if GET_ETH_BALANCE:
+        start_time = time.time()
+        _prefetched_eth_balances = pn.get_apex_eth_balance_batch(account_addresses)
+        print(f"Batch fetching balances - execution time: {time.time() - start_time:.2f} seconds")
+    if GET_ENERGY_BALANCE:
+        start_time = time.time()
+        _prefetched_energy = pn.get_energy_batch(account_addresses)
+        print(f"Batch fetching energy - execution time: {time.time() - start_time:.2f} seconds")
+
+    start_time = time.time()
+
     print(f"Iterating over {number_of_accounts} accounts to build the Excel output:")
 
+    # plain dicts per account, iterrows() builds a Series for every row
+    account_rows = df_accounts.to_dict('records')
+
     # Check if max_thread_count is less than or equal to 1
     if max_thread_count <= 1:
         # Process wallets without threads
-        results = [handle_wallet(index + 1, eth_to_usd_price, row) for index, row in df_accounts.iterrows()]
+        results = [handle_wallet(index + 1, eth_to_usd_price, row) for index, row in enumerate(account_rows)]
     else:
         # Using ThreadPoolExecutor to process the wallets.
         with ThreadPoolExecutor(max_workers=max_thread_count) as executor:
             # Map each account to a thread.
-            futures = [executor.submit(handle_wallet, index + 1, eth_to_usd_price, row) for index, row in df_accounts.iterrows()]
+            futures = [executor.submit(handle_wallet, index + 1, eth_to_usd_price, row) for index, row in enumerate(account_rows)]
 
         # Collect results as they come in.
         results = [future.result() for future in futures]
 
-    # Append each result to the main DataFrame.
-    for result in results:
-        df = df._append(result, sort=False)
+    # Build the whole table in one go from the wallet dicts, columns come out in order of first appearance
+    df = pd.DataFrame.from_records(results)
 
     end_time = time.time()
-    avg_execution_time = (end_time - start_time) / number_of_accounts
+    avg_execution_time = (end_time - start_time) / max(number_of_accounts, 1)
     print(f"\nAverage execution time per account ({number_of_accounts}x): {avg_execution_time:.2f} seconds") 
 
     # Replace NaN values with zeros
-    df.fillna(0, inplace=True)
+    df = df.fillna(0)
 
     # Rename columns to be more friendly, and then order them properly
     if mapping_file_loaded:
@@ -135,37 +151,45 @@ def excel_sheet(json_string, ordered_addresses, file_name_start, max_thread_coun
     # otherwise it goes into the base directory
     excel_file_name = pn.add_inventory_data_path(f"{file_name_start}.xlsx")
 
-    xlWriter = pd.ExcelWriter(excel_file_name,engine='xlsxwriter',engine_kwargs={'options': {'strings_to_numbers': True}})
+    # Calculate column sums starting from the 4th column (index 3) to the last
+    column_sums = df.iloc[:, 3:].sum().tolist()  
+
+    if stream_excel:
+        # rows go straight to disk, with the same frozen header, widths and totals row as below
+        with pn.StreamingExcelWriter(excel_file_name, df.columns) as writer:
+            writer.write_rows(df.itertuples(index=False, name=None))
+            writer.write_totals(column_sums, start_column=3)
+    else:
+        xlWriter = pd.ExcelWriter(excel_file_name,engine='xlsxwriter',engine_kwargs={'options': {'strings_to_numbers': True}})
 
-    # Export to Excel
-    df.to_excel(xlWriter, index=False)
+        # Export to Excel
+        df.to_excel(xlWriter, index=False)
 
-    # Get the xlsxwriter workbook and worksheet objects
-    workbook  = xlWriter.book
-    worksheet = xlWriter.sheets['Sheet1']
+        # Get the xlsxwriter workbook and worksheet objects
+        workbook  = xlWriter.book
+        worksheet = xlWriter.sheets['Sheet1']
 
-    # Freeze the first row (row 1, column 0)
-    worksheet.freeze_panes(1, 0)
+        # Freeze the first row (row 1, column 0)
+        worksheet.freeze_panes(1, 0)
 
-    #create a viewable table
-    worksheet.add_table(0, 0, df.shape[0], df.shape[1]-1, {'columns': [{'header': col} for col in df.columns]})
+        #create a viewable table
+        worksheet.add_table(0, 0, df.shape[0], df.shape[1]-1, {'columns': [{'header': col} for col in df.columns]})
 
-    # Calculate column sums starting from the 4th column (index 3) to the last
-    column_sums = df.iloc[:, 3:].sum().tolist()  
+        # Define the row number where you want to insert the sums (e.g., after the last row of the DataFrame)
+        row_number = df.shape[0] + 2  # Adjust the row number as needed
 
-    # Define the row number where you want to insert the sums (e.g., after the last row of the DataFrame)
-    row_number = df.shape[0] + 2  # Adjust the row number as needed
+        # Write the sums to the Excel worksheet starting from the 4th column (index 3)
+        for col_num, value in enumerate(column_sums):
+            worksheet.write(row_number, col_num + 3, value)  # Offset by 3 columns to start from the 4th column
 
-    # Write the sums to the Excel worksheet starting from the 4th column (index 3)
-    for col_num, value in enumerate(column_sums):
-        worksheet.write(row_number, col_num + 3, value)  # Offset by 3 columns to start from the 4th column
+        # Autofit column width to fit the content, the longest content in each column or the column name
+        for i, column_len in enumerate(get_column_widths(df)):
+            worksheet.set_column(i, i, column_len)  # Set the column width to fit        
 
-    # Autofit column width to fit the content
-    for i, col in enumerate(df.columns):
-        column_len = max(df[col].astype(str).str.len().max(), len(col) + 2)  # Get the length of the longest content in the column or column name
-        worksheet.set_column(i, i, column_len)  # Set the column width to fit        
+        xlWriter._save()
 
-    xlWriter._save()
+    # typed columnar copy of the table (without the totals row) for reloading and analysis
+    pn.write_arrow_snapshot(df, pn.snapshot_path_for(excel_file_name))
 
     # Code to export a CSV copy to a directory called inventory only if you have that directory
     if os.path.exists("inventory"):
@@ -176,11 +200,20 @@ def excel_sheet(json_string, ordered_addresses, file_name_start, max_thread_coun
         # Drop columns that are all NA from sums_df
         sums_df = sums_df.dropna(axis=1, how='all')
 
-        df = df._append(sums_df, ignore_index=True)
+        df = pd.concat([df, sums_df], ignore_index=True)
 
         df.to_csv(f"inventory/{file_name_start}.csv", index=False)
 
 
+def get_column_widths(df):
+    """Width for each column: the longest cell as text or the header plus 2, measured over the whole frame at once."""
+    header_lengths = np.array([len(str(col)) + 2 for col in df.columns], dtype=int)
+    if df.empty:
+        return header_lengths.tolist()
+    content_lengths = np.char.str_len(df.astype(str).to_numpy(dtype=str)).max(axis=0)
+    return np.maximum(content_lengths, header_lengths).tolist()
+
+
 account_xp_thresholds = [0,75,160,295,485,720,995,1335,2100,3000]
 
 def calculate_command_rank_and_xp_needed(current_account_xp):
@@ -240,7 +273,10 @@ def handle_wallet(walletID, eth_to_usd_price, row):
 
     # Inside your function where the error occurs
     if GET_ETH_BALANCE:
-        eth_balance_eth, weth_balance = rate_limited_get_apex_eth_balance(address)
+        if address.lower() in _prefetched_eth_balances:
+            eth_balance_eth, weth_balance = _prefetched_eth_balances[address.lower()]
+        else:
+            eth_balance_eth, weth_balance = rate_limited_get_apex_eth_balance(address)
         if eth_balance_eth is not None:
             # Convert eth_balance_eth to Decimal before multiplication
             wallet_data['Apex $'] = round(Decimal(eth_balance_eth) * eth_to_usd_price, 2)
@@ -255,7 +291,10 @@ def handle_wallet(walletID, eth_to_usd_price, row):
 
     # read the active energy for the address
     if GET_ENERGY_BALANCE:
-        energy = rate_limited_get_energy_balance(address)
+        if address.lower() in _prefetched_energy:
+            energy = _prefetched_energy[address.lower()]
+        else:
+            energy = rate_limited_get_energy_balance(address)
         # if we get no energy back, stop trying to get future energy for accounts
         if (energy is None):
             GET_ENERGY_BALANCE = False
@@ -306,10 +345,321 @@ def handle_wallet(walletID, eth_to_usd_price, row):
         # Add the item to the wallet_data dictionary
         wallet_data[name] = amount
 
-    # Create a DataFrame from the wallet_data dictionary
-    local_df = pd.DataFrame([wallet_data])
+    # Return the plain dict, excel_sheet builds the DataFrame once for all wallets
+    return wallet_data
+
+
+# Builds the full inventory query for a formatted address list, _meta gives the block the data is current to.
+# It is a paginated template over the accounts, use fetch_inventory_data to run it
+def build_inventory_query(formatted_output):
+    return f"""
+
+        fragment WorldEntityComponentValueCore on WorldEntityComponentValue {{
+        id
+        fields {{
+            name
+            value
+        }}
+        }}
+
+        fragment WorldEntityCore on WorldEntity {{
+        id
+        components {{
+            ...WorldEntityComponentValueCore
+        }}
+        name
+        }}
+
+        {{
+            _meta {{
+                block {{
+                    number
+                }}
+            }}
+            accounts({pn.PAGE_ARGS}, where: {{address_in: {formatted_output}, {pn.PAGE_WHERE}}}){{
+                id
+                address
+                currencies{{
+                    amount
+                }}
+                gameItems({pn.SUBGRAPH_FIRST_PAGE}, where: {{amount_gt:0}}){{
+                    {INVENTORY_GAME_ITEM_FIELDS}
+                }}
+                nfts({pn.SUBGRAPH_FIRST_PAGE}){{
+                    {INVENTORY_NFT_FIELDS}
+                }}
+                worldEntity{{
+                    ...WorldEntityCore
+                }}        
+            }}
+        }}
+        """
+
+
+# Paginated template for the rest of one account's game items or nfts, past the first page of the inventory query
+def build_account_list_query(address, list_query):
+    return f"""
+        {{
+            accounts(where: {{address: "{address}"}}){{
+                {list_query}
+            }}
+        }}
+        """
+
+
+# Runs the inventory query for addresses in concurrent address chunks, see fetch_inventory_chunk
+def fetch_inventory_data(addresses):
+    return pn.get_accounts_chunked(addresses, fetch_inventory_chunk)
 
-    return local_df
+
+# Runs the inventory query for one chunk of addresses, paging through the accounts and through any account whose
+# game items or nfts run past one page
+def fetch_inventory_chunk(addresses):
+    query = build_inventory_query(pn.format_addresses_for_query(addresses))
+    data = pn.get_data_paginated(query, ['data', 'accounts'], page_size=pn.SUBGRAPH_ACCOUNTS_PAGE_SIZE)
+
+    game_items_query = f"gameItems({pn.PAGE_ARGS}, where: {{amount_gt:0, {pn.PAGE_WHERE}}}){{ {INVENTORY_GAME_ITEM_FIELDS} }}"
+    data = pn.fill_nested_pages(data, ['data', 'accounts'], 'gameItems',
+                                lambda account: build_account_list_query(account['address'], game_items_query),
+                                ['data', 'accounts', 0, 'gameItems'])
+
+    nfts_query = f"nfts({pn.PAGE_ARGS}, where: {{{pn.PAGE_WHERE}}}){{ {INVENTORY_NFT_FIELDS} }}"
+    return pn.fill_nested_pages(data, ['data', 'accounts'], 'nfts',
+                                lambda account: build_account_list_query(account['address'], nfts_query),
+                                ['data', 'accounts', 0, 'nfts'])
+
+
+# Builds a cheap query that returns, per wallet, whether anything it owns changed at or after since_block
+def build_change_probe_query(formatted_output, since_block):
+    changed = f"_change_block: {{number_gte: {since_block}}}"
+    return f"""
+        {{
+            _meta {{
+                block {{
+                    number
+                }}
+            }}
+            changed_accounts: accounts({pn.PAGE_ARGS}, where: {{address_in: {formatted_output}, {changed}, {pn.PAGE_WHERE}}}){{
+                id
+                address
+            }}
+            accounts({pn.PAGE_ARGS}, where: {{address_in: {formatted_output}, {pn.PAGE_WHERE}}}){{
+                id
+                address
+                currencies(where: {{{changed}}}){{
+                    id
+                }}
+                gameItems(first: 1 where: {{{changed}}}){{
+                    id
+                }}
+                nfts(first: 1 where: {{{changed}}}){{
+                    id
+                }}
+                worldEntity{{
+                    components(first: 1 where: {{{changed}}}){{
+                        id
+                    }}
+                }}
+            }}
+        }}
+        """
+
+
+def get_meta_block_number(data):
+    try:
+        return int(data['data']['_meta']['block']['number'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class InventorySnapshotStore:
+    """
+    Keeps the last subgraph inventory of every wallet in an address file, along with the subgraph
+    block it was current to, so the next --incremental run only has to re-query wallets that changed.
+
+    Stored as json under data/inventory_snapshots/inventory_<user_name>.json:
+        {"block": 123, "updated_at": 1700000000.0, "full_refreshed_at": 1700000000.0,
+         "accounts": {"0xabc...": {...account as returned by the subgraph...}}}
+
+    full_refreshed_at only moves on a full query of every wallet. The change probe can't see NFTs leaving a wallet,
+    so the snapshot stops being usable INVENTORY_FULL_REFRESH_AGE after the last full query, however often
+    incremental runs save it.
+    """
+
+    def __init__(self, user_name):
+        self.file_path = pn.data_path(f"{INVENTORY_SNAPSHOT_DIR}inventory_{user_name}.json")
+        self.block = None
+        self.updated_at = 0
+        self.full_refreshed_at = 0
+        self.accounts = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.file_path, 'r') as file:
+                snapshot = json.load(file)
+            self.block = snapshot.get('block')
+            self.updated_at = snapshot.get('updated_at', 0)
+            self.full_refreshed_at = snapshot.get('full_refreshed_at', 0)
+            self.accounts = snapshot.get('accounts', {})
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def save(self, block, accounts, full_refresh=False):
+        self.block = block
+        self.updated_at = time.time()
+        if full_refresh:
+            self.full_refreshed_at = self.updated_at
+        self.accounts = accounts
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            temp_path = f"{self.file_path}.tmp"
+            with open(temp_path, 'w') as file:
+                json.dump({'block': block, 'updated_at': self.updated_at, 'full_refreshed_at': self.full_refreshed_at, 'accounts': accounts}, file)
+            os.replace(temp_path, self.file_path)
+        except OSError as e:
+            print(f"{pn.C_RED}**Could not save inventory snapshot{pn.C_END}: {e}")
+
+    def is_usable(self, max_age=None):
+        max_age = INVENTORY_FULL_REFRESH_AGE if max_age is None else max_age
+        return self.block is not None and bool(self.accounts) and time.time() - self.full_refreshed_at < max_age
+
+
+# Returns (addresses that changed since the snapshot block, current block), or (None, None) if the probe failed
+def get_changed_addresses(addresses, store):
+    data = pn.get_accounts_chunked(addresses, lambda chunk: probe_changed_chunk(chunk, store.block))
+
+    block = get_meta_block_number(data)
+    if block is None:
+        return None, None
+
+    # wallets we have never seen, that the subgraph doesn't return, or whose chunk failed always get the full query
+    unchanged = {account['address'] for account in data['data']['accounts'] if not account['changed']}
+    changed = [address for address in addresses if address not in unchanged or address not in store.accounts]
+    return changed, block
+
+
+# Runs the change probe for one chunk of addresses, returns {'data': {'_meta': ..., 'accounts': [{'address', 'changed'}]}}
+def probe_changed_chunk(addresses, since_block):
+    query = build_change_probe_query(pn.format_addresses_for_query(addresses), since_block)
+
+    # both account lists page on the same id cursor, changed_accounts is a subset so nothing is skipped
+    meta = None
+    changed = set()
+    seen = []
+    for data, page in pn.iter_subgraph_responses(query, ['data', 'accounts'], page_size=pn.SUBGRAPH_ACCOUNTS_PAGE_SIZE):
+        if page is None:
+            return data
+        meta = meta or data['data'].get('_meta')
+        changed.update(account['address'] for account in data['data'].get('changed_accounts') or [])
+        for account in page:
+            seen.append(account['address'])
+            world_entity = account.get('worldEntity') or {}
+            if account.get('currencies') or account.get('gameItems') or account.get('nfts') or world_entity.get('components'):
+                changed.add(account['address'])
+
+    return {'data': {'_meta': meta, 'accounts': [{'address': address, 'changed': address in changed} for address in seen]}}
+
+
+# Flattens an account into {item: amount} for diffing, PGLD, game items, pirates and ships by type
+def summarize_account(account):
+    summary = {}
+    if not account:
+        return summary
+
+    currencies = account.get('currencies') or []
+    if currencies:
+        summary['PGLD'] = math.floor(float(currencies[0]['amount']) / (10 ** 18))
+
+    for game_item in account.get('gameItems') or []:
+        name = game_item['gameItem']['worldEntity']['name']
+        summary[name] = summary.get(name, 0) + int(game_item['amount'])
+
+    for nft in account.get('nfts') or []:
+        name = clean_ship_type(nft['name']) if nft['nftType'] == 'ship' else nft['nftType']
+        summary[name] = summary.get(name, 0) + 1
+
+    return summary
+
+
+# Returns one row per wallet and item whose amount changed between two {address: account} maps
+def diff_inventories(previous_accounts, current_accounts, addresses):
+    delta_rows = []
+    for walletID, address in enumerate(addresses, start=1):
+        before = summarize_account(previous_accounts.get(address))
+        after = summarize_account(current_accounts.get(address))
+        for item in sorted(set(before) | set(after)):
+            change = after.get(item, 0) - before.get(item, 0)
+            if change != 0:
+                delta_rows.append({'walletID': walletID, 'address': address, 'item': item,
+                                   'before': before.get(item, 0), 'after': after.get(item, 0), 'change': change})
+    return delta_rows
+
+
+def print_delta_report(delta_rows, file_name_start):
+    print("------------------------------------------------------")
+    if not delta_rows:
+        print("No inventory changes since the last snapshot")
+    for row in delta_rows:
+        color = pn.C_GREEN if row['change'] > 0 else pn.C_RED
+        print(f"{row['walletID']:>4} {row['address']} {row['item']}: {color}{row['change']:+}{pn.C_END} ({row['before']} -> {row['after']})")
+    print("------------------------------------------------------")
+
+    if delta_rows:
+        delta_file_name = pn.add_inventory_data_path(f"{file_name_start}_delta.csv")
+        pd.DataFrame(delta_rows).to_csv(delta_file_name, index=False)
+        print(f"Wrote inventory changes to {delta_file_name}")
+
+
+# Returns the inventory data for addresses in the same shape as a full query, re-querying only wallets that
+# changed since the stored snapshot, and reports what each wallet gained or lost since then
+def fetch_inventory_incremental(addresses, user_name, full_refresh=False):
+    store = InventorySnapshotStore(user_name)
+    previous_accounts = dict(store.accounts)
+
+    changed_addresses, block = (None, None)
+    if not full_refresh and store.is_usable():
+        changed_addresses, block = get_changed_addresses(addresses, store)
+        if changed_addresses is None:
+            print("Could not check which wallets changed, running a full inventory query")
+
+    full_query = changed_addresses is None
+    if full_query:
+        changed_addresses = addresses
+        print(f"Full inventory query for {len(addresses)} wallets")
+    else:
+        print(f"{len(changed_addresses)} of {len(addresses)} wallets changed since block {store.block}")
+
+    accounts = {address: account for address, account in previous_accounts.items() if address in addresses}
+    if changed_addresses:
+        data = fetch_inventory_data(changed_addresses)
+        failed = set(data.get('failed', []))
+        if failed:
+            # wallets whose chunk failed keep their stored inventory, which is only current to the old snapshot block
+            print(f"{pn.C_RED}Inventory query failed for {len(failed)} wallet(s), using the stored snapshot for those{pn.C_END}")
+            block = store.block
+        else:
+            # unchanged wallets were only checked up to the probe block, so never resume past it; a changed wallet
+            # queried a little later than that just gets re-probed from the older block next time
+            data_block = get_meta_block_number(data)
+            block = data_block if block is None else min(block, data_block or block)
+
+        for address in changed_addresses:
+            if address not in failed:
+                accounts.pop(address, None)
+        for account in data['data']['accounts']:
+            accounts[account['address']] = account
+
+        if block is not None:
+            store.save(block, accounts, full_refresh=full_query and not failed)
+    else:
+        # nothing changed, just move the snapshot up to the probed block
+        store.save(block, accounts)
+
+    if previous_accounts:
+        print_delta_report(diff_inventories(previous_accounts, accounts, addresses), f"inventory_{user_name}")
+
+    return {"data": {"accounts": [accounts[address] for address in addresses if address in accounts]}}
 
 
 @limits(calls=10, period=1)
@@ -331,9 +681,19 @@ def main():
     # Add the --max_threads argument with a default value of 3
     parser.add_argument("--max_threads", type=int, default=MAX_THREADS, help=f"Maximum number of threads (default: {MAX_THREADS})")
 
+    # Add the --incremental and --full_refresh arguments
+    parser.add_argument("--incremental", action="store_true", help="Only re-query wallets that changed since the last --incremental run, and report what changed")
+    parser.add_argument("--full_refresh", action="store_true", help="With --incremental, re-query every wallet and reset the snapshot")
+
+    # Add the --stream_excel argument for very large exports
+    parser.add_argument("--stream_excel", action="store_true", help="Stream rows to the Excel file in constant memory mode (header gets an autofilter instead of a table)")
+
     # Parse the command-line arguments
     args = parser.parse_args()
 
+    # size the shared RPC and subgraph connection pools to the worker threads that will share them
+    pn.configure_connection_pools(args.max_threads)
+
     try:
         file_path = pn.select_file(directory_path="addresses/", prefix="addresses_", file_extension=".txt")
         
@@ -350,7 +710,6 @@ def main():
             sys.exit(1)
 
         user_name = file_path.split('_')[1].split('.')[0]
-        formatted_output = pn.format_addresses_for_query(addresses)
 
         # Proceed with the rest of your logic here...
 
@@ -363,59 +722,22 @@ def main():
 
     start_time = time.time()
 
-    query = f"""
-
-        fragment WorldEntityComponentValueCore on WorldEntityComponentValue {{
-        id
-        fields {{
-            name
-            value
-        }}
-        }}
-
-        fragment WorldEntityCore on WorldEntity {{
-        id
-        components {{
-            ...WorldEntityComponentValueCore
-        }}
-        name
-        }}
-
-        {{
-            accounts(where: {{address_in: {formatted_output}}}){{
-                address
-                currencies{{
-                    amount
-                }}
-                gameItems(first: 1000 where: {{amount_gt:0}}){{
-                    amount
-                    gameItem{{
-                        worldEntity{{
-                            name
-                        }}
-                    }}
-                }}
-                nfts(first: 1000){{
-                    name
-                    nftType
-                }}
-                worldEntity{{
-                    ...WorldEntityCore
-                }}        
-            }}
-        }}
-        """
-    data = pn.get_data(query)
+    if args.incremental:
+        data = fetch_inventory_incremental(addresses, user_name, full_refresh=args.full_refresh)
+    else:
+        data = fetch_inventory_data(addresses)
 
     end_time = time.time()
     execution_time = end_time - start_time
     print(f"Building Data - execution time: {execution_time:.2f} seconds")
 
     start_time = time.time()
-    excel_sheet(json.dumps(data, indent=4), addresses, f"inventory_{user_name}", args.max_threads)
+    excel_sheet(json.dumps(data, indent=4), addresses, f"inventory_{user_name}", args.max_threads, args.stream_excel)
     end_time = time.time()
     execution_time = end_time - start_time
     print(f"Creating excel from data - execution time: {execution_time:.2f} seconds") 
 
+    pn.print_connection_pool_stats()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import argparse
 import time
 import pandas as pd
 from datetime import datetime, timedelta
@@ -8,6 +9,10 @@ import pn_helper as pn
 start_time = time.time() 
 print("Starting Script...")
 
+parser = argparse.ArgumentParser(description="Exports the pirates for a set of wallets into an excel sheet")
+parser.add_argument("--stream_excel", action="store_true", help="Stream rows to the Excel file in constant memory mode (header gets an autofilter instead of a table)")
+args = parser.parse_args()
+
 #-------- FUNCTIONS -----------------------------------------
 
 # expertise mapping of number to actual readable name
@@ -121,40 +126,57 @@ def merge_price_data(source_df, price_data_file=pn.data_path('pirate_price.csv')
 file_path = pn.select_file(directory_path="addresses/",prefix="addresses_",file_extension=".txt")
 user_name = file_path.split('_')[1].split('.')[0]
 addresses = pn.read_addresses(file_path)
-formatted_output = pn.format_addresses_for_query(addresses)
 address_id_dict = {address: i+1 for i, address in enumerate(addresses)}
 
-# GraphQL Query to get all the pirate data based off of all the addresses in the text file
-query = f"""
-{{
-    accounts(where: {{address_in: {formatted_output}}}) {{
-        address
-        nfts(first: 1000, where: {{
-            or: [
-                {{ nftType: "pirate" }},
-                {{ nftType: "starterpirate" }}
-            ]
-        }}) {{
+# Fields of each pirate, shared by the main query and the follow up pages for wallets holding more than one page of pirates
+PIRATE_NFT_FIELDS = """
+            id
             tokenId
             nftType
-            claimedMilestones {{
+            claimedMilestones {
                 milestoneIndex
-            }}
+            }
             imageUrl
             lastTransfer
-            traits {{
+            traits {
                 value
-                metadata {{
+                metadata {
                     name
-                }}
-            }}
+                }
+            }"""
+
+# GraphQL Query to get all the pirate data for a chunk of the addresses in the text file, paginated over the accounts
+def make_pirates_query(formatted_output):
+    return f"""
+{{
+    accounts({pn.PAGE_ARGS}, where: {{address_in: {formatted_output}, {pn.PAGE_WHERE}}}) {{
+        id
+        address
+        nfts({pn.SUBGRAPH_FIRST_PAGE}, where: {{nftType_in: ["pirate", "starterpirate"]}}) {{
+            {PIRATE_NFT_FIELDS}
         }}
     }}
 }}
 """
 
-# Step 2: Fetch the Data using the query from the PN Graph API 
-data = pn.get_data(query)
+# wallets with more pirates than fit in one page get the rest paged in separately
+def account_pirates_query(account):
+    return f"""
+{{
+    accounts(where: {{address: "{account['address']}"}}) {{
+        nfts({pn.PAGE_ARGS}, where: {{nftType_in: ["pirate", "starterpirate"], {pn.PAGE_WHERE}}}) {{
+            {PIRATE_NFT_FIELDS}
+        }}
+    }}
+}}
+"""
+
+def fetch_pirates_chunk(chunk):
+    data = pn.get_data_paginated(make_pirates_query(pn.format_addresses_for_query(chunk)), ['data', 'accounts'], page_size=pn.SUBGRAPH_ACCOUNTS_PAGE_SIZE)
+    return pn.fill_nested_pages(data, ['data', 'accounts'], 'nfts', account_pirates_query, ['data', 'accounts', 0, 'nfts'])
+
+# Step 2: Fetch the Data from the PN Graph API, in concurrent chunks of addresses
+data = pn.get_accounts_chunked(addresses, fetch_pirates_chunk)
 
 # Prepare data to export 
 data_to_export = []
@@ -265,10 +287,6 @@ file_name_start = f"pirates_{user_name}"
 excel_file_name = pn.add_inventory_data_path(f"pirates_{user_name}.xlsx")
 xlsx_inventory_data_path = pn.data_path("inventory")
 
-xlWriter = pd.ExcelWriter(excel_file_name,
-                        engine='xlsxwriter',
-                        engine_kwargs={'options': {'strings_to_numbers': True}})
-
 # Create the DataFrame and reorder the columns
 df_to_export = pd.DataFrame(data_to_export_sorted)
 df_to_export = df_to_export.reindex(columns=column_order)
@@ -297,25 +315,37 @@ print("------------------------------------------------------")
 print(f"{num_rows_used} pirates with {average_level_rounded:.2f} average level, {average_price_rounded:.4f} average price, {total_price} Eth total")
 print("------------------------------------------------------")
 
-# Export to Excel
-df_to_export.to_excel(xlWriter, index=False)
+if args.stream_excel:
+    # rows go straight to disk, with the same frozen header and column widths as below
+    with pn.StreamingExcelWriter(excel_file_name, df_to_export.columns) as writer:
+        writer.write_rows(df_to_export.itertuples(index=False, name=None))
+else:
+    xlWriter = pd.ExcelWriter(excel_file_name,
+                            engine='xlsxwriter',
+                            engine_kwargs={'options': {'strings_to_numbers': True}})
+
+    # Export to Excel
+    df_to_export.to_excel(xlWriter, index=False)
+
+    # Get the xlsxwriter workbook and worksheet objects
+    workbook = xlWriter.book
+    worksheet = xlWriter.sheets['Sheet1']
 
-# Get the xlsxwriter workbook and worksheet objects
-workbook = xlWriter.book
-worksheet = xlWriter.sheets['Sheet1']
+    # Freeze the first row (row 1, column 0)
+    worksheet.freeze_panes(1, 0)
+    worksheet.add_table(0, 0, df_to_export.shape[0], df_to_export.shape[1] - 1, {'columns': [{'header': col} for col in df_to_export.columns]})
 
-# Freeze the first row (row 1, column 0)
-worksheet.freeze_panes(1, 0)
-worksheet.add_table(0, 0, df_to_export.shape[0], df_to_export.shape[1] - 1, {'columns': [{'header': col} for col in df_to_export.columns]})
+    # Autofit column width to fit the content
+    for i, col in enumerate(df_to_export.columns):
+        column_len = max(df_to_export[col].astype(str).str.len().max(), len(col) + 2)  # Get the length of the longest content in the column or column name
+        worksheet.set_column(i, i, column_len)  # Set the column width to fit
 
-# Autofit column width to fit the content
-for i, col in enumerate(df_to_export.columns):
-    column_len = max(df_to_export[col].astype(str).str.len().max(), len(col) + 2)  # Get the length of the longest content in the column or column name
-    worksheet.set_column(i, i, column_len)  # Set the column width to fit
+    #worksheet.write(df_to_export.shape[0] + 1, 2, average_level) 
 
-#worksheet.write(df_to_export.shape[0] + 1, 2, average_level) 
+    xlWriter._save()
 
-xlWriter._save()
+# typed columnar copy of the table for reloading and analysis, 9_pirate_images.py reads this when it is current
+pn.write_arrow_snapshot(df_to_export, pn.snapshot_path_for(excel_file_name))
 
 end_time = time.time()
 execution_time = end_time - start_time
@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import math
 import time
 import functools
@@ -10,12 +11,14 @@ import pn_quest as PNQ
 from concurrent.futures import ThreadPoolExecutor
 
 MAX_THREADS = 2
-SLOW_FACTOR = 0.5  
+MAX_CONCURRENCY = pn.DEFAULT_ASYNC_CONCURRENCY
    
 _pending_bounties = {}
 _successfully_started_bounties = {}
 _fallback_bounties = []
 _pirate_ids_dict = {}
+_active_bounty_ids_dict = {}
+_bounty_index = PNB.BountyIndex()
 
 
 def input_choose_bounty(prompt="Please select the default bounty you're interested in:"):
@@ -59,10 +62,99 @@ def input_choose_bounty(prompt="Please select the default bounty you're interest
     return selected_group_id, selected_bounty_name
 
 
-def process_address(args, web3, bounty_contract, bounty_data, row, is_multi_threaded):
+class SyncBountyCalls:
+    """
+    The contract reads and transactions process_wallet makes for one wallet, done with blocking web3 calls
+    for the sequential and thread pool modes. The methods are coroutines only so process_wallet can await them,
+    each one blocks its thread until the call is done.
+    """
 
-    global _pending_bounties
-    global _successfully_started_bounties
+    def __init__(self, web3, bounty_contract, address, private_key, fire_and_forget=False):
+        self.web3 = web3
+        self.bounty_contract = bounty_contract
+        self.address = address
+        self.private_key = private_key
+        self.fire_and_forget = fire_and_forget
+
+    async def active_bounty_ids(self):
+        active_bounty_ids, execution_time = PNB.rate_limited_active_bounty_ids(self.bounty_contract, self.address)
+        return active_bounty_ids
+
+    async def end_bounties(self, active_bounty_ids, buffer):
+        if self.fire_and_forget:
+            # submit every endBounty back-to-back, then wait for all of them before starting anything new
+            submitted = [(active_bounty_id, *PNB.submit_end_bounty(self.web3, self.bounty_contract, self.address, self.private_key, active_bounty_id))
+                         for active_bounty_id in active_bounty_ids]
+            return [PNB.collect_end_bounty(active_bounty_id, handle, error, buffer) for active_bounty_id, handle, error in submitted]
+        return [PNB.rate_limited_end_bounty(self.web3, self.bounty_contract, self.address, self.private_key, active_bounty_id, buffer)
+                for active_bounty_id in active_bounty_ids]
+
+    async def pending_by_group(self, group_ids):
+        # one aggregated call for every group
+        return PNB.get_has_pending_bounty_batch(self.bounty_contract, self.address, group_ids) if group_ids else {}
+
+    async def has_pending_bounty(self, group_id):
+        return PNB.rate_limited_has_pending_bounty(self.bounty_contract, self.address, group_id)
+
+    async def start_bounty(self, bounty_name, bounty_id, entity_ids, buffer):
+        return PNB.rate_limited_start_bounty(self.web3, self.bounty_contract, self.address, self.private_key, bounty_name, bounty_id, entity_ids, buffer)
+
+    def submit_start_bounty(self, bounty_id, entity_ids):
+        return PNB.submit_start_bounty(self.web3, self.bounty_contract, self.address, self.private_key, bounty_id, entity_ids)
+
+
+class AsyncBountyCalls:
+    """
+    The same calls as SyncBountyCalls for the asyncio mode: every RPC call yields to the event loop so all wallets
+    make progress together. Calls for one wallet still run in order since they share a nonce.
+    Fire and forget isn't supported here, parse_arguments rejects it with --async_mode.
+    """
+
+    fire_and_forget = False
+
+    def __init__(self, web3, bounty_contract, address, private_key):
+        self.web3 = web3
+        self.bounty_contract = bounty_contract
+        self.address = address
+        self.private_key = private_key
+
+    async def active_bounty_ids(self):
+        return await PNB.async_active_bounty_ids(self.bounty_contract, self.address)
+
+    async def end_bounties(self, active_bounty_ids, buffer):
+        return [await PNB.async_end_bounty(self.web3, self.bounty_contract, self.address, self.private_key, active_bounty_id, buffer)
+                for active_bounty_id in active_bounty_ids]
+
+    async def pending_by_group(self, group_ids):
+        # one concurrent read per group
+        group_ids = list(dict.fromkeys(group_ids))
+        results = await asyncio.gather(*[PNB.async_has_pending_bounty(self.bounty_contract, self.address, group_id) for group_id in group_ids])
+        return dict(zip(group_ids, results))
+
+    async def has_pending_bounty(self, group_id):
+        return await PNB.async_has_pending_bounty(self.bounty_contract, self.address, group_id)
+
+    async def start_bounty(self, bounty_name, bounty_id, entity_ids, buffer):
+        return await PNB.async_start_bounty(self.web3, self.bounty_contract, self.address, self.private_key, bounty_name, bounty_id, entity_ids, buffer)
+
+
+def finish_wallet_buffer(buffer, start_time):
+    execution_time = time.time() - start_time
+    buffer.append(f"\n   {pn.C_CYAN}Execution time: {execution_time:.2f} seconds, ending @ {pn.formatted_time_str()}{pn.C_END}")
+    buffer.append(f"{pn.C_GREEN}---------------------------------------------------------------------------{pn.C_END}")
+    print("\n".join(buffer))
+
+
+async def process_wallet(args, calls, bounty_index, row):
+    """
+    Ends and starts the bounties for one wallet. This holds every decision for the wallet, the reads and
+    transactions go through calls (SyncBountyCalls or AsyncBountyCalls) so all modes behave the same.
+
+    Returns:
+        buffer (list): The wallet's output lines.
+        num_ended_bounties (int): How many bounties were ended.
+        num_started_bounties (int): How many bounties were started.
+    """
 
     start_time = time.time()
 
@@ -73,35 +165,25 @@ def process_address(args, web3, bounty_contract, bounty_data, row, is_multi_thre
 
     wallet = row['identifier']
     address = row['address']
-    private_key = row['key']
-
-    if is_multi_threaded: print(f"{pn.C_YELLOWLIGHT}starting thread for wallet {wallet}{pn.C_END}")
 
     buffer.append(f"{pn.C_GREEN}---------------------------------------------------------------------------")
     buffer.append(f"--------------{pn.C_END} {wallet} - {address}")
     buffer.append(f"{pn.C_GREEN}---------------------------------------------------------------------------{pn.C_END}")
 
-    # read the activeBounties for the address
-    active_bounty_ids, execution_time = PNB.rate_limited_active_bounty_ids(bounty_contract, address)
+    # read the activeBounties for the address, preferring the batch prefetched in body_logic
+    active_bounty_ids = _active_bounty_ids_dict.get(address.lower())
+    if active_bounty_ids is None:
+        active_bounty_ids = await calls.active_bounty_ids()
     active_bounty_count = len(active_bounty_ids)
-    
-    #buffer.append(f"\n   Active Bounty IDs: {result}")
-    #buffer.append(f"   fetched in {execution_time:.2f} seconds\n")
 
     # handle ending of bounties if we have the end flag set
     if args.end:
-        for active_bounty_id in active_bounty_ids:
-            end_bounty_result = PNB.rate_limited_end_bounty(web3, bounty_contract, address, private_key, active_bounty_id, buffer)
-            active_bounty_count -= end_bounty_result
-            num_ended_bounties += end_bounty_result     
+        num_ended_bounties = sum(await calls.end_bounties(active_bounty_ids, buffer))
+        active_bounty_count -= num_ended_bounties
 
     # if we don't have start bounties set then continue and skip all the remaining code below
     if not args.start:
-        end_time = time.time()
-        execution_time = end_time - start_time
-        buffer.append(f"\n   {pn.C_CYAN}Execution time: {execution_time:.2f} seconds, ending @ {pn.formatted_time_str()}{pn.C_END}")
-        buffer.append(f"{pn.C_GREEN}---------------------------------------------------------------------------{pn.C_END}")   
-        print("\n".join(buffer))
+        finish_wallet_buffer(buffer, start_time)
         return buffer, num_ended_bounties, num_started_bounties
 
     # load up all the pirate IDs per address
@@ -115,11 +197,7 @@ def process_address(args, web3, bounty_contract, bounty_data, row, is_multi_thre
 
     if active_bounty_count == len(pirate_ids) :
         buffer.append(f"   {pn.C_MAGENTA}All {active_bounty_count} pirate(s) are on active bounties. {pn.C_END}\n")
-        end_time = time.time()
-        execution_time = end_time - start_time
-        buffer.append(f"\n   {pn.C_CYAN}Execution time: {execution_time:.2f} seconds, ending @ {pn.formatted_time_str()}{pn.C_END}")
-        buffer.append(f"{pn.C_GREEN}---------------------------------------------------------------------------{pn.C_END}")   
-        print("\n".join(buffer))
+        finish_wallet_buffer(buffer, start_time)
 
         pn.insert_address_into_dictionary(_pending_bounties,f"Wallets with {active_bounty_count} pirate(s) and Unknown active bounty",address)    
 
@@ -131,44 +209,61 @@ def process_address(args, web3, bounty_contract, bounty_data, row, is_multi_thre
     # make a copy of the fall_back bounties to remove bounties out of it to prevent redundacy
     _fallback_bounties_copy = list(_fallback_bounties)  
 
+    # read the pending state of every group this wallet might start up front
+    # started groups are dropped from the fallback copy below, so these values stay valid for the whole wallet
+    groups_to_check = list(bounties_to_execute.keys()) + [group_id for group_id, bounty_name in _fallback_bounties_copy]
+    pending_by_group = await calls.pending_by_group(groups_to_check)
+
+    # any group the up front read failed for is checked on its own
+    async def has_pending_bounty(group_id):
+        has_pending_bounty = pending_by_group.get(group_id)
+        if has_pending_bounty is None:
+            has_pending_bounty = await calls.has_pending_bounty(group_id)
+        return has_pending_bounty
+
+    def record_started_bounty(group_id, bounty_name, bounty_result):
+        # insert results into successfully started bounties, and since we started this bounty drop it from the fallbacks
+        pn.insert_address_into_dictionary(_successfully_started_bounties, bounty_name, address)
+        if (group_id, bounty_name) in _fallback_bounties_copy:
+            _fallback_bounties_copy.remove((group_id, bounty_name))
+        return bounty_result
+
     buffer.append(f"{pn.C_MAGENTA}   Excel Specified Bounties...{pn.C_END}\n")    
     if len(bounties_to_execute.items()) == 0:
         buffer.append("   None")
 
+    # in fire and forget mode the Excel specified bounties are submitted in the loop below and collected right after it
+    submitted_starts = []
+
     # Now loop over bounties to execute and execute them
     for group_id, entity_ids in bounties_to_execute.items():   
 
-        bounty_name, bounty_id = PNB.get_bounty_name_and_id(bounty_data, group_id, entity_ids)
-        bounty_result = 0
-        
+        bounty_name, bounty_id = PNB.get_bounty_name_and_id(bounty_index, group_id, entity_ids)
+
         # start bounty if we find a valid bounty
         if bounty_id != 0:
 
             # check first if we have a pending bounty, because we will not try to send pirates on a bounty that's pending
-            has_pending_bounty = PNB.rate_limited_has_pending_bounty(bounty_contract, address, group_id) 
+            has_pending = await has_pending_bounty(group_id)
 
-            print(f"{has_pending_bounty}, {bounty_contract.address} , {address}, {group_id}")  
+            print(f"{has_pending}, {calls.bounty_contract.address} , {address}, {group_id}")  
             
-            if has_pending_bounty:
+            if has_pending:
                 buffer.append(f"   {pn.C_YELLOW}{bounty_name} is still pending{pn.C_END}\n")
                 pn.insert_address_into_dictionary(_pending_bounties,bounty_name,address) 
+            elif calls.fire_and_forget:
+                handle, status_msg = calls.submit_start_bounty(bounty_id, entity_ids)
+                submitted_starts.append((group_id, bounty_name, bounty_id, entity_ids, handle, status_msg))
             else:
-                bounty_result = PNB.rate_limited_start_bounty(web3, bounty_contract, address, private_key, bounty_name, bounty_id, entity_ids, buffer)
-
-                # if the bounty was successfully executed
+                bounty_result = await calls.start_bounty(bounty_name, bounty_id, entity_ids, buffer)
                 if bounty_result > 0 :
-                    # insert results into successfully started bounties
-                    pn.insert_address_into_dictionary(_successfully_started_bounties, bounty_name, address)
+                    num_started_bounties += record_started_bounty(group_id, bounty_name, bounty_result)
 
-                    # increment our number of started bounties
-                    num_started_bounties += bounty_result
-
-                    # since we started this bounty, check if it's in the fallback bounties and remove it if it is
-                    if (group_id, bounty_name) in _fallback_bounties_copy:
-                        _fallback_bounties_copy.remove((group_id, bounty_name))
-
-                # Delay to allow the network to update the nonce
-                time.sleep(SLOW_FACTOR) 
+    # collect the fire and forget starts now that they have all been submitted
+    for group_id, bounty_name, bounty_id, entity_ids, handle, status_msg in submitted_starts:
+        bounty_result = PNB.collect_start_bounty(handle, status_msg, bounty_name, bounty_id, entity_ids, buffer)
+        if bounty_result > 0 :
+            num_started_bounties += record_started_bounty(group_id, bounty_name, bounty_result)
 
     buffer.append(f"\n{pn.C_MAGENTA}   Fallback Bounty Pirates...{pn.C_END}\n")
 
@@ -185,14 +280,11 @@ def process_address(args, web3, bounty_contract, bounty_data, row, is_multi_thre
 
                 bounty_result = 0
                 group_id, bounty_name = fallback_bounty
-                entity_ids = []
-                entity_ids.append(entity_id)
-                bounty_name, bounty_id = PNB.get_bounty_name_and_id(bounty_data, group_id, entity_ids)
+                entity_ids = [entity_id]
+                bounty_name, bounty_id = PNB.get_bounty_name_and_id(bounty_index, group_id, entity_ids)
 
                 # check first if we have a pending bounty, because we will not try to send pirates on a bounty that's pending
-                has_pending_bounty = PNB.rate_limited_has_pending_bounty(bounty_contract, address, group_id)      
-                
-                if has_pending_bounty:
+                if await has_pending_bounty(group_id):
                     _fallback_bounties_to_remove.append(fallback_bounty)
 
                     address_str, token_id = pn.entity_to_token(entity_id)
@@ -202,9 +294,7 @@ def process_address(args, web3, bounty_contract, bounty_data, row, is_multi_thre
 
                     pn.insert_address_into_dictionary(_pending_bounties,bounty_name,address) 
                 else:
-                    bounty_result = PNB.rate_limited_start_bounty(web3, bounty_contract, address, private_key, bounty_name, bounty_id, entity_ids, buffer)
-                    # Delay to allow the network to update the nonce
-                    time.sleep(SLOW_FACTOR) 
+                    bounty_result = await calls.start_bounty(bounty_name, bounty_id, entity_ids, buffer)
                 
                 # If the fallback bounty was a success then increment the number of started bounties and break the fallback loop for this enity
                 if bounty_result == 1:
@@ -219,14 +309,52 @@ def process_address(args, web3, bounty_contract, bounty_data, row, is_multi_thre
     else:
         buffer.append("   None")
 
-    end_time = time.time()
-    execution_time = end_time - start_time
-    buffer.append(f"\n   {pn.C_CYAN}Execution time: {execution_time:.2f} seconds, ending @ {pn.formatted_time_str()}{pn.C_END}")
-    buffer.append(f"{pn.C_GREEN}---------------------------------------------------------------------------{pn.C_END}")    
-    print("\n".join(buffer))
+    finish_wallet_buffer(buffer, start_time)
     return buffer, num_ended_bounties, num_started_bounties
 
 
+# Runs one wallet with blocking calls, from the main thread or a thread pool worker
+def process_address(args, web3, bounty_contract, bounty_index, row, is_multi_threaded):
+    if is_multi_threaded: print(f"{pn.C_YELLOWLIGHT}starting thread for wallet {row['identifier']}{pn.C_END}")
+
+    calls = SyncBountyCalls(web3, bounty_contract, row['address'], row['key'], args.fire_and_forget)
+    return asyncio.run(process_wallet(args, calls, bounty_index, row))
+
+
+# Runs one wallet on the shared event loop of the asyncio mode
+async def process_address_async(args, web3, bounty_contract, bounty_index, row):
+    calls = AsyncBountyCalls(web3, bounty_contract, row['address'], row['key'])
+    return await process_wallet(args, calls, bounty_index, row)
+
+
+async def process_addresses_async(args, bounty_index, df_addresses):
+    """
+    Runs process_address_async for every wallet on one event loop and returns the (ended, started) totals.
+    A failure in one wallet is reported and does not cancel the others.
+    """
+
+    # the limiter and the async provider's session belong to the running loop, so set them up inside it
+    pn.configure_async_concurrency(args.max_concurrency)
+    web3 = pn.AsyncWeb3Singleton.get_web3_Apex()
+    bounty_contract = pn.AsyncWeb3Singleton.get_BountySystem()
+
+    rows = [row for index, row in df_addresses.iterrows()]
+    results = await asyncio.gather(*[process_address_async(args, web3, bounty_contract, bounty_index, row) for row in rows],
+                                   return_exceptions=True)
+
+    ended_bounties = 0
+    started_bounties = 0
+    for row, result in zip(rows, results):
+        if isinstance(result, Exception):
+            print(f"{pn.C_RED}**Error processing wallet {row['identifier']}{pn.C_END}: {type(result).__name__} - {result}")
+            continue
+        buffer, num_ended_bounties, num_started_bounties = result
+        ended_bounties += num_ended_bounties
+        started_bounties += num_started_bounties
+
+    return ended_bounties, started_bounties
+
+
 def retry(max_retries=3, delay_seconds=300):
     def decorator_retry(func):
         @functools.wraps(func)
@@ -256,7 +384,8 @@ def body_logic(args, df_addresses):
 
     global _pending_bounties
     global _successfully_started_bounties
-    global _pirate_ids_dict    
+    global _pirate_ids_dict
+    global _active_bounty_ids_dict
 
     # Set the times left to loop to the loop limit, if the arg is specified
     # This just helps create a limit on how many times we can loop
@@ -280,8 +409,9 @@ def body_logic(args, df_addresses):
         ended_bounties = 0
         started_bounties = 0
 
-        # Load the JSON data from the file
-        bounty_data = pn.get_data(PNB.bounty_query)
+        # Load the bounty definitions and fold them into the bounty index, only groups whose tiers changed are rebuilt
+        _bounty_index.refresh(pn.get_data_paginated(PNB.bounty_query, PNB.bounty_query_path, cache_ttl=pn.SUBGRAPH_TTL_BOUNTIES))
+        bounty_index = _bounty_index
 
         # reload the pirate bounty mappings, because this could change between loop iterations and we want to reflect changes
         pn._pirate_command_mappings.reload_data()
@@ -290,13 +420,21 @@ def body_logic(args, df_addresses):
         addresses_list = df_addresses['address'].tolist()
         _pirate_ids_dict = pn.get_pirate_ids_dictionary(addresses_list)
 
+        # read the active bounties for every wallet in a few batched round trips instead of one call per wallet
+        _active_bounty_ids_dict = PNB.get_active_bounty_ids_batch(bounty_contract, addresses_list)
+
+        # CODE if we are going to run all wallets concurrently on one event loop
+        if args.async_mode:
+            print(f"Initiating asyncio mode with up to {args.max_concurrency} requests in flight")
+            ended_bounties, started_bounties = asyncio.run(process_addresses_async(args, bounty_index, df_addresses))
+
         # CODE if we are going to run bounties multithreaded 
-        if args.max_threads > 1 :
+        elif args.max_threads > 1 :
             print("Initiating Multithreading")
 
             with ThreadPoolExecutor(max_workers=args.max_threads) as executor:
                 # Submit jobs to the executor
-                futures = [executor.submit(process_address, args, web3, bounty_contract, bounty_data, row, True) 
+                futures = [executor.submit(process_address, args, web3, bounty_contract, bounty_index, row, True) 
                     for index, row in df_addresses.iterrows()]
 
                 # Collect results as they come in
@@ -308,7 +446,7 @@ def body_logic(args, df_addresses):
         # if we are going to go in order sequentially
         else:
             for index, row in df_addresses.iterrows():
-                buffer, num_ended_bounties, num_started_bounties = process_address(args, web3, bounty_contract, bounty_data, row, False)
+                buffer, num_ended_bounties, num_started_bounties = process_address(args, web3, bounty_contract, bounty_index, row, False)
                 time.sleep(5)
                 ended_bounties += num_ended_bounties
                 started_bounties += num_started_bounties
@@ -318,6 +456,12 @@ def body_logic(args, df_addresses):
         number_of_wallets = len(df_addresses)
         average_execution_time = execution_time / number_of_wallets 
 
+        pn.print_connection_pool_stats()
+
+        if args.fire_and_forget:
+            pn.drain_transactions()
+            pn.print_transaction_summary()
+
         print(f"\nclaimed {ended_bounties} bounties and started {started_bounties} bounties in {execution_time:.2f} seconds (avg of {average_execution_time:.2f} s for {number_of_wallets} wallet(s))")        
         
         # Now we try to print out the pending bounties and the started bounty summary
@@ -375,6 +519,15 @@ def parse_arguments():
     
     parser.add_argument("--max_threads", type=int, default=MAX_THREADS, help="Maximum number of threads (default: 2)")
 
+    parser.add_argument("--async_mode", action="store_true", default=False,
+                        help="Process all wallets concurrently on an asyncio event loop instead of a thread pool")
+
+    parser.add_argument("--max_concurrency", type=int, default=MAX_CONCURRENCY,
+                        help=f"Maximum number of in-flight RPC requests in async mode (default: {MAX_CONCURRENCY})")
+
+    parser.add_argument("--fire_and_forget", action="store_true", default=False,
+                        help="Submit each wallet's endBounty/startBounty transactions back-to-back and collect receipts in the background")
+
     parser.add_argument("--delay_start", type=int, default=0, help="Delay in minutes before executing logic of the code (default: 0)")    
     
     parser.add_argument("--delay_loop", type=int, default=0, help="Delay in minutes before executing the code again code (default: 0)")
@@ -387,8 +540,14 @@ def parse_arguments():
 
     parser.add_argument("--wallets", type=str, default=None, help="Specify the wallet range you'd like (e.g., 1-10,15,88-92) (default: None)") 
 
+    pn.add_subgraph_cache_argument(parser)
+
     args = parser.parse_args()
-    
+
+    # the asyncio calls wait on every transaction inline, there is no background tracker to hand them to
+    if args.fire_and_forget and args.async_mode:
+        parser.error("--fire_and_forget can't be combined with --async_mode")
+
     return args
 
 
@@ -401,14 +560,23 @@ def main():
     print("endBounty:", args.end)
     print("startBounty:", args.start)
     print("max_threads:", args.max_threads)
+    print("async_mode:", args.async_mode)
+    print("max_concurrency:", args.max_concurrency)
+    print("fire_and_forget:", args.fire_and_forget)
     print("delay_start:", args.delay_start)
     print("delay_loop:", args.delay_loop)
     print("fallback_group_ids:", args.fallback_group_ids)
     print("loop limit: ", args.loop_limit)
     print("loop_buffer:", args.loop_buffer)
     print("wallets:", args.wallets)
+    print("subgraph_cache:", args.subgraph_cache)
     print("Time:", pn.formatted_time_str())
 
+    pn.set_subgraph_cache_mode(args.subgraph_cache)
+
+    # size the shared RPC and subgraph connection pools to the worker threads that will share them
+    pn.configure_connection_pools(args.max_threads)
+
     # Load data from csv file
     if args.wallets: 
 
@@ -1,37 +1,53 @@
 import argparse
 import random
 import time
-import pandas as pd
-import os
-import subprocess
+import numpy as np
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from eth_utils import to_checksum_address
-from itertools import cycle
+from ratelimit import limits, sleep_and_retry
 import pn_helper as pn
 
+# Worker threads submitting transfers in --automate mode, 1 keeps the old one at a time loop
+MAX_THREADS = 4
+
+# Global cap on transfers submitted per second across every worker thread
+MAX_SENDS_PER_SECOND = 4
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Script to move items. requires pn_collect_items_config.csv and referenced files')
 
     # Add the 'automate' argument
     parser.add_argument('--automate', action='store_true', help='Automate the process')
 
+    pn.add_subgraph_cache_argument(parser)
+
     parser.add_argument("--itemIds", type=str, default=None, help="Specify the itemIds you'd like to move (default: None)") 
 
+    parser.add_argument("--max_threads", type=int, default=MAX_THREADS, help=f"Senders transferring at once with --automate (default: {MAX_THREADS})")
+
+    parser.add_argument("--rate_limit", type=int, default=MAX_SENDS_PER_SECOND, help=f"Maximum transfers submitted per second across all threads (default: {MAX_SENDS_PER_SECOND})")
+
     return parser.parse_args()
 
 #batch_transfer(web3, game_items_contract, recipient_address, operator_address, private_key, wallet_address, token_ids, amounts)
+# Builds the safeBatchTransferFrom transaction, with the next nonce for the operator
+def build_batch_transfer_txn(web3, contract, recipient, operator, wallet_address, token_ids, amounts):
+    txn_dict = {
+        'from': operator,
+        'to': contract.address,
+        'value': 0,
+        'gasPrice': pn.get_gas_price(),
+        'data': contract.encodeABI(fn_name='safeBatchTransferFrom', args=[wallet_address, recipient, token_ids, amounts, b'']),
+        'chainId': web3.eth.chain_id  # Ensure the correct chain ID
+    }
+    txn_dict['nonce'] = pn.get_next_nonce(web3, operator)
+    return txn_dict
+
+
 def batch_transfer(web3, contract, recipient, operator, private_key, wallet_address, token_ids, amounts):
     try:
-        # Build a transaction dictionary using EIP-1559 parameters
-        txn_dict = {
-            'from': operator,
-            'to': contract.address,
-            'value': 0,
-            'nonce': web3.eth.get_transaction_count(operator),
-            'gasPrice': web3.eth.gas_price,
-            'data': contract.encodeABI(fn_name='safeBatchTransferFrom', args=[wallet_address, recipient, token_ids, amounts, b'']),
-            'chainId': web3.eth.chain_id  # Ensure the correct chain ID
-        }
+        txn_dict = build_batch_transfer_txn(web3, contract, recipient, operator, wallet_address, token_ids, amounts)
 
         txn_receipt = pn.send_web3_transaction(web3, private_key, txn_dict, retries=0, max_transaction_cost_usd=0.75)
 
@@ -57,8 +73,142 @@ def batch_transfer(web3, contract, recipient, operator, private_key, wallet_addr
         print(f"Error with transaction: {e}")
 
 
+def submit_batch_transfer(web3, contract, job):
+    """
+    Submits the batch transfer for a planned job without waiting for it to be mined; the receipt is collected
+    by the background transaction tracker.
+
+    Returns:
+        handle (TransactionHandle): The tracker handle, or None if the transfer could not be submitted.
+        error (Exception): The submission error, or None.
+    """
+    try:
+        wallet_address = job['wallet_address']
+        txn_dict = build_batch_transfer_txn(web3, contract, job['recipient_address'], wallet_address, wallet_address, job['token_ids'], job['amounts'])
+        handle = pn.submit_tracked_transaction(web3, job['private_key'], txn_dict, retries=0, max_transaction_cost_usd=0.75,
+                                               label=f"{job['sender_wallet_name']} -> {job['recipient_wallet_name']}")
+        return handle, None
+    except Exception as e:
+        return None, e
+
+
+def run_transfer_jobs(web3, contract, jobs, max_threads, rate_limit):
+    """
+    Submits every planned transfer from a pool of worker threads and waits for all of the receipts at the end.
+
+    Each job is a different sender wallet, so their nonces never collide and the jobs can go out concurrently. The
+    submit rate is capped globally across all threads with rate_limit sends per second, and receipts are fetched by
+    the background tracker while the remaining jobs are still being submitted.
+
+    Returns a list of (job, handle, error) in job order.
+    """
+    @sleep_and_retry
+    @limits(calls=max(rate_limit, 1), period=1)
+    def rate_limited_submit(job):
+        return submit_batch_transfer(web3, contract, job)
+
+    def submit(job):
+        handle, error = rate_limited_submit(job)
+        if handle is None:
+            print(f"{pn.C_RED}Transfer from {job['sender_wallet_name']} was not sent: {error}{pn.C_END}")
+        else:
+            print(f"{pn.C_CYAN}Submitted{pn.C_END} {job['sender_wallet_name']} -> {job['recipient_wallet_name']}: {handle.txn_hash_hex}")
+        return handle, error
+
+    with ThreadPoolExecutor(max_workers=max_threads) as executor:
+        submitted = list(executor.map(submit, jobs))
+
+    pn.drain_transactions()
+    return [(job, handle, error) for job, (handle, error) in zip(jobs, submitted)]
+
+
+# Prints one line per transfer with its final status, then the tracker totals
+def print_transfer_results(results):
+    print(f"{pn.C_BLUE}-------------------------------------------------------------------{pn.C_END}")
+    for job, handle, error in results:
+        if handle is None:
+            status, detail = "Not sent", str(error)
+        elif handle.receipt is None:
+            status, detail = handle.status, handle.error
+        else:
+            status, detail = pn.get_status_message(handle.receipt), handle.txn_hash_hex
+        item_count = sum(job['amounts'])
+        print(f"{job['sender_wallet_name']:>12} -> {job['recipient_wallet_name']:<12} {item_count:>6} items  {status}: {detail}")
+    pn.print_transaction_summary()
+
+
+# Builds a lowercase address -> (identifier, key) index of a wallet DataFrame, the first row for an address wins
+def build_wallet_index(wallets_df):
+    wallets_df = wallets_df.assign(address_lower=wallets_df['address'].str.lower()).drop_duplicates('address_lower')
+    return dict(zip(wallets_df['address_lower'], zip(wallets_df['identifier'], wallets_df['key'])))
+
+
+def plan_transfers(df, df_senders, selected_recipients, item_to_tokenId, skip_token_ids, include_only_token_ids=None):
+    """
+    Plans every transfer up front from the wallet by item matrix, before anything is sent.
+
+    Item columns are resolved to token ids once, the soulbound/skip and --itemIds filters become column masks over
+    the whole amount matrix, and senders and recipients are looked up in prebuilt address indexes. Recipients are
+    handed out round robin over the sender wallets in order, the same as cycling through them in the old row loop.
+
+    Returns a list of transfer jobs, dicts with: sender_wallet_name, private_key, wallet_address, recipient_wallet_name,
+    recipient_address, token_ids, token_name and amounts. Skipped items and wallets with nothing to send are printed.
+    """
+    sender_index = build_wallet_index(df_senders)
+    recipient_index = build_wallet_index(selected_recipients)
+    recipients = [address.lower() for address in selected_recipients['address'].tolist()]
+
+    # resolve item columns to token ids once, columns that aren't game items are dropped here
+    item_columns = [col for col in df.columns if col != 'wallet' and col.lower().strip() in item_to_tokenId]
+    column_token_ids = np.array([item_to_tokenId[col.lower().strip()] for col in item_columns], dtype=np.int64)
+    amounts_matrix = df[item_columns].fillna(0).to_numpy(dtype=np.int64) if item_columns else np.zeros((len(df), 0), dtype=np.int64)
+
+    # filters as column masks
+    allowed_columns = ~np.isin(column_token_ids, skip_token_ids)
+    if include_only_token_ids is not None:
+        allowed_columns &= np.isin(column_token_ids, include_only_token_ids)
+
+    held = amounts_matrix > 0
+    send_mask = held & allowed_columns
+    skipped_mask = held & ~allowed_columns
+
+    # only wallets in the sender list send, and each of those takes the next recipient in turn
+    wallets = df['wallet'].str.lower().to_numpy()
+    sender_rows = np.flatnonzero(np.fromiter((wallet in sender_index for wallet in wallets), dtype=bool, count=len(wallets)))
+
+    jobs = []
+    for turn, row in enumerate(sender_rows):
+        current_wallet = wallets[row]
+        sender_wallet_name, private_key = sender_index[current_wallet]
+        current_recipient = recipients[turn % len(recipients)]
+        recipient_wallet_name = recipient_index[current_recipient][0]
+        wallet_address = to_checksum_address(current_wallet)
+
+        for col in np.flatnonzero(skipped_mask[row]):
+            print(f"Skipping {amounts_matrix[row, col]} x {item_columns[col]}")
+
+        send_columns = np.flatnonzero(send_mask[row])
+        if send_columns.size == 0:
+            print(f"No items found for wallet address: {sender_wallet_name} - {wallet_address}")
+            continue
+
+        jobs.append({
+            'sender_wallet_name': sender_wallet_name,
+            'private_key': private_key,
+            'wallet_address': wallet_address,
+            'recipient_wallet_name': recipient_wallet_name,
+            'recipient_address': to_checksum_address(current_recipient),
+            'token_ids': column_token_ids[send_columns].tolist(),
+            'token_name': [item_columns[col] for col in send_columns],
+            'amounts': amounts_matrix[row, send_columns].tolist(),
+        })
+
+    return jobs
+
+
 def main():
     args = parse_arguments()
+    pn.set_subgraph_cache_mode(args.subgraph_cache)
 
     sender_range_input = input("Input the wallets you'd like to collect items from from: ")
     walletlist = pn.parse_number_ranges(sender_range_input)
@@ -75,42 +225,13 @@ def main():
     # Initialize dictionaries to store item_to_tokenId and soulbound_tokenIds
     item_to_tokenId, soulbound_tokenIds = pn.get_token_id_mapping_and_soulbound_list(gameItems)
 
-    # Define the path to the CSV file
-    csv_file_path = pn.data_path("game_items.csv")
-
-    # Check if the CSV file exists
-    if not os.path.exists(csv_file_path):
-        # If the file doesn't exist, run the script 0_pn_items_to_csv
-        subprocess.run(["python3", "0_pn_items_to_csv.py", "--csv_file", "addresses.txt"])
-        while True:
-            if os.path.exists(csv_file_path): break
-            else: time.sleep(0.5) 
-        
-
-    # Load data from the CSV file
-    df = pd.read_csv(csv_file_path)
-
-    # Strip whitespaces from column names
-    df.columns = df.columns.str.strip()
-
-    # Now you can work with the DataFrame
-
-    # If the file exists, you can delete it
-    if os.path.exists(csv_file_path):
-        os.remove(csv_file_path)
+    # Wallet by item amounts for the senders, straight from the subgraph (no 0_pn_items_to_csv round trip)
+    df = pn.get_wallet_item_matrix(selected_senders['address'].tolist()).reset_index()
 
     # Initialize web3 and contract
     web3 = pn.Web3Singleton.get_web3_Apex()
     game_items_contract = pn.Web3Singleton.get_GameItems()
 
-    # Set the recipient address(es) LFG    
-    recipients = selected_recipients['address'].tolist()
-
-    recipient_cycle = cycle(recipients)
-
-    #grab the arg wlletfiles of senders
-    df_senders = selected_senders
-
     #specify a list of token_ids to not try and send. currently it's just soulbound tokens
     # note:81 is cutlass - skipping this for now
     skip_token_ids = soulbound_tokenIds #[80,100,101,102,209,210,211,212,213,214,215,216,217,218,219,220,221,222]
@@ -122,54 +243,26 @@ def main():
     if args.itemIds:
         include_only_token_ids = [int(token_id) for token_id in args.itemIds.split(',')]
 
-    # Iterate over rows in the dataframe
-    for index, row in df.iterrows():
+    # Plan every transfer before sending anything
+    jobs = plan_transfers(df, selected_senders, selected_recipients, item_to_tokenId, skip_token_ids, include_only_token_ids)
 
-        # grab the current wallet in the data to potentially be transferred
-        current_wallet = row['wallet'].lower()
-
-        #if the current wallet is not in the list of addresses to move, move on
-        filtered_sender_df = df_senders[df_senders['address'].str.lower() == current_wallet]
-        if filtered_sender_df.empty:
-            continue
-
-        #extract the sender wallet name for output to display to make sure you're sending from where you want to
-        sender_wallet_name = filtered_sender_df['identifier'].iloc[0]
-        private_key = filtered_sender_df['key'].iloc[0]      
-        
-        #grab the recipeint for this cycle
-        current_recipient = next(recipient_cycle).lower()
-
-        #extract the recipient wallet name for output to display to make sure you know where you are sending to
-        filtered_recipient_df = selected_recipients[selected_recipients['address'].str.lower() == current_recipient]        
-        recipient_wallet_name = filtered_recipient_df['identifier'].iloc[0]
+    if args.automate and args.max_threads > 1:
+        pn.configure_connection_pools(args.max_threads)
+        results = run_transfer_jobs(web3, game_items_contract, jobs, args.max_threads, args.rate_limit)
+        print_transfer_results(results)
+        return
 
-        recipient_address = to_checksum_address(current_recipient)
-        wallet_address = to_checksum_address(current_wallet)  
+    for job in jobs:
+        sender_wallet_name = job['sender_wallet_name']
+        private_key = job['private_key']
+        wallet_address = job['wallet_address']
         operator_address = wallet_address #to_checksum_address(selected_operator.lower())
-        #private_key = pn.find_key_for_address(operator_address)
+        recipient_wallet_name = job['recipient_wallet_name']
+        recipient_address = job['recipient_address']
+        token_ids = job['token_ids']
+        token_name = job['token_name']
+        amounts = job['amounts']
 
-        token_ids = []
-        token_name = []
-        amounts = []
-        
-        for item in row.index:
-            item_lower = item.lower().strip()  # Convert to lower case and strip whitespace for case-insensitive comparison
-            if item_lower in item_to_tokenId and pd.notna(row[item]):
-                cellValue = int(row[item])
-                if cellValue > 0:
-                    token_id = item_to_tokenId[item_lower]
-                    if(token_id in skip_token_ids) or (include_only_token_ids is not None and token_id not in include_only_token_ids):
-                        print(f"Skipping {cellValue} x {item}")              
-                    else:
-                        token_ids.append(token_id)
-                        amounts.append(cellValue)
-                        token_name.append(item)
-
-        if not token_ids or not amounts:
-            print(f"No items found for wallet address: {sender_wallet_name} - {wallet_address}")
-            continue
-    
         if not args.automate :
             skip_transfer = False  # Initialize a flag to determine if the transfer should be skipped
 
@@ -1,7 +1,5 @@
 import argparse
 import re
-import traceback
-import time
 import pandas as pd
 from web3 import Web3
 from eth_utils import to_checksum_address
@@ -13,41 +11,112 @@ def parse_arguments():
     # Add the 'automate' argument
     parser.add_argument('--automate', action='store_true', help='Automate the process')
 
+    pn.add_subgraph_cache_argument(parser)
+
     return parser.parse_args()
 
-def batch_transfer(web3, contract, recipient, operator, private_key, wallet_address, token_ids, amounts):
-
-    try:
-        # Build a transaction dictionary
-        txn_dict = {
-            'from': operator,
-            'to': contract.address,
-            'value': 0,
-            'nonce': web3.eth.get_transaction_count(operator),
-            'gasPrice': web3.eth.gas_price,
-            'data': contract.encodeABI(fn_name='safeBatchTransferFrom', args=[wallet_address, recipient, token_ids, amounts, b''])
+def plan_distribution(selected_recipients, item_ids, item_quantities):
+    """
+    Plans one transfer of the same items to each recipient, in recipient order, before anything is sent.
+
+    Returns a list of transfer dicts with: recipient_identifier, recipient_address, token_ids and amounts.
+    """
+    recipient_addresses = [pn.to_web3_address(address) for address in selected_recipients['address'].tolist()]
+    return [{'recipient_identifier': identifier, 'recipient_address': address, 'token_ids': list(item_ids), 'amounts': list(item_quantities)}
+            for identifier, address in zip(selected_recipients['identifier'].tolist(), recipient_addresses)]
+
+
+def trim_to_balance(contract, sender_addr, transfers):
+    """
+    Reads the sender's balances with one balanceOfBatch call and trims the plan so it never sends more than the
+    sender holds. Recipients are served in order; once an item runs out the later transfers drop it, and a transfer
+    left with no items is not sent at all. Without this, every transfer after the balance ran out would be mined
+    as a revert and still pay gas, since sends no longer wait on each other's receipts.
+
+    Returns the trimmed transfers, in the same order.
+    """
+    token_ids = sorted({token_id for transfer in transfers for token_id in transfer['token_ids']})
+    balances = contract.functions.balanceOfBatch([sender_addr] * len(token_ids), token_ids).call()
+    remaining = dict(zip(token_ids, balances))
+
+    planned = {}
+    for transfer in transfers:
+        for token_id, amount in zip(transfer['token_ids'], transfer['amounts']):
+            planned[token_id] = planned.get(token_id, 0) + amount
+    for token_id, amount in planned.items():
+        if amount > remaining[token_id]:
+            print(f"{pn.C_YELLOW}Sender only holds {remaining[token_id]} of token {token_id}, the plan needs {amount}. Trimming later transfers.{pn.C_END}")
+
+    trimmed = []
+    for transfer in transfers:
+        token_ids_to_send, amounts_to_send = [], []
+        for token_id, amount in zip(transfer['token_ids'], transfer['amounts']):
+            amount = min(amount, remaining[token_id])
+            if amount > 0:
+                remaining[token_id] -= amount
+                token_ids_to_send.append(token_id)
+                amounts_to_send.append(amount)
+        trimmed.append({**transfer, 'token_ids': token_ids_to_send, 'amounts': amounts_to_send})
+    return trimmed
+
+
+def distribute_items(web3, contract, sender_addr, private_key, transfers):
+    """
+    Submits every planned transfer from the single sender back to back and waits for all of the receipts at the end.
+
+    The chain id is read once for the whole run and the legacy send path sets the gas price from the gas oracle's base fee,
+    nonces come from the local nonce manager (one node lookup for the first transfer, then counted up locally) and
+    gas limits from the gas estimate cache, so nothing waits on a receipt between sends. A transfer that fails to
+    submit gives its nonce back, so the next one resyncs.
+
+    Returns a list of (transfer, handle, error) in transfer order, handle is None if the transfer was not sent.
+    """
+    chain_id = web3.eth.chain_id
+
+    results = []
+    for transfer in transfers:
+        if not transfer['token_ids']:
+            results.append((transfer, None, ValueError("sender has none of the items left")))
+            continue
+        try:
+            txn_dict = {
+                'from': sender_addr,
+                'to': contract.address,
+                'value': 0,
+                'data': contract.encodeABI(fn_name='safeBatchTransferFrom', args=[sender_addr, transfer['recipient_address'], transfer['token_ids'], transfer['amounts'], b'']),
+                'chainId': chain_id
             }
-
-        txn_receipt = pn.send_web3_transaction(web3, private_key, txn_dict, max_transaction_cost_usd=0.06, retries=0)
-
-        if txn_receipt is not None:
-            status_message = pn.get_status_message(txn_receipt)
-            txn_hex = txn_receipt.transactionHash.hex()
-            print(f'{status_message}: {txn_hex}')
-            print(f'{pn.C_GREEN}Done sending{pn.C_END} from: {wallet_address} -to: {recipient}')
-            print(f"{pn.C_BLUE}-------------------------------------------------------------------{pn.C_END}")
-
+            txn_dict['nonce'] = pn.get_next_nonce(web3, sender_addr)
+            handle = pn.submit_tracked_transaction(web3, private_key, txn_dict, max_transaction_cost_usd=0.06, retries=0, use_gas_cache=True,
+                                                   label=f"distribute to {transfer['recipient_identifier']}")
+            print(f"{pn.C_CYAN}Submitted{pn.C_END} to {transfer['recipient_identifier']} (nonce {txn_dict['nonce']}): {handle.txn_hash_hex}")
+            results.append((transfer, handle, None))
+        except Exception as e:
+            print(f"  {pn.C_RED}**Error with transaction to {transfer['recipient_identifier']}: {type(e).__name__} {e}{pn.C_END}")
+            results.append((transfer, None, e))
+
+    pn.drain_transactions()
+    return results
+
+
+# Prints one line per recipient with the final status of its transfer, then the totals
+def print_distribution_results(results):
+    print(f"{pn.C_BLUE}-------------------------------------------------------------------{pn.C_END}")
+    print(f"{'Recipient':<44}{'Status':<14}Transaction")
+    succeeded = 0
+    for transfer, handle, error in results:
+        if handle is None:
+            status, detail, color = "Not sent", str(error), pn.C_RED
+        elif handle.receipt is None:
+            status, detail, color = handle.status, handle.error, pn.C_RED
         else:
-            # Handle the case where txn_receipt is None
-            print("Transaction failed or was not sent")
-
-    except ValueError as ve:
-        # Handle ValueError specifically without printing traceback
-        print(f"  {pn.C_RED}**Error with transaction: {ve}{pn.C_END}")
-        
-    except Exception as e:
-        traceback.print_exc()  # This prints the traceback
-        print(f"  {pn.C_RED}**Error with transaction: {type(e).__name__} {e}{pn.C_END}")
+            status, detail = pn.get_status_message(handle.receipt), handle.txn_hash_hex
+            color = pn.C_GREEN if status == pn.WEB3_STATUS_SUCCESS else pn.C_RED
+        succeeded += status == pn.WEB3_STATUS_SUCCESS
+        print(f"{str(transfer['recipient_identifier']):<44}{color}{status:<14}{pn.C_END}{detail}")
+    print(f"{pn.C_BLUE}-------------------------------------------------------------------{pn.C_END}")
+    print(f"{succeeded} of {len(results)} transfers succeeded")
+    pn.print_transaction_summary()
 
 
 def get_name_by_token_id(token_id, game_items):
@@ -103,6 +172,7 @@ def parse_input(input_str, gameItems, item_to_tokenId):
 
 def main():
     args = parse_arguments()
+    pn.set_subgraph_cache_mode(args.subgraph_cache)
 
     sender_range_input = input("Input the wallet you'd like to send items from: ")
     walletlist = pn.parse_number_ranges(sender_range_input)
@@ -142,16 +212,27 @@ def main():
     web3 = pn.Web3Singleton.get_web3_Apex()
     game_items_contract = pn.Web3Singleton.get_GameItems()
 
-    for index, row in selected_recipients.iterrows():
-        recipient_address = pn.to_web3_address(row['address'])
-        recipient_identifier = row['identifier']  # Now you also have an identifier for each recipient
+    # Plan every transfer before sending anything
+    transfers = trim_to_balance(game_items_contract, sender_addr, plan_distribution(selected_recipients, item_ids, item_quantities))
+    print(f"Sending from {identifier} ({sender_addr}) to {len(transfers)} recipients:")
+    print_token_amount_pairs(item_names, item_quantities)
+    print_trimmed_transfers(transfers, item_ids, item_quantities, item_names)
+
+    results = distribute_items(web3, game_items_contract, sender_addr, private_key, transfers)
+    print_distribution_results(results)
 
-        print(f"Sending from {identifier} ({sender_addr}) to {recipient_identifier}")
-        print_token_amount_pairs(item_names, item_quantities)
 
-        # Function call to perform the batch transfer, assuming it's defined elsewhere
-        batch_transfer(web3, game_items_contract, recipient_address, sender_addr, private_key, sender_addr, item_ids, item_quantities)
-        time.sleep(1)
+# Lists the recipients whose transfer trim_to_balance cut down, with what they will actually get
+def print_trimmed_transfers(transfers, item_ids, item_quantities, item_names):
+    names = dict(zip(item_ids, item_names))
+    trimmed = [transfer for transfer in transfers if transfer['token_ids'] != list(item_ids) or transfer['amounts'] != list(item_quantities)]
+    if not trimmed:
+        return
+
+    print(f"{pn.C_YELLOW}{len(trimmed)} recipient(s) get less than the amounts above:{pn.C_END}")
+    for transfer in trimmed:
+        items = ", ".join(f"{names[token_id]}: {amount}" for token_id, amount in zip(transfer['token_ids'], transfer['amounts']))
+        print(f"  {transfer['recipient_identifier']}: {items or 'nothing, not sent'}")
 
 
 def print_token_amount_pairs(token_name, amounts):
@@ -121,9 +121,8 @@ def transfer_PGLD(web3, contract, sender, private_key, recipient, pgld_amount):
     sender_address = to_checksum_address(sender.lower())
     recipient_address = to_checksum_address(recipient.lower())
 
-    # Get the latest block to retrieve baseFeePerGas
-    latest_block = web3.eth.get_block('latest')
-    base_fee = latest_block['baseFeePerGas']
+    # Get the base fee of the latest block from the shared gas oracle
+    base_fee = pn.get_base_fee()
     max_priority_fee = web3.to_wei(2, 'gwei')  # Set your max priority fee (miner tip)
 
     # Calculate maxFeePerGas (baseFee + maxPriorityFee)
@@ -134,7 +133,6 @@ def transfer_PGLD(web3, contract, sender, private_key, recipient, pgld_amount):
         'from': sender_address,
         'to': contract.address,
         'value': 0,
-        'nonce': web3.eth.get_transaction_count(sender_address),
         'maxPriorityFeePerGas': max_priority_fee,
         'maxFeePerGas': max_fee,
         'data': contract.encodeABI(fn_name='transfer', args=[recipient_address, pgld_amount]),
@@ -142,6 +140,8 @@ def transfer_PGLD(web3, contract, sender, private_key, recipient, pgld_amount):
     }
 
     try:
+        txn_dict['nonce'] = pn.get_next_nonce(web3, sender_address)
+
         # Estimate the gas for this specific transaction
         txn_dict['gas'] = web3.eth.estimate_gas(txn_dict)
 
@@ -159,6 +159,7 @@ def transfer_PGLD(web3, contract, sender, private_key, recipient, pgld_amount):
 
     except Exception as e:
         print("  **Error with transferring PGLD transaction:", e)
+        pn.resync_nonce(sender_address)
 
     print("----------------------------------------------------------------------------------------------------------------------------------------")
 
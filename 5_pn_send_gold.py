@@ -70,8 +70,7 @@ def transfer_PGLD(web3, contract, sender, private_key, recipient, pgld_amount):
     sender_address = to_checksum_address(sender.lower())
     recipient_address = to_checksum_address(recipient.lower())
 
-    latest_block = web3.eth.get_block('latest')
-    base_fee = latest_block['baseFeePerGas']
+    base_fee = pn.get_base_fee()
     max_priority_fee = web3.to_wei(2, 'gwei')
 
     max_fee = base_fee + max_priority_fee
@@ -80,7 +79,6 @@ def transfer_PGLD(web3, contract, sender, private_key, recipient, pgld_amount):
         'from': sender_address,
         'to': contract.address,
         'value': 0,
-        'nonce': web3.eth.get_transaction_count(sender_address),
         'maxPriorityFeePerGas': max_priority_fee,
         'maxFeePerGas': max_fee,
         'data': contract.encodeABI(fn_name='transfer', args=[recipient_address, pgld_amount]),
@@ -88,6 +86,7 @@ def transfer_PGLD(web3, contract, sender, private_key, recipient, pgld_amount):
     }
 
     try:
+        txn_dict['nonce'] = pn.get_next_nonce(web3, sender_address)
         txn_dict['gas'] = web3.eth.estimate_gas(txn_dict)
         signed_txn = web3.eth.account.sign_transaction(txn_dict, private_key=private_key)
         txn_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
@@ -97,6 +96,7 @@ def transfer_PGLD(web3, contract, sender, private_key, recipient, pgld_amount):
 
     except Exception as e:
         print("  **Error with transferring PGLD transaction:", e)
+        pn.resync_nonce(sender_address)
 
     print("----------------------------------------------------------------------------------------------------------------------------------------")
 
@@ -55,7 +55,7 @@ total_gas_cost_eth = 0
 # Main loop to send transactions
 for recipient in recipient_addresses:
     # Estimate gas cost; you'll have to adjust this if your send_nova_eth function returns the actual gas cost
-    gas_price = pn.Web3Singleton.get_web3_Apex().eth.gas_price
+    gas_price = pn.get_gas_price()
     gas_cost_in_eth = (gas_price * GAS_LIMIT) / 1e18
     total_gas_cost_eth += gas_cost_in_eth
 
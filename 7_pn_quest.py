@@ -1,6 +1,7 @@
 import argparse
 import time
 import functools
+import queue
 import traceback
 import pandas as pd
 import pn_helper as pn
@@ -121,7 +122,7 @@ def get_pirate_id(address):
     global id_value
 
     query = pn.make_pirate_query(address)
-    json_data = pn.get_data(query)
+    json_data = pn.get_data_paginated(query, pn.PIRATE_QUERY_PATH)
 
     for account in json_data['data']['accounts']:
         for nft in account['nfts']:
@@ -130,6 +131,55 @@ def get_pirate_id(address):
     return id_value
 
 
+class PendingQuests:
+    """
+    One wallet's fire_and_forget quests that haven't been mined yet. The receipt tracker reports each outcome
+    through on_success/on_failure, and settle() applies them: a failed quest gives its energy back.
+    """
+
+    def __init__(self):
+        self.outcomes = queue.Queue()
+        self.costs = {}
+        self.settled = {}
+
+    def on_success(self, handle):
+        self.outcomes.put((handle.txn_hash_hex, True))
+
+    def on_failure(self, handle):
+        self.outcomes.put((handle.txn_hash_hex, False))
+
+    def add(self, txn_hash_hex, energy_cost):
+        self.costs[txn_hash_hex] = energy_cost
+
+    # Applies every outcome received so far, with timeout waiting up to that long in total for all pending quests.
+    # Returns (energy balance, whether any quest failed)
+    def settle(self, energy_balance, buffer, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        any_failed = False
+        while True:
+            # the receipt can arrive before add() is called for a very fast quest, so outcomes are kept until matched
+            while True:
+                try:
+                    txn_hash_hex, succeeded = self.outcomes.get_nowait()
+                except queue.Empty:
+                    break
+                self.settled[txn_hash_hex] = succeeded
+            for txn_hash_hex in [txn_hash_hex for txn_hash_hex in self.costs if txn_hash_hex in self.settled]:
+                energy_cost = self.costs.pop(txn_hash_hex)
+                if not self.settled.pop(txn_hash_hex):
+                    any_failed = True
+                    energy_balance += energy_cost
+                    buffer.append(f"        {pn.formatted_time_str()} Quest failed on chain: {pn.COLOR['RED']}{txn_hash_hex}{pn.COLOR['END']}, stopping this wallet")
+
+            if not self.costs or deadline is None or time.time() >= deadline:
+                return energy_balance, any_failed
+            try:
+                txn_hash_hex, succeeded = self.outcomes.get(timeout=max(0, deadline - time.time()))
+                self.settled[txn_hash_hex] = succeeded
+            except queue.Empty:
+                pass
+
+
 def handle_row(row, chosen_quests, thread_counter, args):
     start_time = time.time()
 
@@ -168,12 +218,21 @@ def handle_row(row, chosen_quests, thread_counter, args):
     if args.shuffle:
         random.shuffle(copied_quests)
 
+    # fire_and_forget quests waiting on their receipts
+    pending_quests = PendingQuests()
+    wallet_failed = False
+
     # set local variables for quest exploration simulation
     prior_chosen_quest = None
     consecutive_quest_count = 0
     max_consecutive_quests = random.randint(1, 4)
 
     for chosen_quest in copied_quests:
+        # a submitted quest that failed on chain stops the wallet, the same as a failed send does
+        initial_energy_balance, wallet_failed = pending_quests.settle(initial_energy_balance, buffer)
+        if wallet_failed:
+            break
+
         level_required = int(chosen_quest.get('level_required', 1))
         suitable_pirate = None
 
@@ -219,8 +278,15 @@ def handle_row(row, chosen_quests, thread_counter, args):
 
         buffer.append(f"    {color_constant}{chosen_quest['name']}{pn.COLOR['END']}")
 
-        txn_hash_hex, status = PNQ.start_quest(address, key, pirate_id, chosen_quest, txn_cap=args.txn_cap)
-        if status == "Successful":
+        txn_hash_hex, status = PNQ.start_quest(address, key, pirate_id, chosen_quest, txn_cap=args.txn_cap, fire_and_forget=args.fire_and_forget,
+                                               on_success=pending_quests.on_success, on_failure=pending_quests.on_failure)
+        if status == pn.WEB3_STATUS_PENDING:
+            # submitted for the background tracker, so move straight on to the next quest without exploring
+            buffer.append(f"        {pn.formatted_time_str()} Transaction Submitted: {pn.COLOR['YELLOW']}{txn_hash_hex}{pn.COLOR['END']}")
+            prior_chosen_quest = chosen_quest['name']
+            pending_quests.add(txn_hash_hex, quest_energy_cost)
+
+        elif status == "Successful":
             buffer.append(f"        {pn.formatted_time_str()} Transaction {status}: {pn.COLOR['GREEN']}{txn_hash_hex}{pn.COLOR['END']}")
 
             if is_menu_quest:
@@ -251,7 +317,14 @@ def handle_row(row, chosen_quests, thread_counter, args):
             break # adding failsafe to break if a transaction fails
 
         initial_energy_balance -= quest_energy_cost
-        buffer.append(f"        Remaining energy: {pn.COLOR['CYAN']}{initial_energy_balance}{pn.COLOR['END']}")
+        pending_note = " (assuming pending quests succeed)" if pending_quests.costs else ""
+        buffer.append(f"        Remaining energy: {pn.COLOR['CYAN']}{initial_energy_balance}{pn.COLOR['END']}{pending_note}")
+
+    # wait for this wallet's pending quests so the energy reported below is what was actually spent
+    if pending_quests.costs:
+        initial_energy_balance, _ = pending_quests.settle(initial_energy_balance, buffer, timeout=pn.RECEIPT_DRAIN_TIMEOUT)
+    if pending_quests.costs:
+        buffer.append(f"{pn.COLOR['YELLOW']}{len(pending_quests.costs)} quest(s) still pending, energy assumes they succeed{pn.COLOR['END']}")
 
     buffer.append(f"\nTotal Remaining energy for wallet {wallet_id}: {pn.COLOR['CYAN']}{initial_energy_balance}{pn.COLOR['END']}")
 
@@ -280,10 +353,12 @@ def parse_arguments():
     parser.add_argument("--shuffle", action='store_true', help="Enable shuffling of quests for each wallet (default: False)")
     parser.add_argument("--skip_level", type=str, default=None, help="Levels of pirates to skip (e.g., '30' or '29,30').")
     parser.add_argument("--txn_cap", type=float, default=0.0369, help="Transaction cost cap in USD (default: 0.0369).")
+    parser.add_argument("--fire_and_forget", action='store_true', help="Submit quests back-to-back and collect receipts in the background (default: False)")
 
     # New arguments for captain only and low level priority
     parser.add_argument("--captain_only", action='store_true', help="Only use the captain NFT for each wallet.")
     parser.add_argument("--low_level_priority", action='store_true', help="Prioritize lower level pirates for quests.")
+    pn.add_subgraph_cache_argument(parser)
 
     args = parser.parse_args()
 
@@ -307,6 +382,9 @@ def main_script():
     print("captain_only:", args.captain_only)
     print("low_level_priority", args.low_level_priority)
     print("txn_cap", args.txn_cap)
+    print("fire_and_forget", args.fire_and_forget)
+    print("subgraph_cache", args.subgraph_cache)
+    pn.set_subgraph_cache_mode(args.subgraph_cache)
 
 
     # Fetch the quest data using fetch_quest_data() from pn_helper
@@ -416,6 +494,10 @@ def body_logic(args, chosen_quests, df_addresses):  # Add shuffle_for_each_walle
                 handle_row(row.to_dict(), chosen_quests, thread_counter, args)
                 thread_counter += 1  # Update the thread counter for each single thread
 
+        if args.fire_and_forget:
+            pn.drain_transactions()
+            pn.print_transaction_summary()
+
         end_time = time.time()
         execution_time = end_time - start_time
         print(f"Quest execution time: {execution_time:.2f} seconds")
@@ -38,7 +38,7 @@ for index, row in sender_data.iterrows():
     total_sent_eth += amount_in_eth
 
     # Estimate gas cost; you'll have to adjust this if your send_nova_eth function returns the actual gas cost
-    gas_price = pn.Web3Singleton.get_web3_Apex().eth.gas_price
+    gas_price = pn.get_gas_price()
     gas_cost_in_eth = (gas_price * GAS_LIMIT) / 1e18
     total_gas_cost_eth += gas_cost_in_eth
 
@@ -1,5 +1,4 @@
 from flask import Flask, render_template
-import pandas as pd
 import pn_helper as pn
 import argparse
 
@@ -13,7 +12,8 @@ parser.add_argument('--affinity', type=str, help='Filter by Affinity (case-insen
 excel_file = pn.select_xlsx_file()
 user_name = excel_file.split('_')[1].split('.')[0]
 
-data = pd.read_excel(excel_file)
+# prefers the Arrow snapshot written alongside the export, falls back to the .xlsx
+data = pn.read_export(excel_file, columns=['tokenId', 'imageUrl', 'Character Type', 'Affinity', 'Background'])
 
 def transform_url(url):
     if url.startswith('ipfs://'):
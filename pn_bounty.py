@@ -1,4 +1,6 @@
 import time
+import bisect
+from types import MappingProxyType
 import pandas as pd
 import traceback
 from typing import Union
@@ -7,12 +9,12 @@ from ratelimit import limits, sleep_and_retry
 
 MAX_PIRATE_ON_BOUNTY = 20
 
-# The query used to get all bounties from the PN Grpah
+# The query used to get all bounties from the PN Grpah, paginated over the entities (see bounty_query_path)
 bounty_query = """
     query GetComponentEntities{
       components(where: { id: "0x3ceb3cd6a633684f7095ec8b1842842250978ee3f4f137603421db15b59d137f"}) {
         id
-        entities(first: 1000){
+        entities($page_args, where: {$page_where}){
           id
           fields {
             name
@@ -26,6 +28,9 @@ bounty_query = """
     }
     """
 
+# Where the bounty entities sit in a bounty_query response, for pn.get_data_paginated
+bounty_query_path = ['data', 'components', 0, 'entities']
+
 class BountyGroupMappings:
     """
     Singleton class to manage mappings of bounty names to associated group IDs.
@@ -37,6 +42,11 @@ class BountyGroupMappings:
     Usage:
     - To initialize the mappings, call the `initialize` method.
     - To get the mappings DataFrame, call the `get_mappings_df` method.
+    - Lookups go through three read-only dicts built once at initialization:
+      `group_by_name` (stripped, lower-cased bounty name -> group_id),
+      `name_by_group` (group_id -> bounty name) and `limit_by_group` (group_id -> limit).
+      Group ids are keyed by their string form, since the csv holds ints but the subgraph
+      and the command line hand us strings.
 
     Example:
     >>> _bounty_group_mappings = BountyGroupMappings()
@@ -67,6 +77,22 @@ class BountyGroupMappings:
             self.__initialized = True
             self.df = pd.read_csv("bounty_group_mappings.csv")
 
+            group_by_name = {}
+            name_by_group = {}
+            limit_by_group = {}
+
+            # the first row wins on duplicates, same as the iloc[0] lookups this replaced
+            for bounty_name, group_id, limit in zip(self.df['bounty_name'], self.df['group_id'], self.df['limit']):
+                group_key = str(group_id)
+                if isinstance(bounty_name, str):
+                    group_by_name.setdefault(bounty_name.strip().lower(), group_id)
+                name_by_group.setdefault(group_key, bounty_name)
+                limit_by_group.setdefault(group_key, int(limit))
+
+            self.group_by_name = MappingProxyType(group_by_name)
+            self.name_by_group = MappingProxyType(name_by_group)
+            self.limit_by_group = MappingProxyType(limit_by_group)
+
     def get_mappings_df(self):
         """
         Get the DataFrame containing bounty name-to-group ID mappings.
@@ -77,6 +103,21 @@ class BountyGroupMappings:
         self.initialize()
         return self.df
 
+    def get_group_id(self, bounty_name):
+        """Group id for a bounty name (case and surrounding spaces ignored), or None."""
+        self.initialize()
+        return self.group_by_name.get(bounty_name.strip().lower())
+
+    def get_bounty_name(self, group_id):
+        """Bounty name for a group id, or None."""
+        self.initialize()
+        return self.name_by_group.get(str(group_id))
+
+    def get_limit(self, group_id, default=None):
+        """Maximum number of pirates allowed on the bounty for a group id, or default."""
+        self.initialize()
+        return self.limit_by_group.get(str(group_id), default)
+
 # Automatically create an instance of BountyMappings and initialize it
 _bounty_group_mappings = BountyGroupMappings()
 
@@ -92,10 +133,10 @@ def get_group_id_by_bounty_name(target_bounty_name):
     - int: The group ID associated with the specified bounty name if found; otherwise, the default_group_id.
 
     Description:
-    This function performs a lookup in a mappings DataFrame to find the group ID associated with a given bounty name.
+    This function performs a lookup in the bounty group mappings to find the group ID associated with a given bounty name.
     - If the target_bounty_name is blank or None, it returns None.
-    - It filters the DataFrame for the specified bounty_name, ignoring case and leading/trailing spaces.
-    - If a matching bounty name is found in the DataFrame, it returns the associated group_id.
+    - It looks up the specified bounty_name in the prebuilt name index, ignoring case and leading/trailing spaces.
+    - If a matching bounty name is found, it returns the associated group_id.
     - If no matching bounty_name is found, it returns None.
     
     Exceptions:
@@ -107,18 +148,8 @@ def get_group_id_by_bounty_name(target_bounty_name):
     if target_bounty_name is None: return None
 
     try:
-        bounty_mappings_df = _bounty_group_mappings.get_mappings_df()
-
-        # Filter the DataFrame for the specified bounty_name
-        result = bounty_mappings_df[bounty_mappings_df['bounty_name'].str.strip().str.lower() == target_bounty_name.strip().lower()]
-
-        # Check if any rows match the specified bounty_name
-        if not result.empty:
-            # Get the group_id from the first matching row (assuming unique bounty names)
-            group_id = result.iloc[0]['group_id']
-            return group_id
-        else:
-            return None # No matching bounty_name found return the default
+        # None if no matching bounty_name is found
+        return _bounty_group_mappings.get_group_id(target_bounty_name)
     except FileNotFoundError as e:
         print(f"File not found: {str(e)}")
         return None
@@ -149,18 +180,8 @@ def get_bounty_name_by_group_id(group_id):
     """
 
     try:
-        bounty_mappings_df = _bounty_group_mappings.get_mappings_df()
-
-        # Filter the DataFrame for the specified group_id
-        result = bounty_mappings_df[bounty_mappings_df['group_id'] == group_id]
-
-        # Check if any rows match the specified group_id
-        if not result.empty:
-            # Get the bounty_name from the first matching row
-            bounty_name = result.iloc[0]['bounty_name']
-            return bounty_name
-        else:
-            return None  # No matching group_id found, return the default
+        # None if no matching group_id is found
+        return _bounty_group_mappings.get_bounty_name(group_id)
     except FileNotFoundError as e:
         print(f"File not found: {str(e)}")
         return None
@@ -168,14 +189,10 @@ def get_bounty_name_by_group_id(group_id):
         print(f"get_bounty_name_by_group_id({group_id}): An error occurred: {str(e)}")
         return None
 
-# Initialize a dictionary to store cached results
-bounty_limit_cache = {}
-
 def get_bounty_limit_by_group_id(group_id):
     """
     Retrieves the bounty limit (maximum number of pirates allowed on a bounty)
-    associated with a specified group ID. Caches the result for performance
-    to avoid redundant lookups during the script's execution.
+    associated with a specified group ID from the prebuilt limit index.
 
     Parameters:
         group_id (str): The group ID for which to retrieve the bounty limit.
@@ -183,34 +200,10 @@ def get_bounty_limit_by_group_id(group_id):
     Returns:
         int: The bounty limit for the specified group ID.
              If not found, returns the default maximum pirate count.
-
-    Caching:
-        The function caches results to avoid redundant lookups for the same group ID,
-        improving performance.
-        Cached results are stored in the 'bounty_limit_cache' dictionary.
     """
 
     try:
-
-        if group_id in bounty_limit_cache:
-            return int(bounty_limit_cache[group_id])
-
-        bounty_mappings_df = _bounty_group_mappings.get_mappings_df()
-
-        #print("Columns in bounty_mappings_df:", bounty_mappings_df.columns)  # Print column names
-
-        result = bounty_mappings_df[bounty_mappings_df['group_id'] == group_id]
-
-        #print("Resulting DataFrame for group_id:", group_id)
-        #print(result)  # Print the result DataFrame to see its structure
-
-        if not result.empty:
-            bounty_limit = result.iloc[0]['limit']
-            bounty_limit_cache[group_id] = bounty_limit
-            return bounty_limit
-        else:
-            bounty_limit_cache[group_id] = MAX_PIRATE_ON_BOUNTY
-            return MAX_PIRATE_ON_BOUNTY
+        return _bounty_group_mappings.get_limit(group_id, default=MAX_PIRATE_ON_BOUNTY)
     except FileNotFoundError as e:
         print(f"File not found: {str(e)}")
         return MAX_PIRATE_ON_BOUNTY
@@ -242,16 +235,8 @@ def get_bounty_name_for_token_id(token_id, generation):
     'Ore Galore'
     """
 
-    pirate_bounty_df = pn._pirate_command_mappings.get_mappings_df()
-
-    matching_row = pirate_bounty_df[(pirate_bounty_df['tokenId'] == token_id) & (pirate_bounty_df['Gen'] == generation)]
-    
-    if not matching_row.empty:
-        bounty = matching_row.iloc[0]['Bounty']
-        if isinstance(bounty, str):
-            return bounty
-        
-    return None # Token ID and generation not found in the DataFrame or bounty is not a string
+    # Token ID and generation not found in the mappings or bounty is not a string -> None
+    return pn._pirate_command_mappings.get_bounty_name(token_id, generation)
 
 
 def get_bounty_name_and_id(data, group_id, entity_ids) -> Union[str, int]:
@@ -263,7 +248,7 @@ def get_bounty_name_and_id(data, group_id, entity_ids) -> Union[str, int]:
     the appropriate bounty based on the number of pirates.
 
     Parameters:
-    - data (DataFrame): The bounty data frame used to determine the correct bounty ID.
+    - data (BountyIndex or dict): The bounty index (or raw bounty query response) used to determine the correct bounty ID.
     - group_id (str): The group ID associated with the bounty.
     - entity_ids (List[int]): The list of entity IDs (pirates) intended for the bounty.
 
@@ -292,7 +277,8 @@ def get_bounty_name_and_id(data, group_id, entity_ids) -> Union[str, int]:
         return "None (0 pirates)", 0
 
     # Calculate the bounty_hex_value based on group_id and the number of pirates
-    bounty_hex_value = get_bounty_hex(data, group_id, num_of_pirates)
+    bounty_index = data if isinstance(data, BountyIndex) else BountyIndex(data)
+    bounty_hex_value = bounty_index.get_bounty_hex(group_id, num_of_pirates)
     
     try:
         # Perform a reverse lookup to get the bounty name by group ID
@@ -335,38 +321,135 @@ def get_bounty_hex(data, group_id, num_of_pirates):
     '0xABCDEF0123456789'
     """
     
-    # Initialize a list to store matching entities
-    matching_entities = []
-
-    # Iterate through components in the bounty data
-    for component in data['data']['components']:
-        for entity in component['entities']:
-            entity_group_id = None
-            lower_bound = None
-            upper_bound = None
-            
-            # Extract relevant fields from the entity
-            for field in entity['fields']:
-                if field['name'] == 'group_id':
-                    entity_group_id = field['value']
-                elif field['name'] == 'lower_bound':
-                    lower_bound = int(field['value'])
-                elif field['name'] == 'upper_bound':
-                    upper_bound = int(field['value'])
-
-            # Check if the entity matches the specified group ID and pirate count
-            if entity_group_id == group_id and lower_bound is not None and upper_bound is not None:
+    return BountyIndex(data).get_bounty_hex(group_id, num_of_pirates)
+
+
+class BountyIndex:
+    """
+    Index of the bounty definitions returned by bounty_query, for resolving a group ID and pirate count
+    to a bounty without walking the raw subgraph JSON.
+
+    Each group ID maps to a sorted interval table of its pirate count tiers, stored as two parallel tuples:
+    the lower bounds (for bisection) and (upper_bound, hex_value) pairs. Tiers within a group are
+    expected not to overlap, which is how the game defines them. A group whose tiers do overlap keeps
+    its tiers in response order instead and is scanned linearly, so the first listed tier containing the
+    pirate count wins, exactly as with the old linear scan. Group IDs are compared as strings.
+
+    Usage:
+    - Build it from a bounty query response with `BountyIndex(data)`, or create it empty and call `refresh`.
+    - Call `refresh` with a newer response to rebuild only the groups whose tiers changed.
+    - Resolve a bounty with `get_bounty_hex(group_id, num_of_pirates)`.
+
+    Example:
+    >>> bounty_index = BountyIndex(pn.get_data_paginated(bounty_query, bounty_query_path))
+    >>> bounty_index.get_bounty_hex("1A", 5)
+    '0xABCDEF0123456789'
+    """
+
+    def __init__(self, data=None):
+        self._lower_bounds = {}
+        self._tiers = {}
+        self._overlapping = {}
+        self._signatures = {}
+        self._source = None
+        if data is not None:
+            self.refresh(data)
+
+    @staticmethod
+    def _group_raw_tiers(data):
+        """
+        Walks the raw bounty query response once and returns group_id -> list of (lower_bound, upper_bound, hex_value),
+        in the order the entities appear in the response.
+        """
+        raw_tiers = {}
+        for component in data['data']['components']:
+            for entity in component['entities']:
+                entity_group_id = None
+                lower_bound = None
+                upper_bound = None
+
+                # Extract relevant fields from the entity
+                for field in entity['fields']:
+                    if field['name'] == 'group_id':
+                        entity_group_id = field['value']
+                    elif field['name'] == 'lower_bound':
+                        lower_bound = int(field['value'])
+                    elif field['name'] == 'upper_bound':
+                        upper_bound = int(field['value'])
+
+                if entity_group_id is not None and lower_bound is not None and upper_bound is not None:
+                    # Extract the hex_value of the bounty from the entity ID
+                    hex_value = entity['id'].split('-')[1]
+                    raw_tiers.setdefault(str(entity_group_id), []).append((lower_bound, upper_bound, hex_value))
+        return raw_tiers
+
+    def refresh(self, data):
+        """
+        Updates the index from a bounty query response, rebuilding only groups whose tiers changed
+        and dropping groups that no longer exist.
+
+        Returns:
+        - int: The number of groups that were added, changed or removed.
+        """
+        # the subgraph cache hands back the same response object while it is fresh, so there is nothing to do
+        if data is self._source:
+            return 0
+
+        raw_tiers = self._group_raw_tiers(data)
+        changed_groups = 0
+
+        for group_id, tiers in raw_tiers.items():
+            signature = tuple(tiers)
+            if self._signatures.get(group_id) == signature:
+                continue
+
+            sorted_tiers = sorted(tiers, key=lambda tier: tier[0])
+            overlapping = any(later[0] <= earlier[1] for earlier, later in zip(sorted_tiers, sorted_tiers[1:]))
+            if overlapping:
+                # bisection could pick a different tier than the first match in response order, so keep that order
+                self._overlapping[group_id] = signature
+                self._lower_bounds.pop(group_id, None)
+                self._tiers.pop(group_id, None)
+            else:
+                self._lower_bounds[group_id] = tuple(tier[0] for tier in sorted_tiers)
+                self._tiers[group_id] = tuple((tier[1], tier[2]) for tier in sorted_tiers)
+                self._overlapping.pop(group_id, None)
+            self._signatures[group_id] = signature
+            changed_groups += 1
+
+        for group_id in set(self._signatures) - set(raw_tiers):
+            self._lower_bounds.pop(group_id, None)
+            self._tiers.pop(group_id, None)
+            self._overlapping.pop(group_id, None)
+            del self._signatures[group_id]
+            changed_groups += 1
+
+        self._source = data
+        return changed_groups
+
+    def get_bounty_hex(self, group_id, num_of_pirates):
+        """
+        Returns the hexadecimal value of the bounty for the group ID and pirate count, or None if no tier matches.
+        """
+        group_id = str(group_id)
+        overlapping_tiers = self._overlapping.get(group_id)
+        if overlapping_tiers is not None:
+            for lower_bound, upper_bound, hex_value in overlapping_tiers:
                 if lower_bound <= num_of_pirates <= upper_bound:
-                    matching_entities.append(entity)
-
-    # If matching entities are found, return the hexadecimal value of the bounty
-    if matching_entities:
-        first_entity_id = matching_entities[0]['id']
-        # Extract the hex_value of the bounty from the entity ID
-        hex_value = first_entity_id.split('-')[1]
-        return hex_value
-    else:
-        # Return None if no matching entity is found
+                    return hex_value
+            return None
+
+        lower_bounds = self._lower_bounds.get(group_id)
+        if lower_bounds is None:
+            return None
+
+        position = bisect.bisect_right(lower_bounds, num_of_pirates) - 1
+        if position < 0:
+            return None
+
+        upper_bound, hex_value = self._tiers[group_id][position]
+        if num_of_pirates <= upper_bound:
+            return hex_value
         return None
 
 
@@ -451,6 +534,34 @@ def rate_limited_active_bounty_ids(bounty_contract, address):
     return result, execution_time
 
 
+def get_active_bounty_ids_batch(bounty_contract, addresses):
+    """
+    Fetches active bounty IDs for many accounts at once through the Multicall aggregator
+    (or batched JSON-RPC calls when no aggregator is deployed).
+
+    Args:
+        bounty_contract (object): The bounty contract instance.
+        addresses (list): The account addresses to query.
+
+    Returns:
+        dict: Lowercase address -> list of active bounty IDs, or None if the read failed for that address.
+
+    Example:
+    >>> active_bounty_ids_dict = get_active_bounty_ids_batch(bounty_contract_instance, ['0xAddress1', '0xAddress2'])
+    >>> print(active_bounty_ids_dict)
+    {'0xaddress1': [123, 456], '0xaddress2': []}
+    """
+    try:
+        calls = [(bounty_contract, 'activeBountyIdsForAccount', [pn.to_web3_address(address)]) for address in addresses]
+        results = pn.multicall_view_calls(calls)
+    except Exception as e:
+        error_type = type(e).__name__
+        print(f"   {pn.C_RED}**get_active_bounty_ids_batch -> Exception: {e} - {error_type}{pn.C_END}")
+        return {}
+
+    return {address.lower(): (list(result) if result is not None else None) for address, result in zip(addresses, results)}
+
+
 @limits(calls=10, period=1)
 def rate_limited_has_pending_bounty(contract, address, group_id):
     """
@@ -480,6 +591,35 @@ def rate_limited_has_pending_bounty(contract, address, group_id):
         return False
 
 
+def get_has_pending_bounty_batch(contract, address, group_ids):
+    """
+    Checks the pending state of several bounty groups for one account in a single aggregated call.
+
+    Args:
+        contract (object): The contract instance.
+        address (str): The account address to check.
+        group_ids (list): The group IDs of the bounties to check.
+
+    Returns:
+        dict: group_id -> True/False, or None if the read failed for that group.
+
+    Example:
+    >>> pending_by_group = get_has_pending_bounty_batch(contract_instance, '0xAddress', ['12345', '67890'])
+    >>> print(pending_by_group)
+    {'12345': True, '67890': False}
+    """
+    unique_group_ids = list(dict.fromkeys(group_ids))
+    try:
+        calls = [(contract, 'hasPendingBounty', [pn.to_web3_address(address), int(group_id)]) for group_id in unique_group_ids]
+        results = pn.multicall_view_calls(calls)
+    except Exception as e:
+        error_type = type(e).__name__
+        print(f"   {pn.C_RED}**get_has_pending_bounty_batch -> Exception: {e} - {error_type}{pn.C_END}")
+        return {}
+
+    return dict(zip(unique_group_ids, results))
+
+
 @limits(calls=10, period=1)
 def rate_limited_is_bounty_available(contract, address, bounty_id):
     """
@@ -530,6 +670,24 @@ def rate_limited_start_bounty(web3, contract_to_write, address, private_key, bou
     1
     """
 
+    append_start_bounty_messages(buffer, bounty_name, bounty_id, pirates, verbose)
+
+    status_msg, txn_receipt = start_bounty(web3, contract_to_write, address, private_key, bounty_id, pirates)
+
+    return append_start_bounty_result(buffer, status_msg, txn_receipt)
+
+
+def append_start_bounty_messages(buffer, bounty_name, bounty_id, pirates, verbose=False):
+    """
+    Appends the description of a startBounty call (pirates, bounty name and id) to the output buffer.
+
+    Args:
+        buffer (list): Buffer to store output messages.
+        bounty_name (str): The name of the bounty.
+        bounty_id (str): The ID of the bounty.
+        pirates (list): List of pirates to send on the bounty.
+        verbose (bool): Whether to include the entity ids and bounty id for a single pirate.
+    """
     if len(pirates) > 1:
         buffer.append(f"   Sending {pn.C_CYAN}{len(pirates)} pirate(s){pn.C_END} on {pn.C_CYAN}'{bounty_name}'{pn.C_END}")
         buffer.append(f"      -> entities: {pirates}")
@@ -549,8 +707,19 @@ def rate_limited_start_bounty(web3, contract_to_write, address, private_key, bou
         else:
             buffer.append(f"   Sending Pirate # {pn.C_CYAN}{token_id}{pn.C_END} on {pn.C_CYAN}'{bounty_name}'{pn.C_END}")
 
-    status_msg, txn_receipt = start_bounty(web3, contract_to_write, address, private_key, bounty_id, pirates)
 
+def append_start_bounty_result(buffer, status_msg, txn_receipt):
+    """
+    Appends the outcome of a startBounty transaction to the output buffer.
+
+    Args:
+        buffer (list): Buffer to store output messages.
+        status_msg (str): The status message returned by start_bounty.
+        txn_receipt (object): The transaction receipt, or None if the transaction was not mined.
+
+    Returns:
+        success (int): 1 if the bounty was started successfully, 0 if there was an error.
+    """
     if(txn_receipt is not None and status_msg == pn.WEB3_STATUS_SUCCESS):
         buffer.append(f'      -> {pn.C_GREEN}startBounty {status_msg}{pn.C_END}: {txn_receipt.transactionHash.hex()}\n')
         return 1
@@ -560,21 +729,34 @@ def rate_limited_start_bounty(web3, contract_to_write, address, private_key, bou
         return 0
 
 
+# Send settings shared by every startBounty/endBounty path (rate limited, fire-and-forget and asyncio)
+START_BOUNTY_SEND_ARGS = {'max_transaction_cost_usd': 0.08, 'retries': 4, 'retry_delay': 15}
+END_BOUNTY_SEND_ARGS = {'max_transaction_cost_usd': 0.05, 'retries': 4, 'retry_delay': 15}
+
+
+# Builds the unsigned startBounty/endBounty transaction without a nonce. The asyncio paths pass no gas_price
+# and leave it to send_web3_transaction_legacy_async
+def build_bounty_txn(contract_to_write, address, fn_name, args, gas_price=None):
+    txn_dict = {
+        'from': address,
+        'to': contract_to_write.address,
+        'value': 0,
+        'data': contract_to_write.encodeABI(fn_name=fn_name, args=args)
+    }
+    if gas_price is not None:
+        txn_dict['gasPrice'] = gas_price
+    return txn_dict
+
+
 def start_bounty(web3, contract_to_write, address, private_key, bounty_id, pirates):
 
     try:
-        txn_dict = {
-            'from': address,
-            'to': contract_to_write.address,
-            'value': 0,
-            'nonce': web3.eth.get_transaction_count(address),
-            'gasPrice': web3.eth.gas_price,
-            'data': contract_to_write.encodeABI(fn_name='startBounty', args=[bounty_id, pirates])
-        }
+        txn_dict = build_bounty_txn(contract_to_write, address, 'startBounty', [bounty_id, pirates], gas_price=pn.get_gas_price())
+        txn_dict['nonce'] = pn.get_next_nonce(web3, address)
 
         print(f"bounty_id: {bounty_id} pirates: {pirates}")
 
-        txn_receipt = pn.send_web3_transaction(web3, private_key, txn_dict, max_transaction_cost_usd=0.08, retries=4, retry_delay=15)
+        txn_receipt = pn.send_web3_transaction(web3, private_key, txn_dict, **START_BOUNTY_SEND_ARGS)
 
         if txn_receipt is not None:
             status_message = pn.get_status_message(txn_receipt)
@@ -624,34 +806,242 @@ def rate_limited_end_bounty(web3, contract_to_write, address, private_key, bount
     1
     """
     buffer.append(f"   Ending active_bounty_id: {bounty_id}")
-    txn_dict = {
-        'from': address,
-        'to': contract_to_write.address,
-        'value': 0,
-        'nonce': web3.eth.get_transaction_count(address),
-        'gasPrice': web3.eth.gas_price,
-        'data': contract_to_write.encodeABI(fn_name='endBounty', args=[bounty_id])
-    }
+    txn_dict = build_bounty_txn(contract_to_write, address, 'endBounty', [bounty_id], gas_price=pn.get_gas_price())
 
     try:
-        txn_receipt = pn.send_web3_transaction(web3, private_key, txn_dict, retries=4, max_transaction_cost_usd=0.05, retry_delay=15)
-        status_message = pn.get_status_message(txn_receipt)
+        txn_dict['nonce'] = pn.get_next_nonce(web3, address)
+        txn_receipt = pn.send_web3_transaction(web3, private_key, txn_dict, **END_BOUNTY_SEND_ARGS)
+        return append_end_bounty_result(buffer, txn_receipt)
+    except Exception as e:
+        return append_end_bounty_error(buffer, e)
 
-        if status_message == "failed":
-            raise Exception(f"Bounty failed: {txn_receipt.transactionHash.hex()}")
 
-        buffer.append(f'      -> {pn.C_GREEN}endBounty {status_message}{pn.C_END}: {txn_receipt.transactionHash.hex()}')
-        return 1
+def append_end_bounty_result(buffer, txn_receipt):
+    status_message = pn.get_status_message(txn_receipt)
+
+    if status_message == "failed":
+        raise Exception(f"Bounty failed: {txn_receipt.transactionHash.hex()}")
+
+    buffer.append(f'      -> {pn.C_GREEN}endBounty {status_message}{pn.C_END}: {txn_receipt.transactionHash.hex()}')
+    return 1
+
+
+def append_end_bounty_error(buffer, e):
+    error_message = str(e)
+    if "0xaf68984f" in error_message:
+        # Handle the specific contract error
+        buffer.append(f"      -> {pn.C_RED}**Contract Error{pn.C_END}: {error_message}")
+    else:
+        # Handle other exceptions, including gas estimation failures
+        error_type = type(e).__name__
+        buffer.append(f"      -> {pn.C_RED}**Error endBounty - {error_type}{pn.C_END}: {error_message}")
+    return 0
+
+
+#-------- FIRE-AND-FORGET VARIANTS ---------------------------
+# These split startBounty/endBounty into a submit step that returns right after the node accepts the
+# transaction, and a collect step that waits on the background receipt tracker and writes the same output
+# as the rate limited functions. Submitting every transaction for a wallet first and collecting afterwards
+# lets the wallet's transactions be mined together instead of one block after another.
+
+def submit_end_bounty(web3, contract_to_write, address, private_key, bounty_id):
+    """
+    Submits an endBounty transaction without waiting for it to be mined.
+
+    Args:
+        web3 (object): The Web3 instance.
+        contract_to_write (object): The contract instance for writing.
+        address (str): The sender's address.
+        private_key (str): The sender's private key.
+        bounty_id (str): The ID of the bounty to end.
+
+    Returns:
+        handle (TransactionHandle): The tracker handle, or None if the transaction could not be submitted.
+        error (Exception): The submission error, or None.
+    """
+    try:
+        txn_dict = build_bounty_txn(contract_to_write, address, 'endBounty', [bounty_id], gas_price=pn.get_gas_price())
+        txn_dict['nonce'] = pn.get_next_nonce(web3, address)
+        handle = pn.submit_tracked_transaction(web3, private_key, txn_dict, **END_BOUNTY_SEND_ARGS,
+                                               label=f"endBounty {bounty_id}")
+        return handle, None
     except Exception as e:
-        error_message = str(e)
-        if "0xaf68984f" in error_message:
-            # Handle the specific contract error
-            buffer.append(f"      -> {pn.C_RED}**Contract Error{pn.C_END}: {error_message}")
-        else:
-            # Handle other exceptions, including gas estimation failures
-            error_type = type(e).__name__
-            buffer.append(f"      -> {pn.C_RED}**Error endBounty - {error_type}{pn.C_END}: {error_message}")
-        return 0
+        return None, e
+
+
+def collect_end_bounty(bounty_id, handle, error, buffer):
+    """
+    Waits for an endBounty submitted with submit_end_bounty and writes its outcome to the buffer.
+
+    Returns:
+        success (int): 1 if the bounty was ended successfully, 0 if there was an error.
+    """
+    buffer.append(f"   Ending active_bounty_id: {bounty_id}")
+    if handle is None:
+        return append_end_bounty_error(buffer, error)
+
+    txn_receipt = handle.wait()
+    try:
+        if txn_receipt is None:
+            raise Exception(handle.error)
+        return append_end_bounty_result(buffer, txn_receipt)
+    except Exception as e:
+        return append_end_bounty_error(buffer, e)
+
+
+def submit_start_bounty(web3, contract_to_write, address, private_key, bounty_id, pirates):
+    """
+    Submits a startBounty transaction without waiting for it to be mined.
+
+    Args:
+        web3 (object): The Web3 instance.
+        contract_to_write (object): The contract instance for writing.
+        address (str): The sender's address.
+        private_key (str): The sender's private key.
+        bounty_id (str): The ID of the bounty.
+        pirates (list): List of pirates to send on the bounty.
+
+    Returns:
+        handle (TransactionHandle): The tracker handle, or None if the transaction could not be submitted.
+        status_msg (str): The submission error message, or None.
+    """
+    try:
+        txn_dict = build_bounty_txn(contract_to_write, address, 'startBounty', [bounty_id, pirates], gas_price=pn.get_gas_price())
+        txn_dict['nonce'] = pn.get_next_nonce(web3, address)
+        handle = pn.submit_tracked_transaction(web3, private_key, txn_dict, **START_BOUNTY_SEND_ARGS,
+                                               label=f"startBounty {bounty_id}")
+        return handle, None
+
+    except ValueError as ve:
+        return None, f"{ve}"
+
+    except Exception as e:
+        print(f"Error type: {type(e).__name__}")
+        traceback.print_exc()
+        print(f"Error with transaction: {e}")
+
+    return None, "failed due to error"
+
+
+def collect_start_bounty(handle, status_msg, bounty_name, bounty_id, pirates, buffer, verbose=False):
+    """
+    Waits for a startBounty submitted with submit_start_bounty and writes the same output as rate_limited_start_bounty.
+
+    Returns:
+        success (int): 1 if the bounty was started successfully, 0 if there was an error.
+    """
+    append_start_bounty_messages(buffer, bounty_name, bounty_id, pirates, verbose)
+
+    txn_receipt = None
+    if handle is not None:
+        txn_receipt = handle.wait()
+        status_msg = handle.status if txn_receipt is not None else handle.error
+
+    return append_start_bounty_result(buffer, status_msg, txn_receipt)
+
+
+#-------- ASYNCIO VARIANTS -----------------------------------
+# These mirror the rate limited functions above for the asyncio engine in 3_pn_do_commands.
+# They take an AsyncWeb3 instance and contract from pn.AsyncWeb3Singleton, and rely on the
+# global concurrency limit in pn.async_rpc instead of the per function @limits decorators.
+
+async def async_active_bounty_ids(bounty_contract, address):
+    """
+    Fetches active bounty IDs for a specific account without blocking the event loop.
+
+    Args:
+        bounty_contract (object): The async bounty contract instance.
+        address (str): The account address to query.
+
+    Returns:
+        result (list): List of active bounty IDs.
+    """
+    return await pn.async_rpc(bounty_contract.functions.activeBountyIdsForAccount(address).call())
+
+
+async def async_has_pending_bounty(contract, address, group_id):
+    """
+    Checks if an account has a pending bounty for a specific group ID without blocking the event loop.
+
+    Args:
+        contract (object): The async contract instance.
+        address (str): The account address to check.
+        group_id (str): The group ID of the bounty to check.
+
+    Returns:
+        result (bool): True if a pending bounty exists, False otherwise.
+    """
+    try:
+        return await pn.async_rpc(contract.functions.hasPendingBounty(address, int(group_id)).call())
+    except Exception as e:
+        error_type = type(e).__name__
+        print(f"   {pn.C_RED}**async_has_pending_bounty -> Exception: {e} - {error_type}{pn.C_END}")
+        return False
+
+
+async def async_start_bounty(web3, contract_to_write, address, private_key, bounty_name, bounty_id, pirates, buffer, verbose=False):
+    """
+    Starts a bounty from the asyncio engine, writing the same output as rate_limited_start_bounty.
+
+    Args:
+        web3 (object): The AsyncWeb3 instance.
+        contract_to_write (object): The async contract instance for writing.
+        address (str): The sender's address.
+        private_key (str): The sender's private key.
+        bounty_name (str): The name of the bounty.
+        bounty_id (str): The ID of the bounty.
+        pirates (list): List of pirates to send on the bounty.
+        buffer (list): Buffer to store output messages.
+
+    Returns:
+        success (int): 1 if the bounty was started successfully, 0 if there was an error.
+    """
+    append_start_bounty_messages(buffer, bounty_name, bounty_id, pirates, verbose)
+
+    status_msg, txn_receipt = "failed due to error", None
+    try:
+        txn_dict = build_bounty_txn(contract_to_write, address, 'startBounty', [bounty_id, pirates])
+        txn_dict['nonce'] = await pn.get_next_nonce_async(web3, address)
+
+        txn_receipt = await pn.send_web3_transaction_async(web3, private_key, txn_dict, **START_BOUNTY_SEND_ARGS)
+        status_msg = pn.get_status_message(txn_receipt)
+
+    except ValueError as ve:
+        status_msg = f"{ve}"
+
+    except Exception as e:
+        print(f"Error type: {type(e).__name__}")
+        traceback.print_exc()
+        print(f"Error with transaction: {e}")
+
+    return append_start_bounty_result(buffer, status_msg, txn_receipt)
+
+
+async def async_end_bounty(web3, contract_to_write, address, private_key, bounty_id, buffer):
+    """
+    Ends an active bounty from the asyncio engine, writing the same output as rate_limited_end_bounty.
+
+    Args:
+        web3 (object): The AsyncWeb3 instance.
+        contract_to_write (object): The async contract instance for writing.
+        address (str): The sender's address.
+        private_key (str): The sender's private key.
+        bounty_id (str): The ID of the bounty to end.
+        buffer (list): Buffer to store output messages.
+
+    Returns:
+        success (int): 1 if the bounty was ended successfully, 0 if there was an error.
+    """
+    buffer.append(f"   Ending active_bounty_id: {bounty_id}")
+
+    try:
+        txn_dict = build_bounty_txn(contract_to_write, address, 'endBounty', [bounty_id])
+        txn_dict['nonce'] = await pn.get_next_nonce_async(web3, address)
+
+        txn_receipt = await pn.send_web3_transaction_async(web3, private_key, txn_dict, **END_BOUNTY_SEND_ARGS)
+        return append_end_bounty_result(buffer, txn_receipt)
+    except Exception as e:
+        return append_end_bounty_error(buffer, e)
 
 
 def get_bounties_to_execute(entity_ids):
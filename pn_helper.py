@@ -9,14 +9,20 @@ import datetime
 import questionary
 import inspect
 import json
+import hashlib
+import pickle
 import requests
 import math
 from decimal import Decimal, getcontext
 import pandas as pd
 from typing import Union
-from web3 import Web3
+from web3 import Web3, AsyncWeb3
+from web3.datastructures import AttributeDict
+from hexbytes import HexBytes
 from functools import lru_cache
 import threading
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from prompt_toolkit.styles import Style
 from termcolor import colored
 try:
@@ -84,6 +90,46 @@ _abi_URL_QuestSystem = "abi/QuestSystem.json"
 
 _contract_PirateNFT_addr = "0x1e52c21b9dfcd947d03e9546448f513f1ee8706c"
 
+# Multicall3 aggregator, deployed at the same address on most EVM chains. Set to None to always use the JSON-RPC batch fallback
+_contract_Multicall3_addr = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Multicall3 ABI snippet for the aggregate3 and getEthBalance functions
+MULTICALL3_ABI_SNIPPET = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
 @lru_cache(maxsize=32)
 def get_abi(file_path):
     with lock:
@@ -102,6 +148,140 @@ def get_abi(file_path):
             print(f"Error: {str(e)}")
             return None
 
+######################################################
+# HTTP CONNECTION POOLING
+######################################################
+
+# Default number of keep-alive connections held open per endpoint
+DEFAULT_POOL_SIZE = 10
+
+# Extra connections on top of the thread count, for background pollers sharing the same endpoint
+POOL_HEADROOM = 2
+
+class ConnectionPoolManager:
+    """
+    Singleton that owns one pooled, keep-alive requests.Session per endpoint.
+
+    The RPC and subgraph endpoints each get a session whose adapter is sized to the
+    number of worker threads, so threaded runs reuse warm TLS connections instead of
+    opening a new one per request, and never overflow the pool ("Connection pool is
+    full, discarding connection").
+
+    Usage:
+    - Call `configure(max_threads)` once the thread count is known (e.g. from --max_threads).
+    - Call `get_session(name)` to get the shared session for an endpoint ('rpc', 'rpc_alt', 'subgraph').
+    - Call `get_stats()` or `print_stats()` to see how many connections were opened versus reused.
+
+    NOTE: We auto create an instance of this below the class definition
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ConnectionPoolManager, cls).__new__(cls)
+            cls._instance._sessions = {}
+            cls._instance._pool_size = DEFAULT_POOL_SIZE
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    def _mount_adapter(self, session):
+        # close the adapter being replaced so its pooled connections don't leak
+        old_adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        for old_adapter in old_adapters.values():
+            old_adapter.close()
+
+    def configure(self, max_threads):
+        """Size every pool to the thread count, re-mounting adapters on sessions that already exist if the size changed."""
+        with self._lock:
+            pool_size = max(DEFAULT_POOL_SIZE, max_threads + POOL_HEADROOM)
+            if pool_size == self._pool_size:
+                return
+            self._pool_size = pool_size
+            for session in self._sessions.values():
+                self._mount_adapter(session)
+
+    def get_session(self, name):
+        """Return the shared pooled session for an endpoint, creating it on first use."""
+        session = self._sessions.get(name)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(name)
+                if session is None:
+                    session = requests.Session()
+                    self._mount_adapter(session)
+                    self._sessions[name] = session
+        return session
+
+    def get_stats(self):
+        """Return per-endpoint counts of requests made, connections opened, and connections reused."""
+        stats = {}
+        for name, session in list(self._sessions.items()):
+            requests_made = 0
+            connections_opened = 0
+
+            # the same adapter is mounted for http and https, so only count it once
+            adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools[key]
+                    requests_made += pool.num_requests
+                    connections_opened += pool.num_connections
+
+            stats[name] = {
+                'pool_size': self._pool_size,
+                'requests': requests_made,
+                'connections_opened': connections_opened,
+                'connections_reused': max(requests_made - connections_opened, 0)
+            }
+        return stats
+
+    def print_stats(self):
+        """Print the connection reuse stats for every endpoint."""
+        print(f"{C_CYAN}Connection pool stats:{C_END}")
+        for name, stat in self.get_stats().items():
+            print(f"   {name}: {stat['requests']} requests over {stat['connections_opened']} connection(s), "
+                  f"{stat['connections_reused']} reused (pool size {stat['pool_size']})")
+
+# Creating a single instance of the ConnectionPoolManager class, named '_connection_pool_manager'.
+_connection_pool_manager = ConnectionPoolManager()
+
+# Sizes the shared HTTP pools to the number of worker threads a script will run
+def configure_connection_pools(max_threads):
+    _connection_pool_manager.configure(max_threads)
+
+def print_connection_pool_stats():
+    _connection_pool_manager.print_stats()
+
+
+class PooledHTTPProvider(Web3.HTTPProvider):
+    """
+    HTTPProvider that sends every request through the shared pooled session.
+
+    web3's own HTTPProvider keeps a separate session per thread, so a ThreadPoolExecutor
+    sharing one Web3 instance would still open a new connection pool for each worker.
+    """
+
+    def __init__(self, endpoint_uri, session_name):
+        super().__init__(endpoint_uri)
+        self.session_name = session_name
+
+    def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        request_kwargs = dict(self.get_request_kwargs())
+        request_kwargs.setdefault('timeout', 10)
+
+        session = _connection_pool_manager.get_session(self.session_name)
+        response = session.post(self.endpoint_uri, data=request_data, **request_kwargs)
+        response.raise_for_status()
+
+        return self.decode_rpc_response(response.content)
+
+
 class Web3Singleton:
     _web3_Nova = None
     _web3_NovaAlt = None
@@ -110,17 +290,19 @@ class Web3Singleton:
     _PGLDToken = None
     _BountySystem = None
     _QuestSystem = None
+    _Multicall3 = None
+    _Multicall3_available = None
 
     @classmethod
     def get_web3_Apex(cls):
         if cls._web3_Nova is None:
-            cls._web3_Nova = Web3(Web3.HTTPProvider(URL_RPC))
+            cls._web3_Nova = Web3(PooledHTTPProvider(URL_RPC, 'rpc'))
         return cls._web3_Nova
 
     @classmethod
     def get_web3_ApexAlt(cls):
         if cls._web3_NovaAlt is None:
-            cls._web3_NovaAlt = Web3(Web3.HTTPProvider(URL_RPC_ALT))
+            cls._web3_NovaAlt = Web3(PooledHTTPProvider(URL_RPC_ALT, 'rpc_alt'))
         return cls._web3_NovaAlt
 
     @classmethod
@@ -158,6 +340,22 @@ class Web3Singleton:
             cls._QuestSystem = web3_Nova.eth.contract(address=_contract_QuestSystem_addr, abi=get_abi(_abi_URL_QuestSystem))
         return cls._QuestSystem      
 
+    # returns the Multicall3 aggregator contract, or None if no aggregator is deployed on the chain
+    @classmethod
+    def get_Multicall3(cls):
+        if cls._Multicall3_available is None:
+            cls._Multicall3_available = False
+            if _contract_Multicall3_addr is not None:
+                web3_Nova = cls.get_web3_Apex()
+                try:
+                    multicall_addr = Web3.to_checksum_address(_contract_Multicall3_addr)
+                    if len(web3_Nova.eth.get_code(multicall_addr)) > 0:
+                        cls._Multicall3 = web3_Nova.eth.contract(address=multicall_addr, abi=MULTICALL3_ABI_SNIPPET)
+                        cls._Multicall3_available = True
+                except Exception as e:
+                    print(f"{C_YELLOW}**get_Multicall3 -> {type(e).__name__}: {e}, using JSON-RPC batches instead{C_END}")
+        return cls._Multicall3 if cls._Multicall3_available else None
+
 # NOTE: REFACTOR TO REMOVE THESE stored instance
 # Why because every instance using PN Helper will instantiate all these
 # Make those scripts hold local references to just the ones they need
@@ -202,20 +400,336 @@ def add_inventory_data_path(filename):
     return f"{directory_path}{filename}"
 
 
+######################################################
+# STREAMING EXCEL WRITER
+######################################################
+
+class StreamingExcelWriter:
+    """
+    Writes a single sheet row by row using xlsxwriter's constant_memory mode, so each row is flushed
+    to disk as it is written instead of the whole sheet being held in memory by the workbook.
+
+    constant_memory mode does not allow worksheet tables, so the header row is styled like the table
+    header and given an autofilter instead. Freeze panes, column widths and an optional totals row are
+    applied the same way the pandas exports do them. Column widths are tracked while rows stream by.
+
+    Example:
+    >>> with StreamingExcelWriter("inventory/pirates_bob.xlsx", df.columns) as writer:
+    ...     writer.write_rows(df.itertuples(index=False, name=None))
+    """
+
+    HEADER_FORMAT = {'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#4472C4', 'border': 1}
+
+    def __init__(self, file_path, columns, strings_to_numbers=True):
+        # only the exports need xlsxwriter, so don't make every script import it
+        import xlsxwriter
+
+        self.file_path = file_path
+        self.columns = [str(col) for col in columns]
+        self.row_count = 0
+        self.column_widths = [len(col) + 2 for col in self.columns]
+
+        self.workbook = xlsxwriter.Workbook(file_path, {'constant_memory': True, 'strings_to_numbers': strings_to_numbers})
+        self.worksheet = self.workbook.add_worksheet('Sheet1')
+
+        # Freeze the first row (row 1, column 0)
+        self.worksheet.freeze_panes(1, 0)
+        self.worksheet.write_row(0, 0, self.columns, self.workbook.add_format(self.HEADER_FORMAT))
+
+    def _write_value(self, row, col, value):
+        # missing values are left as empty cells, xlsxwriter refuses to write NaN
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return
+        self.worksheet.write(row, col, value)
+        if col < len(self.column_widths):
+            self.column_widths[col] = max(self.column_widths[col], len(str(value)))
+
+    def write_row(self, values):
+        """Append one data row, values in column order."""
+        self.row_count += 1
+        for col, value in enumerate(values):
+            self._write_value(self.row_count, col, value)
+
+    def write_rows(self, rows):
+        for values in rows:
+            self.write_row(values)
+
+    def write_totals(self, values, start_column=0):
+        """Write a totals row one blank row below the data, starting at start_column. Call after the last data row."""
+        row_number = self.row_count + 2
+        for col_num, value in enumerate(values):
+            self._write_value(row_number, col_num + start_column, value)
+
+    def close(self):
+        self.worksheet.autofilter(0, 0, self.row_count, max(len(self.columns) - 1, 0))
+        for i, column_len in enumerate(self.column_widths):
+            self.worksheet.set_column(i, i, column_len)
+        self.workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+######################################################
+# ARROW SNAPSHOTS
+######################################################
+
+# returns the path of the Arrow snapshot that sits next to an exported .xlsx
+def snapshot_path_for(excel_file_name):
+    return f"{os.path.splitext(excel_file_name)[0]}.arrow"
+
+
+# Largest integer a float64 holds exactly
+_FLOAT64_EXACT_INT = 2 ** 53
+
+
+# Returns the column as int64 or float64 when that loses nothing, otherwise None so it is kept as strings
+def _arrow_numeric_column(series):
+    try:
+        numeric = pd.to_numeric(series)
+    except (ValueError, TypeError):
+        return None
+    if pd.api.types.is_signed_integer_dtype(numeric):
+        return numeric.astype('int64')
+    if pd.api.types.is_float_dtype(numeric):
+        # fractions are fine as floats, but wei sized integers would lose their low digits
+        if (numeric[numeric % 1 == 0].abs() >= _FLOAT64_EXACT_INT).any():
+            return None
+        return numeric
+    # uint64 or python ints past 64 bits
+    return None
+
+
+def _arrow_ready_df(df):
+    # Arrow wants one type per column, the exports mix Decimals, ints and numeric strings in object columns
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
+            numeric = _arrow_numeric_column(df[col])
+            if numeric is not None:
+                df[col] = numeric
+            else:
+                df[col] = df[col].map(lambda value: None if value is None or (isinstance(value, float) and math.isnan(value)) else str(value))
+    return df
+
+
+# Writes df as an uncompressed Arrow IPC file (so readers can memory map it), stamped with the snapshot time.
+# Returns the snapshot path, or None if pyarrow isn't installed or the write failed
+def write_arrow_snapshot(df, file_path, snapshot_time=None):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        print(f"{C_YELLOW}pyarrow is not installed, skipping the Arrow snapshot{C_END}")
+        return None
+
+    snapshot_time = snapshot_time or datetime.datetime.now(datetime.timezone.utc)
+    try:
+        table = pa.Table.from_pandas(_arrow_ready_df(df), preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'snapshot_at': snapshot_time.isoformat().encode()})
+
+        temp_path = f"{file_path}.tmp"
+        with pa.OSFile(temp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, file_path)
+        return file_path
+    except Exception as e:
+        print(f"{C_RED}**Could not write Arrow snapshot {file_path}{C_END}: {e}")
+        return None
+
+
+# Reads an Arrow snapshot, returns (DataFrame, snapshot time as an ISO string or None).
+# The file is memory mapped and only the listed columns (all when None, missing ones are skipped) are copied out
+# of the map into pandas, so pass columns to avoid materializing a wide export
+def read_arrow_snapshot(file_path, columns=None):
+    import pyarrow as pa
+
+    with pa.memory_map(file_path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select([name for name in columns if name in table.schema.names])
+        snapshot_at = (table.schema.metadata or {}).get(b'snapshot_at')
+        return table.to_pandas(), snapshot_at.decode() if snapshot_at else None
+
+
+# Loads an exported sheet, from its Arrow snapshot when there is one at least as new as the .xlsx, otherwise from Excel.
+# columns limits what is loaded, columns the export doesn't have are skipped
+def read_export(excel_file_name, columns=None):
+    arrow_file_name = snapshot_path_for(excel_file_name)
+    try:
+        if os.path.exists(arrow_file_name) and os.path.getmtime(arrow_file_name) >= os.path.getmtime(excel_file_name):
+            df, snapshot_at = read_arrow_snapshot(arrow_file_name, columns)
+            print(f"Loaded {arrow_file_name} (snapshot {snapshot_at})")
+            return df
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"{C_YELLOW}Could not read Arrow snapshot {arrow_file_name}, falling back to Excel{C_END}: {e}")
+    return pd.read_excel(excel_file_name, usecols=None if columns is None else lambda name: name in columns)
+
+
 from requests.exceptions import HTTPError, ConnectionError, Timeout, RequestException
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def get_data(query, max_retries=3, backoff_factor=0.3):
+######################################################
+# SUBGRAPH CACHE
+######################################################
+
+# Time to live for almost static game metadata (quests, game items), in seconds
+SUBGRAPH_TTL_STATIC = 6 * 60 * 60
+
+# Time to live for bounty definitions, in seconds
+SUBGRAPH_TTL_BOUNTIES = 60 * 60
+
+# How long past its TTL a cached response is still served while it is refreshed in the background, as a fraction
+# of that TTL, so short lived data like bounties is never served much older than its own TTL
+SUBGRAPH_STALE_FRACTION = 0.25
+
+# use: serve from the cache when fresh, bypass: always hit the network and leave the cache alone,
+# warm: always hit the network and store the result in the cache
+SUBGRAPH_CACHE_MODES = ['use', 'bypass', 'warm']
+
+
+class SubgraphCache:
+    """
+    Content addressed cache for subgraph responses, kept in memory and on disk under data_path("subgraph_cache/").
+    Responses are keyed on the sha256 of the whitespace normalized query text, so the same query
+    written with different indentation shares one entry.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(SubgraphCache, cls).__new__(cls)
+            cls._instance._entries = {}
+            cls._instance._refreshing = set()
+            cls._instance._lock = threading.Lock()
+            cls._instance.mode = 'use'
+            cls._instance.directory_path = data_path("subgraph_cache/")
+        return cls._instance
+
+    @staticmethod
+    def make_key(query):
+        normalized_query = re.sub(r'\s+', ' ', query).strip()
+        normalized_query = re.sub(r'\s*([{}()\[\]:,])\s*', r'\1', normalized_query)
+        return hashlib.sha256(normalized_query.encode('utf-8')).hexdigest()
+
+    def _file_path(self, key):
+        return os.path.join(self.directory_path, f"{key}.json")
+
+    def _read(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        try:
+            with open(self._file_path(key), 'r') as file:
+                entry = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def _write(self, key, query, data):
+        entry = {'fetched_at': time.time(), 'query': query, 'data': data}
+        with self._lock:
+            self._entries[key] = entry
+        try:
+            os.makedirs(self.directory_path, exist_ok=True)
+            temp_path = f"{self._file_path(key)}.tmp"
+            with open(temp_path, 'w') as file:
+                json.dump(entry, file)
+            os.replace(temp_path, self._file_path(key))
+        except OSError as e:
+            print(f"{C_RED}**Could not save subgraph cache entry{C_END}: {e}")
+
+    def _fetch_and_store(self, key, query, fetch):
+        data = fetch()
+        # never cache error responses, the next call should try the network again
+        if isinstance(data, dict) and 'data' in data and not data.get('errors'):
+            self._write(key, query, data)
+        return data
+
+    def _refresh_in_background(self, key, query, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch_and_store(key, query, fetch)
+            except Exception as e:
+                logging.error(f"Background subgraph refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="subgraph-refresh", daemon=True).start()
+
+    def get(self, query, ttl, stale_ttl, fetch):
+        if self.mode == 'bypass':
+            return fetch()
+
+        key = self.make_key(query)
+        if self.mode == 'warm':
+            return self._fetch_and_store(key, query, fetch)
+
+        entry = self._read(key)
+        if entry is not None:
+            age = time.time() - entry['fetched_at']
+            if age < ttl:
+                return entry['data']
+            if age < ttl + stale_ttl:
+                self._refresh_in_background(key, query, fetch)
+                return entry['data']
+
+        return self._fetch_and_store(key, query, fetch)
+
+
+_subgraph_cache = SubgraphCache()
+
+
+# Sets how get_data treats cacheable queries, one of SUBGRAPH_CACHE_MODES
+def set_subgraph_cache_mode(mode):
+    if mode not in SUBGRAPH_CACHE_MODES:
+        raise ValueError(f"Unknown subgraph cache mode '{mode}', expected one of {SUBGRAPH_CACHE_MODES}")
+    _subgraph_cache.mode = mode
+
+
+# Adds the --subgraph_cache flag to a script's argument parser
+def add_subgraph_cache_argument(parser):
+    parser.add_argument("--subgraph_cache", choices=SUBGRAPH_CACHE_MODES, default='use',
+                        help="use: serve game metadata from the on-disk cache when fresh, bypass: ignore the cache, warm: refetch and refresh the cache (default: use)")
+
+
+# Fetches data from the PN subgraph. When cache_ttl is given the response is served through the subgraph cache:
+# fresh entries come from memory or disk, entries up to stale_ttl past their TTL are served while refreshed in the background.
+# stale_ttl defaults to SUBGRAPH_STALE_FRACTION of cache_ttl, pass 0 to never serve stale data
+def get_data(query, max_retries=3, backoff_factor=0.3, cache_ttl=None, stale_ttl=None):
+    if cache_ttl is None:
+        return _fetch_data(query, max_retries, backoff_factor)
+    if stale_ttl is None:
+        stale_ttl = cache_ttl * SUBGRAPH_STALE_FRACTION
+    return _subgraph_cache.get(query, cache_ttl, stale_ttl, lambda: _fetch_data(query, max_retries, backoff_factor))
+
+
+def _fetch_data(query, max_retries=3, backoff_factor=0.3):
     url = URL_PIRATE_NATION_GRAPH_API
     headers = {'Content-Type': 'application/json'}
     retry_count = 0
 
     while retry_count < max_retries:
         try:
-            response = requests.post(url, json={'query': query}, headers=headers, timeout=10)
+            response = _connection_pool_manager.get_session('subgraph').post(url, json={'query': query}, headers=headers, timeout=10)
 
             # Raise an HTTPError if the status code is 4xx or 5xx
             response.raise_for_status()
@@ -247,6 +761,212 @@ def get_data(query, max_retries=3, backoff_factor=0.3):
 # data = get_data(query)
 
 
+######################################################
+# SUBGRAPH PAGINATION
+######################################################
+
+# The subgraph caps 'first' at 1000, and quietly defaults it to 100 when a query leaves it out
+SUBGRAPH_PAGE_SIZE = 1000
+
+# Page size for top level accounts queries. Those run per address chunk (get_accounts_chunked), which already bounds
+# the response size, so a full page means a chunk is one request instead of one plus an empty page
+SUBGRAPH_ACCOUNTS_PAGE_SIZE = SUBGRAPH_PAGE_SIZE
+
+# Arguments for the first page of a nested collection, fill_nested_pages carries on from its last id
+SUBGRAPH_FIRST_PAGE = f"first: {SUBGRAPH_PAGE_SIZE}, orderBy: id, orderDirection: asc"
+
+# How many nested collections fill_nested_pages pages through at the same time
+SUBGRAPH_MAX_WORKERS = 4
+
+# Placeholders a paginated query template puts in the paged collection's arguments and inside its where filter, e.g.
+#   quests($page_args, where: {$page_where})  or  accounts($page_args, where: {address_in: [...], $page_where})
+PAGE_ARGS = "$page_args"
+PAGE_WHERE = "$page_where"
+
+
+# Fills in the page placeholders of a query template, page one has no cursor
+def render_page_query(query_template, page_size=SUBGRAPH_PAGE_SIZE, cursor=None):
+    page_args = f"first: {page_size}, orderBy: id, orderDirection: asc"
+    # GraphQL treats commas as whitespace, so an empty condition after "address_in: [...]," is fine
+    page_where = f'id_gt: "{cursor}"' if cursor is not None else ""
+    return query_template.replace(PAGE_ARGS, page_args).replace(PAGE_WHERE, page_where)
+
+
+def _get_path(data, path):
+    for key in path:
+        data = data[key]
+    return data
+
+
+# Returns a copy of data with the value at path replaced, copying only the containers along the path
+# (responses can be shared with the subgraph cache, so they are never modified in place)
+def _replace_path(data, path, value):
+    if not path:
+        return value
+    copied = list(data) if isinstance(data, list) else dict(data)
+    copied[path[0]] = _replace_path(data[path[0]], path[1:], value)
+    return copied
+
+
+# Yields (response, page) for each page of the collection at path, paging by id_gt cursors until a short page.
+# path starts at the top of the response, e.g. ['data', 'quests']. On a failed page it yields (response, None) and stops
+def iter_subgraph_responses(query_template, path, page_size=SUBGRAPH_PAGE_SIZE, cursor=None, cache_ttl=None):
+    while True:
+        data = get_data(render_page_query(query_template, page_size, cursor), cache_ttl=cache_ttl)
+        try:
+            page = _get_path(data, path)
+        except (KeyError, IndexError, TypeError):
+            if isinstance(data, dict) and data.get('data') is not None and not data.get('errors'):
+                # a clean response without the path, e.g. an address the subgraph has never seen
+                yield data, []
+                return
+            errors = data.get('errors') if isinstance(data, dict) else data
+            print(f"{C_RED}**Subgraph page after {cursor} failed{C_END}: {errors}")
+            yield data, None
+            return
+
+        yield data, page
+
+        if len(page) < page_size:
+            return
+        cursor = page[-1]['id']
+
+
+# Streams the collection at path one page (list of entities) at a time
+def iter_subgraph_pages(query_template, path, page_size=SUBGRAPH_PAGE_SIZE, cursor=None, cache_ttl=None):
+    for _, page in iter_subgraph_responses(query_template, path, page_size, cursor, cache_ttl):
+        if page is not None:
+            yield page
+
+
+# Drop in for get_data on a paginated template: returns the first page's response with the list at path
+# holding every page. If the very first page fails, its response is returned as is
+def get_data_paginated(query_template, path, page_size=SUBGRAPH_PAGE_SIZE, cache_ttl=None):
+    first_response = None
+    items = []
+    for data, page in iter_subgraph_responses(query_template, path, page_size, cache_ttl=cache_ttl):
+        if page is None:
+            # nothing to merge into if the first page itself failed, later failures keep what we have
+            if first_response is None:
+                return data
+            break
+        if first_response is None:
+            first_response = data
+        items.extend(page)
+
+    try:
+        return _replace_path(first_response, path, items)
+    except (KeyError, IndexError, TypeError):
+        # the path isn't in the response at all, so there was nothing to page
+        return first_response
+
+
+# Nested lists (an account's nfts, its game items) come back one page at a time too. For every parent at parents_path
+# whose child_key list came back full, fetch the rest with child_query_for(parent), a paginated template for just that
+# parent with the list at child_path, carrying on from the last id. Parents are paged concurrently.
+# The nested list must have been requested with SUBGRAPH_FIRST_PAGE so its order matches the id_gt cursor.
+# A failed page raises instead of leaving a parent's list cut short, so get_accounts_chunked retries or reports the chunk.
+def fill_nested_pages(data, parents_path, child_key, child_query_for, child_path, max_workers=SUBGRAPH_MAX_WORKERS):
+    try:
+        parents = _get_path(data, parents_path)
+    except (KeyError, IndexError, TypeError):
+        return data
+
+    full_parents = [i for i, parent in enumerate(parents) if len(parent.get(child_key) or []) >= SUBGRAPH_PAGE_SIZE]
+    if not full_parents:
+        return data
+
+    def fetch_rest(index):
+        parent = parents[index]
+        rest = []
+        for data, page in iter_subgraph_responses(child_query_for(parent), child_path, cursor=parent[child_key][-1]['id']):
+            if page is None:
+                errors = data.get('errors') if isinstance(data, dict) else data
+                raise ValueError(f"{child_key} of {parent.get('address', parent.get('id'))} could not be fully paged: {errors}")
+            rest.extend(page)
+        return rest
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(full_parents)))) as executor:
+        rests = list(executor.map(fetch_rest, full_parents))
+
+    parents = list(parents)
+    for index, rest in zip(full_parents, rests):
+        parents[index] = {**parents[index], child_key: parents[index][child_key] + rest}
+    return _replace_path(data, parents_path, parents)
+
+
+######################################################
+# CHUNKED ADDRESS QUERIES
+######################################################
+
+# Addresses per address_in request, how many of those requests run at once, and how many times a failed one is retried
+SUBGRAPH_ADDRESS_CHUNK_SIZE = 100
+SUBGRAPH_CHUNK_WORKERS = 4
+SUBGRAPH_CHUNK_RETRIES = 2
+
+
+def _chunk_accounts(response):
+    try:
+        accounts = response['data']['accounts']
+    except (KeyError, TypeError):
+        return None
+    if response.get('errors') or not isinstance(accounts, list):
+        return None
+    return accounts
+
+
+# Splits addresses into chunks, runs fetch_chunk(chunk_addresses) for each on a bounded pool and merges the
+# responses into one {'data': {'accounts': [...]}} in the original address order. fetch_chunk returns a get_data
+# style response. Only failed chunks are retried, split in half each time in case they failed on size.
+# Other top level fields come from the first chunk, except _meta which keeps the oldest block so it's safe to resume from.
+# Addresses whose chunk still failed after the retries are listed under 'failed' next to 'data' (empty when all succeeded);
+# their accounts are missing from the result and _meta says nothing about them
+def get_accounts_chunked(addresses, fetch_chunk, chunk_size=SUBGRAPH_ADDRESS_CHUNK_SIZE,
+                         max_workers=SUBGRAPH_CHUNK_WORKERS, retries=SUBGRAPH_CHUNK_RETRIES):
+    addresses = [address.lower() for address in addresses]
+    pending = [addresses[i:i + chunk_size] for i in range(0, len(addresses), chunk_size)]
+    responses = []
+
+    def run_chunk(chunk):
+        try:
+            return fetch_chunk(chunk)
+        except Exception as e:
+            return {'errors': [str(e)]}
+
+    for attempt in range(retries + 1):
+        if not pending:
+            break
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+            results = list(executor.map(run_chunk, pending))
+
+        failed = []
+        for chunk, response in zip(pending, results):
+            if _chunk_accounts(response) is None:
+                failed.append(chunk)
+            else:
+                responses.append(response)
+
+        if failed and attempt < retries:
+            print(f"{C_YELLOW}Retrying {len(failed)} failed address chunk(s){C_END}")
+            pending = [half for chunk in failed for half in ([chunk[:len(chunk) // 2], chunk[len(chunk) // 2:]] if len(chunk) > 1 else [chunk])]
+        else:
+            pending = failed
+
+    if pending:
+        print(f"{C_RED}**Subgraph query failed for {sum(len(chunk) for chunk in pending)} address(es){C_END}: {', '.join(a for chunk in pending for a in chunk)}")
+
+    merged = {key: value for key, value in (responses[0]['data'].items() if responses else []) if key != 'accounts'}
+    blocks = [response['data']['_meta']['block']['number'] for response in responses if (response['data'].get('_meta') or {}).get('block')]
+    if blocks:
+        merged['_meta'] = {'block': {'number': min(blocks, key=int)}}
+
+    position = {address: i for i, address in enumerate(addresses)}
+    accounts = [account for response in responses for account in _chunk_accounts(response)]
+    accounts.sort(key=lambda account: position.get(str(account.get('address', '')).lower(), len(position)))
+    merged['accounts'] = accounts
+    return {'data': merged, 'failed': [address for chunk in pending for address in chunk]}
+
+
 # read addresses from a file path passed in stripping funny characters, etc
 def read_addresses(file_path):
     try:
@@ -373,6 +1093,254 @@ def get_energy(address, long_form=False):
         return None
 
 
+######################################################
+# JSON-RPC BATCHING
+######################################################
+
+# Maximum number of requests packed into a single JSON-RPC batch payload
+RPC_BATCH_SIZE = 100
+
+class JsonRpcBatch:
+    """
+    Collects many JSON-RPC read requests and sends them as batch payloads.
+
+    Every request added is queued locally, and `execute` posts them in chunks of
+    `batch_size` so hundreds of reads cost a handful of round trips. Results are
+    returned in the order the requests were added; a request the node answers
+    with an error comes back as None instead of failing the whole batch.
+
+    Example:
+    >>> batch = JsonRpcBatch()
+    >>> batch.add_get_balance("0xAddress1")
+    >>> batch.add_get_balance("0xAddress2")
+    >>> batch.execute()
+    ['0x2386f26fc10000', '0x0']
+    """
+
+    def __init__(self, url=URL_RPC, batch_size=RPC_BATCH_SIZE):
+        self.url = url
+        self.batch_size = batch_size
+        self._requests = []
+
+    def __len__(self):
+        return len(self._requests)
+
+    def add(self, method, params):
+        """Queue a request and return its position in the results list."""
+        request_id = len(self._requests)
+        self._requests.append({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params})
+        return request_id
+
+    def add_eth_call(self, to, data, block="latest"):
+        """Queue an eth_call against a contract address with pre-encoded call data."""
+        return self.add("eth_call", [{'to': to, 'data': data}, block])
+
+    def add_get_balance(self, address, block="latest"):
+        """Queue an eth_getBalance for an address."""
+        return self.add("eth_getBalance", [to_web3_address(address), block])
+
+    def execute(self, max_retries=3, backoff_factor=0.3):
+        """Send every queued request and return the raw results in insertion order."""
+        results = [None] * len(self._requests)
+
+        for start in range(0, len(self._requests), self.batch_size):
+            chunk = self._requests[start:start + self.batch_size]
+            responses = _post_rpc_batch(self.url, chunk, max_retries, backoff_factor)
+
+            # Nodes are free to answer a batch out of order, so match responses back up by id
+            for response in responses:
+                request_id = response.get('id')
+                if 'error' in response:
+                    print(f"{C_RED}**JsonRpcBatch -> {self._requests[request_id]['method']} error: {response['error']}{C_END}")
+                    continue
+                results[request_id] = response.get('result')
+
+        self._requests = []
+        return results
+
+
+# Posts one JSON-RPC batch payload with the same retry behaviour as get_data
+def _post_rpc_batch(url, payload, max_retries=3, backoff_factor=0.3):
+    headers = {'Content-Type': 'application/json'}
+    retry_count = 0
+
+    while True:
+        try:
+            response = _connection_pool_manager.get_session('rpc').post(url, json=payload, headers=headers, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+
+            # A node that rejects the whole batch answers with a single error object
+            if isinstance(data, dict):
+                raise ValueError(f"Batch rejected by node: {data.get('error', data)}")
+
+            return data
+
+        except (requests.exceptions.HTTPError, requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            retry_count += 1
+            if retry_count >= max_retries:
+                raise
+            sleep_time = backoff_factor * (2 ** (retry_count - 1))
+            print(f"{C_YELLOW}**_post_rpc_batch -> {type(e).__name__}, retrying in {sleep_time} seconds{C_END}")
+            time.sleep(sleep_time)
+
+
+# Returns the list of ABI output types for a function, so raw eth_call results can be decoded
+def get_abi_output_types(abi, function_name):
+    def _type_string(output):
+        if output['type'].startswith('tuple'):
+            inner = ','.join(_type_string(component) for component in output['components'])
+            return f"({inner}){output['type'][len('tuple'):]}"
+        return output['type']
+
+    for entry in abi:
+        if entry.get('type') == 'function' and entry.get('name') == function_name:
+            return [_type_string(output) for output in entry.get('outputs', [])]
+
+    raise ValueError(f"Function '{function_name}' not found in ABI")
+
+
+# Encodes a view function call on a contract into the (to, data) pair used by eth_call
+def encode_view_call(contract, function_name, args):
+    return contract.address, contract.encodeABI(fn_name=function_name, args=args)
+
+
+# Decodes a raw eth_call result (hex string or bytes) using the contract's ABI, single outputs are unwrapped
+def decode_view_result(contract, function_name, raw_result):
+    if raw_result is None:
+        return None
+
+    raw_bytes = bytes(raw_result) if isinstance(raw_result, (bytes, bytearray)) else Web3.to_bytes(hexstr=raw_result)
+    if len(raw_bytes) == 0:
+        return None
+
+    output_types = get_abi_output_types(contract.abi, function_name)
+    decoded = contract.w3.codec.decode(output_types, raw_bytes)
+    return decoded[0] if len(decoded) == 1 else decoded
+
+
+# Runs a list of (contract, function_name, args) view calls as JSON-RPC batches
+# and returns the decoded results in the same order, with None for any call that failed
+def batch_view_calls(calls):
+    batch = JsonRpcBatch()
+    for contract, function_name, args in calls:
+        batch.add_eth_call(*encode_view_call(contract, function_name, args))
+
+    raw_results = batch.execute()
+
+    results = []
+    for (contract, function_name, args), raw_result in zip(calls, raw_results):
+        try:
+            results.append(decode_view_result(contract, function_name, raw_result))
+        except Exception as e:
+            print(f"{C_RED}**batch_view_calls -> {function_name}{tuple(args)} decode error: {e}{C_END}")
+            results.append(None)
+
+    return results
+
+
+######################################################
+# MULTICALL AGGREGATION
+######################################################
+
+# Number of view calls encoded into a single aggregate3 eth_call
+MULTICALL_CHUNK_SIZE = 250
+
+# Runs a list of (contract, function_name, args) view calls through the Multicall3 aggregator,
+# packing up to chunk_size calls into each eth_call. Results are decoded with each contract's ABI
+# and returned in order, with None for any call that reverted.
+# Falls back to batch_view_calls when no aggregator is deployed or an aggregate call fails.
+def multicall_view_calls(calls, chunk_size=MULTICALL_CHUNK_SIZE):
+    aggregator = Web3Singleton.get_Multicall3()
+    if aggregator is None:
+        return batch_view_calls(calls)
+
+    results = []
+    for start in range(0, len(calls), chunk_size):
+        chunk = calls[start:start + chunk_size]
+        call_structs = [(target, True, call_data) for target, call_data in
+                        (encode_view_call(contract, function_name, args) for contract, function_name, args in chunk)]
+
+        try:
+            aggregate_results = aggregator.functions.aggregate3(call_structs).call()
+        except Exception as e:
+            print(f"{C_YELLOW}**multicall_view_calls -> {type(e).__name__}: {e}, retrying chunk as a JSON-RPC batch{C_END}")
+            results.extend(batch_view_calls(chunk))
+            continue
+
+        for (contract, function_name, args), (success, return_data) in zip(chunk, aggregate_results):
+            if not success:
+                results.append(None)
+                continue
+            try:
+                results.append(decode_view_result(contract, function_name, return_data))
+            except Exception as e:
+                print(f"{C_RED}**multicall_view_calls -> {function_name}{tuple(args)} decode error: {e}{C_END}")
+                results.append(None)
+
+    return results
+
+
+# Batched variant of get_energy, returns a dictionary of lowercase address -> energy (None on failure)
+def get_energy_batch(addresses, long_form=False):
+    try:
+        energy_system = Web3Singleton.get_EnergySystem()
+        results = multicall_view_calls([(energy_system, 'getEnergy', [int(address, 16)]) for address in addresses])
+    except Exception as e:
+        error_type = type(e).__name__
+        print(f"{C_RED}**get_energy_batch -> Exception: {e} - {error_type}{C_END}")
+        return {}
+
+    energy_dict = {}
+    for address, result in zip(addresses, results):
+        if result is not None and not long_form:
+            result = math.floor(result / 10 ** 18)
+        energy_dict[address.lower()] = result
+
+    return energy_dict
+
+
+# Batched variant of get_apex_eth_balance, returns a dictionary of lowercase address -> (eth, weth)
+def get_apex_eth_balance_batch(addresses):
+    try:
+        web3 = Web3Singleton.get_web3_Apex()
+        weth_contract = web3.eth.contract(address=to_web3_address(_contract_WETH_addr), abi=ERC20_ABI_SNIPPET)
+        aggregator = Web3Singleton.get_Multicall3()
+
+        if aggregator is not None:
+            # Multicall3 can read native balances itself, so both balances go into the same aggregate calls
+            calls = []
+            for address in addresses:
+                calls.append((aggregator, 'getEthBalance', [to_web3_address(address)]))
+                calls.append((weth_contract, 'balanceOf', [to_web3_address(address)]))
+            results = multicall_view_calls(calls)
+        else:
+            # Interleave the eth balance and weth balanceOf request for each address
+            batch = JsonRpcBatch()
+            for address in addresses:
+                batch.add_get_balance(address)
+                batch.add_eth_call(*encode_view_call(weth_contract, 'balanceOf', [to_web3_address(address)]))
+
+            raw_results = batch.execute()
+            results = []
+            for i in range(0, len(raw_results), 2):
+                results.append(int(raw_results[i], 16) if raw_results[i] is not None else None)
+                results.append(decode_view_result(weth_contract, 'balanceOf', raw_results[i + 1]))
+    except Exception as e:
+        error_type = type(e).__name__
+        print(f"**get_apex_eth_balance_batch -> Exception: {e} - {error_type}")
+        return {}
+
+    balance_dict = {}
+    for i, address in enumerate(addresses):
+        eth_balance_wei, weth_balance_wei = results[2 * i], results[2 * i + 1]
+        eth_balance_eth = float(web3.from_wei(eth_balance_wei, 'ether')) if eth_balance_wei is not None else None
+        weth_balance_eth = float(web3.from_wei(weth_balance_wei, 'ether')) if weth_balance_wei is not None else None
+        balance_dict[address.lower()] = (eth_balance_eth, weth_balance_eth)
+
+    return balance_dict
+
+
 # Global variable to store the address to key mapping
 _address_key_mapping = None
 _address_file_name = None
@@ -452,12 +1420,15 @@ def entity_to_token(packed_result: int) -> Union[str, int]:
 
     return ("0x" + address_str, token_id)  # Prefix the Ethereum address with '0x'
 
-# A query to get all pirates that belong to a given address
+# Where the pirate list sits in a make_pirate_query response, for get_data_paginated
+PIRATE_QUERY_PATH = ['data', 'accounts', 0, 'nfts']
+
+# A paginated query template to get all pirates that belong to a given address, use with get_data_paginated(query, PIRATE_QUERY_PATH)
 def make_pirate_query(address):
     return f"""
     {{
       accounts(where: {{address: "{address.lower()}"}}){{
-        nfts(where:{{or: [{{nftType: "pirate"}}, {{nftType: "starterpirate"}}]}}){{
+        nfts({PAGE_ARGS}, where: {{nftType_in: ["pirate", "starterpirate"], {PAGE_WHERE}}}){{
             name
             nftType
             id
@@ -478,7 +1449,8 @@ def fetch_game_item_data(address):
     {{
       accounts(where: {{address: "{address.lower()}"}}){{
         address
-        gameItems(where: {{amount_gt:0}}){{
+        gameItems({PAGE_ARGS}, where: {{amount_gt:0, {PAGE_WHERE}}}){{
+            id
             amount
             gameItem{{
                 tokenId
@@ -491,13 +1463,14 @@ def fetch_game_item_data(address):
       }}
     }}
     """
-    return get_data(query)
+    return get_data_paginated(query, ['data', 'accounts', 0, 'gameItems'])
 
 
 def fetch_game_items_data():
     item_query = """
     {
-        gameItems(first: 1000) {
+        gameItems($page_args, where: {$page_where}) {
+            id
             worldEntity {
                 name
                 gameItem
@@ -516,7 +1489,7 @@ def fetch_game_items_data():
         }
     }
     """
-    data = get_data(item_query)
+    data = get_data_paginated(item_query, ['data', 'gameItems'], cache_ttl=SUBGRAPH_TTL_STATIC)
     
     # Check if the data has the expected structure
     if isinstance(data, dict) and "data" in data and "gameItems" in data["data"]:
@@ -590,10 +1563,11 @@ def get_amount_by_world_entity_id(data, world_entity_id):
         return 0
     
 
-def fetch_quest_data():
+# With use_cache=False the quests come straight from the subgraph, e.g. to pick up a quest added since the cached copy
+def fetch_quest_data(use_cache=True):
     query = f"""
     {{
-      quests(first: 1000) {{
+      quests({PAGE_ARGS}, where: {{{PAGE_WHERE}}}) {{
         id
         inputs {{
           id
@@ -611,55 +1585,452 @@ def fetch_quest_data():
       }}
     }}
     """
-    return get_data(query)
+    return get_data_paginated(query, ['data', 'quests'], cache_ttl=SUBGRAPH_TTL_STATIC if use_cache else None)
+
+
+
+# makes sure to properly format address to checksum lowercase variant
+def to_web3_address(address):
+    return Web3.to_checksum_address(address.lower())
+
+
+# Custom exception class for gas limit exceeded
+class GasLimitExceededError(Exception):
+    def __init__(self, message="Gas limit exceeded"):
+        self.message = message
+        super().__init__(self.message)
+
+
+# Try importing TransactionError, fall back to generic Exception if not available
+try:
+    from web3.exceptions import TransactionError
+except ImportError:
+    TransactionError = Exception
+
+
+######################################################
+# GAS ORACLE
+######################################################
+
+# How often the gas oracle checks for a new block, in seconds
+GAS_ORACLE_POLL_INTERVAL = 1.0
+
+# Cached gas data older than this is refreshed inline instead of served, in seconds
+GAS_ORACLE_MAX_AGE = 5.0
+
+# The background poller stops after this many seconds without a read, and restarts on the next read
+GAS_ORACLE_IDLE_TIMEOUT = 60.0
+
+
+class GasOracle:
+    """
+    Serves the latest base fee and gas price from memory to every thread.
+    A background thread polls the node once per interval with a single batched request
+    (latest block + gas price) and only replaces the cached values when a new block shows up.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(GasOracle, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._thread = None
+            cls._instance._block_number = None
+            cls._instance._base_fee = None
+            cls._instance._gas_price = None
+            cls._instance._fetched_at = 0
+            cls._instance._last_read = 0
+        return cls._instance
+
+    def _fetch(self):
+        batch = JsonRpcBatch()
+        batch.add('eth_getBlockByNumber', ['latest', False])
+        batch.add('eth_gasPrice', [])
+        latest_block, gas_price = batch.execute()
+        if latest_block is None or gas_price is None:
+            raise ValueError("Gas oracle could not read the latest block or gas price")
+
+        block_number = int(latest_block['number'], 16)
+        base_fee = latest_block.get('baseFeePerGas')
+        with self._lock:
+            if self._block_number != block_number:
+                self._block_number = block_number
+                self._base_fee = int(base_fee, 16) if base_fee is not None else None
+                self._gas_price = int(gas_price, 16)
+            self._fetched_at = time.time()
+
+    def _poll_loop(self):
+        while time.time() - self._last_read < GAS_ORACLE_IDLE_TIMEOUT:
+            time.sleep(GAS_ORACLE_POLL_INTERVAL)
+            try:
+                self._fetch()
+            except Exception as e:
+                print(f"{C_RED}**Gas oracle error{C_END}: {type(e).__name__} - {e}")
+        with self._lock:
+            self._thread = None
+
+    def _ensure_fresh(self):
+        self._last_read = time.time()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll_loop, name="gas-oracle", daemon=True)
+                self._thread.start()
+            is_stale = time.time() - self._fetched_at > GAS_ORACLE_MAX_AGE
+        if is_stale:
+            self._fetch()
+
+    def get_base_fee(self):
+        self._ensure_fresh()
+        return self._base_fee
+
+    def get_gas_price(self):
+        self._ensure_fresh()
+        return self._gas_price
+
+    def get_block_number(self):
+        self._ensure_fresh()
+        return self._block_number
+
+
+_gas_oracle = GasOracle()
+
+
+# Returns the base fee of the latest block in wei from the shared gas oracle, or default if the chain has no base fee
+def get_base_fee(default=None):
+    base_fee = _gas_oracle.get_base_fee()
+    return base_fee if base_fee is not None else default
+
+
+# Returns the node's current gas price in wei from the shared gas oracle
+def get_gas_price():
+    return _gas_oracle.get_gas_price()
+
+
+######################################################
+# GAS ESTIMATE CACHE
+######################################################
+
+# Safety margin applied on top of a cached gas estimate
+GAS_ESTIMATE_MARGIN = 1.2
+
+# A failed transaction that used at least this share of its gas limit is treated as out of gas
+GAS_OUT_OF_GAS_RATIO = 0.95
+
+
+class GasEstimateCache:
+    """
+    Persistent cache of gas estimates keyed on (contract, function selector, argument shape).
+    The argument shape is the calldata length in 32 byte words, which changes with the number of
+    items in the dynamic arrays but not with their values, so repeat calls of the same function
+    with the same number of entries reuse one estimate.
+
+    Only meant for uniform calls whose revert conditions the caller has already checked, such as item
+    transfers trimmed to on-chain balances. A cache hit skips eth_estimateGas, which is also the node's
+    revert check, and the key ignores argument values, so calls that can revert or whose gas depends on
+    the ids passed in (startBounty, startQuest, transfers sized from subgraph data) must not use it.
+
+    Entries hold the highest gas seen for the key (estimate or receipt gasUsed). A transaction that
+    runs out of gas drops its entry so the next send estimates again.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(GasEstimateCache, cls).__new__(cls)
+            cls._instance._entries = None
+            cls._instance._lock = threading.Lock()
+            cls._instance.margin = GAS_ESTIMATE_MARGIN
+            cls._instance.file_path = data_path("gas_estimate_cache.json")
+        return cls._instance
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.file_path, 'r') as file:
+                    self._entries = json.load(file)
+            except (FileNotFoundError, ValueError):
+                self._entries = {}
+
+    def _save(self):
+        try:
+            temp_path = f"{self.file_path}.tmp"
+            with open(temp_path, 'w') as file:
+                json.dump(self._entries, file, indent=2, sort_keys=True)
+            os.replace(temp_path, self.file_path)
+        except OSError as e:
+            print(f"{C_RED}**Could not save gas estimate cache{C_END}: {e}")
+
+    @staticmethod
+    def make_key(txn_dict):
+        data = txn_dict.get('data')
+        if not data or txn_dict.get('to') is None:
+            return None
+        data = data if isinstance(data, str) else '0x' + bytes(data).hex()
+        selector = data[:10].lower()
+        shape = (len(data) - 10) // 64
+        return f"{txn_dict['to'].lower()}:{selector}:{shape}"
+
+    def lookup(self, key):
+        if key is None:
+            return None
+        with self._lock:
+            self._load()
+            return self._entries.get(key)
+
+    def record(self, key, gas):
+        if key is None:
+            return
+        with self._lock:
+            self._load()
+            if gas > self._entries.get(key, 0):
+                self._entries[key] = int(gas)
+                self._save()
+
+    def invalidate(self, key):
+        if key is None:
+            return
+        with self._lock:
+            self._load()
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+    def observe_receipt(self, key, gas_limit, txn_receipt):
+        if key is None or txn_receipt is None:
+            return
+        if txn_receipt['status'] == 1:
+            self.record(key, txn_receipt['gasUsed'])
+        elif gas_limit and txn_receipt['gasUsed'] >= gas_limit * GAS_OUT_OF_GAS_RATIO:
+            print(f"{C_YELLOW}Transaction ran out of gas, dropping cached estimate for {key}{C_END}")
+            self.invalidate(key)
+
+
+_gas_estimate_cache = GasEstimateCache()
+
+
+# Sets the margin applied to cached gas estimates, and optionally where the cache lives on disk
+def configure_gas_estimate_cache(margin=GAS_ESTIMATE_MARGIN, file_path=None):
+    _gas_estimate_cache.margin = margin
+    if file_path is not None:
+        with _gas_estimate_cache._lock:
+            _gas_estimate_cache.file_path = file_path
+            _gas_estimate_cache._entries = None
+
+
+# Returns the cached gas estimate for key with the cache margin applied, or None when there is none
+def _cached_gas_limit(key):
+    cached_gas = _gas_estimate_cache.lookup(key)
+    return None if cached_gas is None else int(cached_gas * _gas_estimate_cache.margin)
+
+
+# Returns the gas limit for the transaction. With use_cache a cached estimate (plus margin) is used when one exists,
+# otherwise eth_estimateGas is called, recorded in the cache, and fresh_margin is applied.
+# Note a cache hit skips the node's pre-flight check, so a call that would revert is only caught on chain;
+# only use the cache for calls that can't revert for reasons the caller hasn't already checked.
+def estimate_gas_limit(web3, txn_dict, fresh_margin=1.0, use_cache=False):
+    key = GasEstimateCache.make_key(txn_dict) if use_cache else None
+    cached_gas_limit = _cached_gas_limit(key)
+    if cached_gas_limit is not None:
+        return cached_gas_limit
+
+    estimated_gas = web3.eth.estimate_gas(txn_dict)
+    _gas_estimate_cache.record(key, estimated_gas)
+    return int(estimated_gas * fresh_margin)
+
+
+######################################################
+# NONCE MANAGEMENT
+######################################################
+
+class NonceManager:
+    """
+    Hands out nonces per wallet locally so one wallet can send several transactions back-to-back
+    without asking the node for its transaction count before each one.
+
+    The pending transaction count is fetched once per wallet, then incremented locally on every
+    allocation. Any failed or dropped send invalidates the wallet so the next allocation resyncs
+    from the node.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(NonceManager, cls).__new__(cls)
+            cls._instance._next_nonces = {}
+            cls._instance._wallet_locks = {}
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    def _get_wallet_lock(self, key):
+        with self._lock:
+            if key not in self._wallet_locks:
+                self._wallet_locks[key] = threading.Lock()
+            return self._wallet_locks[key]
+
+    def get_nonce(self, web3, address):
+        key = address.lower()
+        with self._get_wallet_lock(key):
+            if key not in self._next_nonces:
+                self._next_nonces[key] = web3.eth.get_transaction_count(to_web3_address(address), 'pending')
+            nonce = self._next_nonces[key]
+            self._next_nonces[key] = nonce + 1
+            return nonce
+
+    async def get_nonce_async(self, web3, address):
+        key = address.lower()
+        if key not in self._next_nonces:
+            pending_count = await async_rpc(web3.eth.get_transaction_count(to_web3_address(address), 'pending'))
+            with self._get_wallet_lock(key):
+                self._next_nonces.setdefault(key, pending_count)
+        with self._get_wallet_lock(key):
+            nonce = self._next_nonces[key]
+            self._next_nonces[key] = nonce + 1
+            return nonce
+
+    def invalidate(self, address):
+        if address is None:
+            return
+        key = address.lower()
+        with self._get_wallet_lock(key):
+            self._next_nonces.pop(key, None)
+
+    def resync(self, web3, address):
+        self.invalidate(address)
+        return self.get_nonce(web3, address)
+
+
+_nonce_manager = NonceManager()
+
+
+# Returns the next nonce to use for the address, fetching the pending count from the node only the first time
+def get_next_nonce(web3, address):
+    return _nonce_manager.get_nonce(web3, address)
+
+
+# Async variant of get_next_nonce for AsyncWeb3 instances
+async def get_next_nonce_async(web3, address):
+    return await _nonce_manager.get_nonce_async(web3, address)
+
+
+# Forgets the locally tracked nonce for the address so the next allocation resyncs from the node
+def resync_nonce(address):
+    _nonce_manager.invalidate(address)
 
 
+def send_web3_transaction(web3, private_key, txn_dict, max_transaction_cost_usd=0.0333, is_legacy=True, retries=120, retry_delay=300, use_gas_cache=False):
+    send_function = send_web3_transaction_legacy if is_legacy else send_web3_transaction_modern
+    return _send_with_retries(web3, txn_dict, retries, retry_delay,
+                              lambda: send_function(web3, private_key, txn_dict, max_transaction_cost_usd, use_gas_cache))
 
-# makes sure to properly format address to checksum lowercase variant
-def to_web3_address(address):
-    return Web3.to_checksum_address(address.lower())
 
+# Same as send_web3_transaction, but returns the transaction hash as soon as the node accepts it instead of waiting for the receipt
+def submit_web3_transaction(web3, private_key, txn_dict, max_transaction_cost_usd=0.0333, is_legacy=True, retries=120, retry_delay=300, use_gas_cache=False):
+    submit_function = submit_web3_transaction_legacy if is_legacy else submit_web3_transaction_modern
+    return _send_with_retries(web3, txn_dict, retries, retry_delay,
+                              lambda: submit_function(web3, private_key, txn_dict, max_transaction_cost_usd, use_gas_cache))
 
-# Custom exception class for gas limit exceeded
-class GasLimitExceededError(Exception):
-    def __init__(self, message="Gas limit exceeded"):
-        self.message = message
-        super().__init__(self.message)
 
+# What a failed send attempt does next, shared by the sync and asyncio send loops
+SEND_RETRY_RESYNC = 'resync'  # another sender used this nonce (or it was dropped), pick up the node's view and resend
+SEND_RETRY_WAIT = 'wait'      # fees were off, wait retry_delay and resend
+SEND_RETRY_RAISE = 'raise'    # give up and re-raise
 
-# Try importing TransactionError, fall back to generic Exception if not available
-try:
-    from web3.exceptions import TransactionError
-except ImportError:
-    TransactionError = Exception
+
+# Decides what to do after a failed send attempt (attempt counts the retries so far). Giving up invalidates
+# the wallet nonce so the next send resyncs from the node
+def _send_retry_action(txn_dict, error_message, attempt, retries):
+    if is_nonce_error(error_message) and 'from' in txn_dict and attempt < retries:
+        return SEND_RETRY_RESYNC
+    if is_retryable_fee_error(error_message) and attempt < retries:
+        return SEND_RETRY_WAIT
+    _nonce_manager.invalidate(txn_dict.get('from'))
+    return SEND_RETRY_RAISE
+
+
+def _print_send_retry(action, attempt, error_message, txn_dict, retry_delay):
+    if action == SEND_RETRY_RESYNC:
+        print(f"Attempt {attempt + 1}: Nonce out of sync ({error_message}). Retrying with nonce {txn_dict['nonce']}...")
+    else:
+        print(f"Attempt {attempt + 1}: Error encountered ({error_message}). Retrying in {retry_delay} seconds...")
 
 
-def send_web3_transaction(web3, private_key, txn_dict, max_transaction_cost_usd=0.0333, is_legacy=True, retries=120, retry_delay=300):
+# Runs a send attempt, retrying on fee and nonce errors, and invalidating the wallet nonce when giving up
+def _send_with_retries(web3, txn_dict, retries, retry_delay, send_attempt):
     attempt = 0
     while True:  # Infinite loop to simulate a do-while loop
         try:
-            if is_legacy:
-                receipt = send_web3_transaction_legacy(web3, private_key, txn_dict, max_transaction_cost_usd)
-            else:
-                receipt = send_web3_transaction_modern(web3, private_key, txn_dict, max_transaction_cost_usd)
-            return receipt  # If successful, return the receipt
+            return send_attempt()  # If successful, return the result
         except Exception as e:
             error_message = str(e)
-            if "max fee per gas less than block base fee" in error_message or \
-               "Max possible fee" in error_message or \
-               "exceeds threshold" in error_message or \
-               "err: max fee per gas less than block base fee" in error_message:
-                attempt += 1
-                if attempt > retries: 
-                    raise
-                else:
-                    print(f"Attempt {attempt + 1}: Error encountered ({error_message}). Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-            else:
+            action = _send_retry_action(txn_dict, error_message, attempt, retries)
+            if action == SEND_RETRY_RAISE:
                 raise
+            attempt += 1
+            if action == SEND_RETRY_RESYNC:
+                txn_dict['nonce'] = _nonce_manager.resync(web3, txn_dict['from'])
+            _print_send_retry(action, attempt, error_message, txn_dict, retry_delay)
+            if action == SEND_RETRY_WAIT:
+                time.sleep(retry_delay)
+
+
+# Returns True if a send failed only because fees were too high or too low at the time, and is worth retrying later
+def is_retryable_fee_error(error_message):
+    return "max fee per gas less than block base fee" in error_message or \
+           "Max possible fee" in error_message or \
+           "exceeds threshold" in error_message or \
+           "err: max fee per gas less than block base fee" in error_message
+
+
+# Returns True if the node rejected a transaction because its nonce was already used or is otherwise stale.
+# "already known" is not one of these: it means this exact transaction is already in the mempool, and re-signing
+# it with a new nonce would send it twice (see send_signed_transaction)
+def is_nonce_error(error_message):
+    error_message = error_message.lower()
+    return "nonce too low" in error_message or \
+           "invalid nonce" in error_message
+
+
+# Returns True if the node already holds this exact signed transaction in its mempool
+def is_already_known_error(error_message):
+    return "already known" in error_message.lower()
+
+
+# Returns the signed transaction's hash if the send error says the node already has it, otherwise None
+def _already_known_hash(signed_txn, error):
+    if not is_already_known_error(str(error)):
+        return None
+    print(f"{C_YELLOW}Transaction {signed_txn.hash.hex()} is already in the mempool, treating it as submitted{C_END}")
+    return signed_txn.hash
+
+
+# Broadcasts a signed transaction. If the node already has it (an earlier attempt got through), the transaction
+# counts as submitted and its hash is returned instead of raising
+def send_signed_transaction(web3, signed_txn):
+    try:
+        return web3.eth.send_raw_transaction(signed_txn.rawTransaction)
+    except Exception as e:
+        txn_hash = _already_known_hash(signed_txn, e)
+        if txn_hash is None:
+            raise
+        return txn_hash
+
+
+def send_web3_transaction_legacy(web3, private_key, txn_dict, max_transaction_cost_usd, use_gas_cache=False):
+    txn_hash = submit_web3_transaction_legacy(web3, private_key, txn_dict, max_transaction_cost_usd, use_gas_cache)
+    txn_receipt = web3.eth.wait_for_transaction_receipt(txn_hash)
+    if use_gas_cache:
+        _gas_estimate_cache.observe_receipt(GasEstimateCache.make_key(txn_dict), txn_dict['gas'], txn_receipt)
+
+    # Arbitrum and other L2s might use effectiveGasPrice for fee calculation
+    effective_gas_price = txn_receipt.effectiveGasPrice
+    gas_used = txn_receipt.gasUsed
+    actual_transaction_fee_eth = effective_gas_price * gas_used
+
+    actual_transaction_fee_usd = eth_to_usd(web3.from_wei(actual_transaction_fee_eth, 'ether'), round_result=False)
+    print(f"Actual Transaction Fee: {web3.from_wei(actual_transaction_fee_eth, 'ether')} ETH (${actual_transaction_fee_usd} USD)")
+    return txn_receipt
 
 
-def send_web3_transaction_legacy(web3, private_key, txn_dict, max_transaction_cost_usd):
+def submit_web3_transaction_legacy(web3, private_key, txn_dict, max_transaction_cost_usd, use_gas_cache=False):
     max_transaction_cost_usd = Decimal(max_transaction_cost_usd)
 
     # Convert the USD cost threshold to ETH
@@ -667,10 +2038,9 @@ def send_web3_transaction_legacy(web3, private_key, txn_dict, max_transaction_co
     #print(f"Max Transaction Fee in ETH: {max_transaction_fee_eth} ETH")
 
     # Estimate effective gas price and gas limit
-    effective_gas_price = web3.eth.get_block('latest').get('baseFeePerGas', web3.to_wei(1, 'gwei'))
+    effective_gas_price = get_base_fee(default=web3.to_wei(1, 'gwei'))
     txn_dict['gasPrice'] = effective_gas_price
-    estimated_gas_limit = web3.eth.estimate_gas(txn_dict)
-    txn_dict['gas'] = int(estimated_gas_limit * 1.2)  # Add a 2% buffer for gas limit
+    txn_dict['gas'] = estimate_gas_limit(web3, txn_dict, fresh_margin=1.2, use_cache=use_gas_cache)  # Add a 2% buffer for gas limit
 
     # Estimate the transaction fee in ETH and then convert to USD
     estimated_transaction_fee_eth = txn_dict['gas'] * effective_gas_price
@@ -686,24 +2056,31 @@ def send_web3_transaction_legacy(web3, private_key, txn_dict, max_transaction_co
     # Sign and send the transaction
     signed_txn = web3.eth.account.sign_transaction(txn_dict, private_key=private_key)
 
-    txn_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
+    return send_signed_transaction(web3, signed_txn)
+
+
+def send_web3_transaction_modern(web3, private_key, txn_dict, max_transaction_cost_usd, use_gas_cache=False):
+    txn_hash = submit_web3_transaction_modern(web3, private_key, txn_dict, max_transaction_cost_usd, use_gas_cache)
     txn_receipt = web3.eth.wait_for_transaction_receipt(txn_hash)
+    if use_gas_cache:
+        _gas_estimate_cache.observe_receipt(GasEstimateCache.make_key(txn_dict), txn_dict['gas'], txn_receipt)
 
-    # Arbitrum and other L2s might use effectiveGasPrice for fee calculation
-    effective_gas_price = txn_receipt.effectiveGasPrice
+    # Calculate the actual transaction fee in ETH and then convert to USD
+    effective_gas_price = txn_receipt.effectiveGasPrice if hasattr(txn_receipt, 'effectiveGasPrice') else txn_dict['maxFeePerGas']
     gas_used = txn_receipt.gasUsed
     actual_transaction_fee_eth = effective_gas_price * gas_used
-
     actual_transaction_fee_usd = eth_to_usd(web3.from_wei(actual_transaction_fee_eth, 'ether'), round_result=False)
+
     print(f"Actual Transaction Fee: {web3.from_wei(actual_transaction_fee_eth, 'ether')} ETH (${actual_transaction_fee_usd} USD)")
+
     return txn_receipt
 
 
-def send_web3_transaction_modern(web3, private_key, txn_dict, max_transaction_cost_usd):
+def submit_web3_transaction_modern(web3, private_key, txn_dict, max_transaction_cost_usd, use_gas_cache=False):
     max_transaction_cost_usd = Decimal(max_transaction_cost_usd)
 
     # Fetch the current base fee from the latest block
-    base_fee = web3.eth.get_block('latest')['baseFeePerGas']
+    base_fee = get_base_fee()
     
     # Set an extremely low priority fee
     max_priority_fee_per_gas = web3.to_wei(0.00111, 'gwei')  # Minimal tip
@@ -711,9 +2088,8 @@ def send_web3_transaction_modern(web3, private_key, txn_dict, max_transaction_co
     # Set maxFeePerGas just above the base fee to account for fluctuations
     max_fee_per_gas = base_fee + max_priority_fee_per_gas
 
-    # Use the precise gas limit estimate provided by estimate_gas
-    estimated_gas_limit = web3.eth.estimate_gas(txn_dict)
-    txn_dict['gas'] = estimated_gas_limit  # No buffer
+    # Use the precise gas limit estimate provided by estimate_gas (cached estimates still get the cache margin)
+    txn_dict['gas'] = estimate_gas_limit(web3, txn_dict, fresh_margin=1.0, use_cache=use_gas_cache)  # No buffer
 
     # Calculate the max possible transaction fee and convert to USD
     max_possible_fee_eth = txn_dict['gas'] * max_fee_per_gas
@@ -730,17 +2106,112 @@ def send_web3_transaction_modern(web3, private_key, txn_dict, max_transaction_co
     txn_dict['maxFeePerGas'] = max_fee_per_gas
 
     signed_txn = web3.eth.account.sign_transaction(txn_dict, private_key=private_key)
-    txn_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-    txn_receipt = web3.eth.wait_for_transaction_receipt(txn_hash)
+    return send_signed_transaction(web3, signed_txn)
 
-    # Calculate the actual transaction fee in ETH and then convert to USD
-    effective_gas_price = txn_receipt.effectiveGasPrice if hasattr(txn_receipt, 'effectiveGasPrice') else max_fee_per_gas
-    gas_used = txn_receipt.gasUsed
-    actual_transaction_fee_eth = effective_gas_price * gas_used
-    actual_transaction_fee_usd = eth_to_usd(web3.from_wei(actual_transaction_fee_eth, 'ether'), round_result=False)
 
-    print(f"Actual Transaction Fee: {web3.from_wei(actual_transaction_fee_eth, 'ether')} ETH (${actual_transaction_fee_usd} USD)")
+######################################################
+# ASYNCIO WEB3
+######################################################
+
+# Default number of RPC requests allowed in flight at once in asyncio mode
+DEFAULT_ASYNC_CONCURRENCY = 50
+
+# Global limit on in-flight RPC requests for asyncio mode, created inside the running event loop
+_async_rpc_limiter = None
+
+# Sets the global asyncio concurrency limit. Must be called from inside the running event loop
+def configure_async_concurrency(max_concurrency=DEFAULT_ASYNC_CONCURRENCY):
+    global _async_rpc_limiter
+    _async_rpc_limiter = asyncio.Semaphore(max_concurrency)
 
+
+# Awaits an RPC call while holding a slot of the global concurrency limit
+async def async_rpc(awaitable):
+    if _async_rpc_limiter is None:
+        return await awaitable
+    async with _async_rpc_limiter:
+        return await awaitable
+
+
+class AsyncWeb3Singleton:
+    _web3_Apex = None
+    _BountySystem = None
+
+    @classmethod
+    def get_web3_Apex(cls):
+        if cls._web3_Apex is None:
+            cls._web3_Apex = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(URL_RPC))
+        return cls._web3_Apex
+
+    @classmethod
+    def get_BountySystem(cls):
+        if cls._BountySystem is None:
+            web3_Apex = cls.get_web3_Apex()
+            cls._BountySystem = web3_Apex.eth.contract(address=_contract_BountySystem_addr, abi=get_abi(_abi_URL_BountySystem))
+        return cls._BountySystem
+
+
+# Asyncio variant of send_web3_transaction for an AsyncWeb3 instance, using the legacy gas pricing flow
+# Asyncio counterpart of _send_with_retries around send_web3_transaction_legacy_async, with the same retry decisions
+async def send_web3_transaction_async(web3, private_key, txn_dict, max_transaction_cost_usd=0.0333, retries=120, retry_delay=300, use_gas_cache=False):
+    attempt = 0
+    while True:
+        try:
+            return await send_web3_transaction_legacy_async(web3, private_key, txn_dict, max_transaction_cost_usd, use_gas_cache)
+        except Exception as e:
+            error_message = str(e)
+            action = _send_retry_action(txn_dict, error_message, attempt, retries)
+            if action == SEND_RETRY_RAISE:
+                raise
+            attempt += 1
+            if action == SEND_RETRY_RESYNC:
+                _nonce_manager.invalidate(txn_dict['from'])
+                txn_dict['nonce'] = await _nonce_manager.get_nonce_async(web3, txn_dict['from'])
+            _print_send_retry(action, attempt, error_message, txn_dict, retry_delay)
+            if action == SEND_RETRY_WAIT:
+                await asyncio.sleep(retry_delay)
+
+
+async def send_web3_transaction_legacy_async(web3, private_key, txn_dict, max_transaction_cost_usd, use_gas_cache=False, receipt_poll_latency=1):
+    max_transaction_cost_usd = Decimal(max_transaction_cost_usd)
+
+    # Estimate effective gas price and gas limit
+    effective_gas_price = await asyncio.to_thread(get_base_fee, web3.to_wei(1, 'gwei'))
+    txn_dict['gasPrice'] = effective_gas_price
+    gas_cache_key = GasEstimateCache.make_key(txn_dict) if use_gas_cache else None
+    txn_dict['gas'] = _cached_gas_limit(gas_cache_key)
+    if txn_dict['gas'] is None:
+        estimated_gas_limit = await async_rpc(web3.eth.estimate_gas(txn_dict))
+        _gas_estimate_cache.record(gas_cache_key, estimated_gas_limit)
+        txn_dict['gas'] = int(estimated_gas_limit * 1.2)
+
+    # Estimate the transaction fee in ETH and then convert to USD
+    estimated_transaction_fee_eth = txn_dict['gas'] * effective_gas_price
+    estimated_transaction_fee_usd = eth_to_usd(web3.from_wei(estimated_transaction_fee_eth, 'ether'), round_result=False)
+
+    print(f"Estimated Transaction Fee: {web3.from_wei(estimated_transaction_fee_eth, 'ether')} ETH (${estimated_transaction_fee_usd} USD)")
+
+    # Failsafe check: Throw an error if estimated cost exceeds threshold
+    if estimated_transaction_fee_usd > max_transaction_cost_usd:
+        error_message = f"Estimated fee (${round(estimated_transaction_fee_usd, 4)} USD) exceeds threshold (${round(max_transaction_cost_usd, 4)} USD)"
+        raise ValueError(error_message)
+
+    signed_txn = web3.eth.account.sign_transaction(txn_dict, private_key=private_key)
+    try:
+        txn_hash = await async_rpc(web3.eth.send_raw_transaction(signed_txn.rawTransaction))
+    except Exception as e:
+        txn_hash = _already_known_hash(signed_txn, e)
+        if txn_hash is None:
+            raise
+
+    # Receipt polling does not hold a concurrency slot, so waiting wallets never starve active ones
+    txn_receipt = await web3.eth.wait_for_transaction_receipt(txn_hash, poll_latency=receipt_poll_latency)
+    _gas_estimate_cache.observe_receipt(gas_cache_key, txn_dict['gas'], txn_receipt)
+
+    effective_gas_price = txn_receipt.get('effectiveGasPrice', effective_gas_price)
+    actual_transaction_fee_eth = effective_gas_price * txn_receipt['gasUsed']
+    actual_transaction_fee_usd = eth_to_usd(web3.from_wei(actual_transaction_fee_eth, 'ether'), round_result=False)
+    print(f"Actual Transaction Fee: {web3.from_wei(actual_transaction_fee_eth, 'ether')} ETH (${actual_transaction_fee_usd} USD)")
     return txn_receipt
 
 
@@ -759,11 +2230,217 @@ def get_status_message(txn_reciept):
         return WEB3_STATUS_FAILURE  # Transaction failed    
 
 
+######################################################
+# BACKGROUND RECEIPT TRACKING
+######################################################
+
+# How often the tracker polls for receipts of in-flight transactions, in seconds
+RECEIPT_POLL_INTERVAL = 1.0
+
+# How long a transaction can stay unmined before it is reported as dropped, in seconds
+RECEIPT_TIMEOUT = 300
+
+# How long drain_transactions waits by default. Every transaction gives up after RECEIPT_TIMEOUT, even while
+# receipt polling is failing, so this is only a backstop
+RECEIPT_DRAIN_TIMEOUT = RECEIPT_TIMEOUT + 60
+
+
+class TransactionHandle:
+    """
+    Handle for a submitted transaction whose receipt is fetched by the TransactionTracker.
+    wait() blocks until the transaction is mined (or dropped) and returns the receipt, or None if it was dropped.
+    """
+
+    def __init__(self, txn_hash, from_address=None, label=None, on_success=None, on_failure=None, gas_cache_key=None, gas_limit=None):
+        self.txn_hash = txn_hash
+        self.txn_hash_hex = txn_hash.hex() if hasattr(txn_hash, 'hex') else str(txn_hash)
+        self.from_address = from_address
+        self.label = label
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.gas_cache_key = gas_cache_key
+        self.gas_limit = gas_limit
+        self.submitted_at = time.time()
+        self.receipt = None
+        self.status = WEB3_STATUS_PENDING
+        self.error = None
+        self._done = threading.Event()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.receipt
+
+    def _finish(self, status, receipt=None, error=None):
+        self.receipt = receipt
+        self.status = status
+        self.error = error
+        self._done.set()
+
+
+class TransactionTracker:
+    """
+    Keeps track of submitted transactions and fetches all of their receipts from one background thread,
+    batching every in-flight hash into a single JSON-RPC request per poll.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(TransactionTracker, cls).__new__(cls)
+            cls._instance._pending = {}
+            cls._instance._lock = threading.Lock()
+            cls._instance._thread = None
+            cls._instance.reset_stats()
+        return cls._instance
+
+    def reset_stats(self):
+        self._stats = {'submitted': 0, WEB3_STATUS_SUCCESS: 0, WEB3_STATUS_FAILURE: 0, 'Dropped': 0, 'fee_wei': 0}
+
+    def track(self, txn_hash, from_address=None, label=None, on_success=None, on_failure=None, gas_cache_key=None, gas_limit=None):
+        handle = TransactionHandle(txn_hash, from_address, label, on_success, on_failure, gas_cache_key, gas_limit)
+        with self._lock:
+            self._pending[handle.txn_hash_hex] = handle
+            self._stats['submitted'] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._poll_loop, name="receipt-tracker", daemon=True)
+                self._thread.start()
+        return handle
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def drain(self, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._lock:
+                handles = list(self._pending.values())
+            if not handles:
+                return True
+            for handle in handles:
+                remaining = None if deadline is None else max(0, deadline - time.time())
+                handle.wait(remaining)
+            if deadline is not None and time.time() >= deadline:
+                return self.pending_count() == 0
+
+    def _poll_loop(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                handles = list(self._pending.values())
+
+            try:
+                self._poll_once(handles)
+            except Exception as e:
+                print(f"{C_RED}**Receipt tracker error{C_END}: {type(e).__name__} - {e}")
+                # the timeout still applies while polling fails, otherwise drain() would wait on these forever
+                self._expire_overdue(handles)
+
+            time.sleep(RECEIPT_POLL_INTERVAL)
+
+    def _poll_once(self, handles):
+        batch = JsonRpcBatch()
+        for handle in handles:
+            batch.add('eth_getTransactionReceipt', [handle.txn_hash_hex])
+        raw_receipts = batch.execute()
+
+        unmined = []
+        for handle, raw_receipt in zip(handles, raw_receipts):
+            if raw_receipt is not None:
+                self._complete(handle, _format_raw_receipt(raw_receipt))
+            else:
+                unmined.append(handle)
+        self._expire_overdue(unmined)
+
+    def _expire_overdue(self, handles):
+        for handle in handles:
+            if not handle.done() and time.time() - handle.submitted_at > RECEIPT_TIMEOUT:
+                # never seen mined: the nonce may now be a gap, so let the wallet resync before its next send
+                _nonce_manager.invalidate(handle.from_address)
+                self._complete(handle, None, error=f"Transaction {handle.txn_hash_hex} not mined after {RECEIPT_TIMEOUT} seconds")
+
+    def _complete(self, handle, receipt, error=None):
+        if receipt is not None:
+            status = get_status_message(receipt)
+        else:
+            status = 'Dropped'
+
+        with self._lock:
+            self._pending.pop(handle.txn_hash_hex, None)
+            self._stats[status] += 1
+            if receipt is not None:
+                self._stats['fee_wei'] += receipt.gasUsed * receipt.get('effectiveGasPrice', 0)
+
+        _gas_estimate_cache.observe_receipt(handle.gas_cache_key, handle.gas_limit, receipt)
+        handle._finish(status, receipt, error)
+
+        callback = handle.on_success if status == WEB3_STATUS_SUCCESS else handle.on_failure
+        if callback is not None:
+            try:
+                callback(handle)
+            except Exception as e:
+                print(f"{C_RED}**Receipt callback error for {handle.txn_hash_hex}{C_END}: {type(e).__name__} - {e}")
+
+    def print_summary(self):
+        with self._lock:
+            stats = dict(self._stats)
+        fee_eth = Web3.from_wei(stats['fee_wei'], 'ether')
+        print(f"Transactions: {stats['submitted']} submitted, "
+              f"{C_GREEN}{stats[WEB3_STATUS_SUCCESS]} successful{C_END}, "
+              f"{C_RED}{stats[WEB3_STATUS_FAILURE]} failed{C_END}, "
+              f"{C_YELLOW}{stats['Dropped']} dropped{C_END}, "
+              f"fees {fee_eth} ETH (${eth_to_usd(fee_eth, round_result=False)} USD)")
+
+
+_transaction_tracker = TransactionTracker()
+
+
+# Turns a raw eth_getTransactionReceipt result into the same shape web3 returns from wait_for_transaction_receipt
+def _format_raw_receipt(raw_receipt):
+    receipt = dict(raw_receipt)
+    for field in ('status', 'gasUsed', 'effectiveGasPrice', 'cumulativeGasUsed', 'blockNumber', 'transactionIndex'):
+        if isinstance(receipt.get(field), str):
+            receipt[field] = int(receipt[field], 16)
+    for field in ('transactionHash', 'blockHash'):
+        if receipt.get(field) is not None:
+            receipt[field] = HexBytes(receipt[field])
+    return AttributeDict(receipt)
+
+
+# Submits a transaction without waiting for it to be mined and hands the receipt wait to the background tracker
+# Returns a TransactionHandle; raises the same errors as send_web3_transaction if the transaction can't be submitted
+def submit_tracked_transaction(web3, private_key, txn_dict, max_transaction_cost_usd=0.0333, is_legacy=True, retries=120, retry_delay=300,
+                               label=None, on_success=None, on_failure=None, use_gas_cache=False):
+    txn_hash = submit_web3_transaction(web3, private_key, txn_dict, max_transaction_cost_usd, is_legacy, retries, retry_delay, use_gas_cache)
+    gas_cache_key = GasEstimateCache.make_key(txn_dict) if use_gas_cache else None
+    return _transaction_tracker.track(txn_hash, txn_dict.get('from'), label, on_success, on_failure, gas_cache_key, txn_dict.get('gas'))
+
+
+# Blocks until every tracked transaction has been mined or dropped, or timeout seconds (None waits without a limit)
+# Returns False if transactions were still pending when it gave up
+def drain_transactions(timeout=RECEIPT_DRAIN_TIMEOUT):
+    drained = _transaction_tracker.drain(timeout)
+    if not drained:
+        print(f"{C_YELLOW}Stopped waiting on {_transaction_tracker.pending_count()} pending transaction(s) after {timeout} seconds{C_END}")
+    return drained
+
+
+# Prints the totals of tracked transactions since the last summary, then resets them
+def print_transaction_summary():
+    _transaction_tracker.print_summary()
+    _transaction_tracker.reset_stats()
+
+
 def send_l2_eth(sender, recipient, amount_in_eth, private_key, gas_limit=30000, subtract_gas=False):
     web3 = Web3Singleton.get_web3_Apex()
 
     # Calculate gas costs based on gas price and gas limit
-    gas_price = web3.eth.gas_price
+    gas_price = get_gas_price()
     gas_cost = gas_price * gas_limit
 
     # Convert the amount_in_eth to wei
@@ -783,7 +2460,7 @@ def send_l2_eth(sender, recipient, amount_in_eth, private_key, gas_limit=30000,
         print(f"Skipping: Sender and Recipient Address is the same {sender_addr}")
         return None
 
-    nonce = web3.eth.get_transaction_count(sender_addr, 'latest')
+    nonce = get_next_nonce(web3, sender_addr)
 
     print("nonce: ", nonce)
 
@@ -809,7 +2486,7 @@ def send_l2_eth(sender, recipient, amount_in_eth, private_key, gas_limit=30000,
 # returns a list of pirate IDs associated with their account as a list of integer values
 def get_pirate_ids(address):
     query = make_pirate_query(address)
-    json_data = get_data(query)
+    json_data = get_data_paginated(query, PIRATE_QUERY_PATH)
 
     pirate_ids = [
         nft['id']
@@ -877,49 +2554,51 @@ def move_captain_nft_to_front(pirate_nfts, captain_token_id):
 
 
 def get_pirate_nfts_dictionary(addresses):
-    formatted_output = format_addresses_for_query(addresses)
+    def fetch_chunk(chunk):
+        formatted_output = format_addresses_for_query(chunk)
+        query = f"""
 
-    query = f"""
+            fragment WorldEntityComponentValueCore on WorldEntityComponentValue {{
+            id
+            fields {{
+                name
+                value
+            }}
+            }}
 
-        fragment WorldEntityComponentValueCore on WorldEntityComponentValue {{
-        id
-        fields {{
+            fragment WorldEntityCore on WorldEntity {{
+            id
+            components {{
+                ...WorldEntityComponentValueCore
+            }}
             name
-            value
-        }}
-        }}
-
-        fragment WorldEntityCore on WorldEntity {{
-        id
-        components {{
-            ...WorldEntityComponentValueCore
-        }}
-        name
-        }}
+            }}
 
-        {{
-            accounts(where: {{address_in: {formatted_output}}}){{
-                address
-                nfts(where:{{or: [{{nftType: "pirate"}}, {{nftType: "starterpirate"}}]}}){{
-                    name
-                    nftType
+            {{
+                accounts({PAGE_ARGS}, where: {{address_in: {formatted_output}, {PAGE_WHERE}}}){{
                     id
-                    tokenId
-                    traits {{
-                        value
-                        metadata {{
-                            name
-                        }}
-                    }}             
+                    address
+                    nfts({SUBGRAPH_FIRST_PAGE}, where: {{nftType_in: ["pirate", "starterpirate"]}}){{
+                        name
+                        nftType
+                        id
+                        tokenId
+                        traits {{
+                            value
+                            metadata {{
+                                name
+                            }}
+                        }}             
+                    }}
+                    worldEntity{{
+                        ...WorldEntityCore
+                    }}        
                 }}
-                worldEntity{{
-                    ...WorldEntityCore
-                }}        
             }}
-        }}
-        """
+            """
+        return get_all_account_pirates(query)
 
-    json_data = get_data(query)
+    json_data = get_accounts_chunked(addresses, fetch_chunk)
     captain_token_ids = extract_captain_token_ids(json_data)
 
     pirate_nfts_dict = {}
@@ -953,43 +2632,53 @@ def get_pirate_nfts_dictionary(addresses):
     return pirate_nfts_dict
 
 
+# Runs a paginated accounts query whose nfts are pirates, then pages through any account holding more than one page of them
+def get_all_account_pirates(query):
+    json_data = get_data_paginated(query, ['data', 'accounts'], page_size=SUBGRAPH_ACCOUNTS_PAGE_SIZE)
+    return fill_nested_pages(json_data, ['data', 'accounts'], 'nfts',
+                             lambda account: make_pirate_query(account['address']), PIRATE_QUERY_PATH)
+
+
 def get_pirate_ids_dictionary(addresses):
-    formatted_output = format_addresses_for_query(addresses)
-    query = f"""
+    def fetch_chunk(chunk):
+        formatted_output = format_addresses_for_query(chunk)
+        query = f"""
 
-        fragment WorldEntityComponentValueCore on WorldEntityComponentValue {{
-        id
-        fields {{
-            name
-            value
-        }}
-        }}
+            fragment WorldEntityComponentValueCore on WorldEntityComponentValue {{
+            id
+            fields {{
+                name
+                value
+            }}
+            }}
 
-        fragment WorldEntityCore on WorldEntity {{
-        id
-        components {{
-            ...WorldEntityComponentValueCore
-        }}
-        name
-        }}
+            fragment WorldEntityCore on WorldEntity {{
+            id
+            components {{
+                ...WorldEntityComponentValueCore
+            }}
+            name
+            }}
 
-        {{
-            accounts(where: {{address_in: {formatted_output}}}){{
-                address
-                nfts(where:{{or: [{{nftType: "pirate"}}, {{nftType: "starterpirate"}}]}}){{
-                    name
-                    nftType
+            {{
+                accounts({PAGE_ARGS}, where: {{address_in: {formatted_output}, {PAGE_WHERE}}}){{
                     id
-                    tokenId         
+                    address
+                    nfts({SUBGRAPH_FIRST_PAGE}, where: {{nftType_in: ["pirate", "starterpirate"]}}){{
+                        name
+                        nftType
+                        id
+                        tokenId         
+                    }}
+                    worldEntity{{
+                        ...WorldEntityCore
+                    }}        
                 }}
-                worldEntity{{
-                    ...WorldEntityCore
-                }}        
             }}
-        }}
-        """
+            """
+        return get_all_account_pirates(query)
 
-    json_data = get_data(query)
+    json_data = get_accounts_chunked(addresses, fetch_chunk)
 
     captain_token_ids = extract_captain_token_ids(json_data)
 
@@ -1014,19 +2703,22 @@ def get_pirate_ids_dictionary(addresses):
 
 
 def get_currency_dictionary(addresses):
-    formatted_output = format_addresses_for_query(addresses)
-    query = f"""
-    {{
-        accounts(where: {{address_in: {formatted_output}}}){{
-            address
-            currencies{{
-                amount
+    def fetch_chunk(chunk):
+        formatted_output = format_addresses_for_query(chunk)
+        query = f"""
+        {{
+            accounts({PAGE_ARGS}, where: {{address_in: {formatted_output}, {PAGE_WHERE}}}){{
+                id
+                address
+                currencies{{
+                    amount
+                }}
             }}
         }}
-    }}
-    """
+        """
+        return get_data_paginated(query, ['data', 'accounts'], page_size=SUBGRAPH_ACCOUNTS_PAGE_SIZE)
 
-    json_data = get_data(query)
+    json_data = get_accounts_chunked(addresses, fetch_chunk)
 
     # Create a dictionary to store currency amounts for each address
     currency_dict = {}
@@ -1041,6 +2733,78 @@ def get_currency_dictionary(addresses):
 
     return currency_dict
 
+
+# Fields of each game item, shared by the wallet items query and the follow up pages for wallets with more than one page of items
+WALLET_GAME_ITEM_FIELDS = """
+          id
+          amount
+          gameItem{
+            worldEntity{
+                name
+            }
+          }"""
+
+
+def _wallet_items_query(formatted_output):
+    return f"""
+    {{
+      accounts({PAGE_ARGS}, where: {{address_in: {formatted_output}, {PAGE_WHERE}}}){{
+        id
+        address
+        currencies{{
+            amount
+        }}
+        gameItems({SUBGRAPH_FIRST_PAGE}, where: {{amount_gt:0}}){{
+          {WALLET_GAME_ITEM_FIELDS}
+        }}
+      }}
+    }}
+    """
+
+
+def _wallet_items_rest_query(account):
+    return f"""
+    {{
+      accounts(where: {{address: "{account['address']}"}}){{
+        gameItems({PAGE_ARGS}, where: {{amount_gt:0, {PAGE_WHERE}}}){{
+          {WALLET_GAME_ITEM_FIELDS}
+        }}
+      }}
+    }}
+    """
+
+
+def _fetch_wallet_items_chunk(addresses):
+    data = get_data_paginated(_wallet_items_query(format_addresses_for_query(addresses)), ['data', 'accounts'], page_size=SUBGRAPH_ACCOUNTS_PAGE_SIZE)
+    return fill_nested_pages(data, ['data', 'accounts'], 'gameItems', _wallet_items_rest_query, ['data', 'accounts', 0, 'gameItems'])
+
+
+# Returns {'data': {'accounts': [...]}} with every wallet's currencies and game items, in address order
+def fetch_wallet_items(addresses):
+    return get_accounts_chunked(addresses, _fetch_wallet_items_chunk)
+
+
+# Returns a wallet by item DataFrame of int64 amounts: one row per wallet (index 'wallet', lowercase address, in address
+# order) and one column per game item name, 0 where a wallet has none. With include_pgld the first column is PGLD in wei
+# (as a string, it doesn't fit in int64). Wallets the subgraph doesn't know are left out
+def get_wallet_item_matrix(addresses, include_pgld=False):
+    accounts = fetch_wallet_items(addresses)['data']['accounts']
+
+    wallets = []
+    rows = []
+    for account in accounts:
+        wallets.append(account['address'].lower())
+        rows.append({game_item['gameItem']['worldEntity']['name']: int(game_item['amount']) for game_item in account.get('gameItems') or []})
+
+    df = pd.DataFrame.from_records(rows, index=pd.Index(wallets, name='wallet')) if rows else pd.DataFrame(index=pd.Index([], name='wallet'))
+    df = df.fillna(0).astype('int64')
+
+    if include_pgld:
+        pgld = [str(account['currencies'][0]['amount']) if account.get('currencies') else '0' for account in accounts]
+        df.insert(0, 'PGLD', pgld)
+
+    return df
+
     
 # Selects a wallet from a CSV returns the name, address, and key associated with the wallet
 # if there is only one address in the csv file, it returns the data instantly 
@@ -1336,11 +3100,18 @@ class PirateCommandMappings:
         initialize(self): Load mappings from Excel if not initialized.
 
         reload_data(self): Load data from an Excel file into a DataFrame. Handles file not found gracefully.
+            Skips the load when the file's mtime and size, or failing that its sha256, are unchanged,
+            and reads from a pickle sidecar next to the workbook when one matches the hash.
 
         get_mappings_df(self): Retrieve pirate command mappings DataFrame.
 
+        get_bounty_name(self, token_id, generation): Bounty name for a pirate, or None.
+
+        get_quest_specs(self, token_id, generation): Parsed quest commands for a pirate, or None.
+
     Attributes:
         df (pandas.DataFrame): DataFrame containing command mappings.
+        index (dict): (tokenId, Gen) -> (bounty name or None, tuple of (quest_name, times_to_execute, energy_threshold) or None).
 
     Usage:
         Create an instance to access mappings via 'get_mappings_df'.
@@ -1353,6 +3124,8 @@ class PirateCommandMappings:
         if cls._instance is None:
             cls._instance = super(PirateCommandMappings, cls).__new__(cls)
             cls._instance.__initialized = False
+            cls._instance._file_stat = None
+            cls._instance._file_hash = None
         return cls._instance
 
     def initialize(self):
@@ -1363,18 +3136,134 @@ class PirateCommandMappings:
 
     def reload_data(self):
         """Load data from an Excel file into a DataFrame. Handles file not found gracefully."""
+        file_path = data_path("inventory/pirate_command.xlsx")
         try:
-            file_path = data_path("inventory/pirate_command.xlsx")
-            self.df = pd.read_excel(file_path, engine='openpyxl')
+            stat = os.stat(file_path)
         except FileNotFoundError:
             print(f"Warning: Pirate command mapping file '{file_path}' not found. Initialize it first.")
-            self.df = pd.DataFrame()  # Create an empty DataFrame if the file doesn't exist.
+            self._file_stat = None
+            self._file_hash = None
+            self._publish(pd.DataFrame())  # Create an empty DataFrame if the file doesn't exist.
+            return
+
+        # cheap check first, mtime and size unchanged means nothing to do
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        if file_stat == self._file_stat:
+            return
+
+        # the file was touched, but only re-parse it if the contents actually changed
+        file_hash = self._hash_file(file_path)
+        if file_hash == self._file_hash:
+            self._file_stat = file_stat
+            return
+
+        df = self._load_sidecar(file_path, file_hash)
+        if df is None:
+            df = pd.read_excel(file_path, engine='openpyxl')
+            self._save_sidecar(file_path, file_hash, df)
+
+        self._publish(df)
+        self._file_stat = file_stat
+        self._file_hash = file_hash
+
+    def _publish(self, df):
+        # build the index before publishing either, so readers never see a DataFrame and index that disagree
+        index = self.build_index(df)
+        self.df = df
+        self.index = index
+
+    @staticmethod
+    def _hash_file(file_path):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _sidecar_path(file_path):
+        return f"{file_path}.pkl"
+
+    def _load_sidecar(self, file_path, file_hash):
+        """Return the DataFrame pickled for this exact workbook hash, or None if there isn't one."""
+        try:
+            with open(self._sidecar_path(file_path), 'rb') as file:
+                entry = pickle.load(file)
+            if entry.get('sha256') == file_hash:
+                return entry['df']
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # a stale or unreadable sidecar just means we parse the workbook again
+            print(f"{C_YELLOW}Ignoring pirate command sidecar{C_END}: {e}")
+        return None
+
+    def _save_sidecar(self, file_path, file_hash, df):
+        try:
+            temp_path = f"{self._sidecar_path(file_path)}.tmp"
+            with open(temp_path, 'wb') as file:
+                pickle.dump({'sha256': file_hash, 'df': df}, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._sidecar_path(file_path))
+        except OSError as e:
+            print(f"{C_RED}**Could not save pirate command sidecar{C_END}: {e}")
+
+    @staticmethod
+    def parse_quest_commands(quest_command_str):
+        """
+        Parse a Quest cell into a tuple of (quest_name, times_to_execute, energy_threshold).
+        Format is: quest_name:times_to_execute:energy_threshold,quest_name:times_to_execute:energy_threshold,...
+        Sets that don't have exactly three parts, or whose numbers don't parse, are skipped.
+        """
+        quest_specs = []
+        for command_set in quest_command_str.split(','):
+            parts = command_set.split(':')
+            if len(parts) == 3:
+                quest_name, times_to_execute, energy_threshold = parts
+                try:
+                    quest_specs.append((quest_name, int(times_to_execute), float(energy_threshold)))
+                except ValueError:
+                    # one bad cell should not keep every other pirate from loading
+                    print(f"{C_RED}Warning: skipping malformed quest command '{command_set}'{C_END}")
+        return tuple(quest_specs)
+
+    @classmethod
+    def build_index(cls, df):
+        """Build the (tokenId, Gen) index, the first row for a pirate wins like the DataFrame lookups did."""
+        index = {}
+        if df.empty or 'tokenId' not in df.columns or 'Gen' not in df.columns:
+            return index
+
+        bounties = df['Bounty'] if 'Bounty' in df.columns else pd.Series(None, index=df.index)
+        quests = df['Quest'] if 'Quest' in df.columns else pd.Series(None, index=df.index)
+
+        for token_id, generation, bounty, quest in zip(df['tokenId'], df['Gen'], bounties, quests):
+            if pd.isna(token_id) or pd.isna(generation):
+                continue
+            key = (int(token_id), int(generation))
+            if key in index:
+                continue
+            bounty_name = bounty if isinstance(bounty, str) else None
+            quest_specs = cls.parse_quest_commands(quest) if isinstance(quest, str) else None
+            index[key] = (bounty_name, quest_specs)
+        return index
 
     def get_mappings_df(self):
         """Retrieve pirate command mappings DataFrame."""
         self.initialize()
         return self.df
 
+    def get_bounty_name(self, token_id, generation):
+        """Bounty name for a pirate, or None if the pirate has no row or no bounty."""
+        self.initialize()
+        entry = self.index.get((int(token_id), int(generation)))
+        return entry[0] if entry is not None else None
+
+    def get_quest_specs(self, token_id, generation):
+        """Parsed quest commands for a pirate, or None if the pirate has no row or its Quest cell is not text."""
+        self.initialize()
+        entry = self.index.get((int(token_id), int(generation)))
+        return entry[1] if entry is not None else None
+
 # Creating a single instance of the PirateCommandMappings class, named '_pirate_command_mappings'.
 # Follows the Singleton pattern, ensuring one instance program-wide for central access to mappings.
 # Provides easy access to mappings from different parts of the program.
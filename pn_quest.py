@@ -1,5 +1,8 @@
 import pn_helper as pn
+import threading
+import time
 import traceback
+from functools import lru_cache
 from web3 import Web3, HTTPProvider
 
 web3 = pn.Web3Singleton.get_web3_Apex()
@@ -37,111 +40,154 @@ def get_quests_for_pirate(pirate_entity_id):
     pirate_contract_addr, pirate_token_id = pirate_entity_id.split('-')
     pirate_token_id = int(pirate_token_id)
 
-    pirate_command_mappings_df = pn._pirate_command_mappings.get_mappings_df()
-
     # Set the appropriate generation to make sure we look up the proper pirate
     generation = 1 if pirate_contract_addr != pn._contract_PirateNFT_addr else 0
 
-    matching_row = pirate_command_mappings_df[(pirate_command_mappings_df['tokenId'] == pirate_token_id) & (pirate_command_mappings_df['Gen'] == generation)]
-
-    if not matching_row.empty:
-        # Format is: quest_name:times_to_execute:energy_threshold,times_to_execute:energy_threshold,...
-        quest_command_str = matching_row.iloc[0]['Quest']
-        if isinstance(quest_command_str, str):
-            quest_commands = []  # List to store QuestCommand instances
-
-            # Split the quest_command_str by commas to get sets of commands
-            command_sets = quest_command_str.split(',')
-
-            for command_set in command_sets:
-                # Split each set by colons to extract quest name, times to execute, and energy threshold
-                parts = command_set.split(':')
-                if len(parts) == 3:
-                    quest_name, times_to_execute, energy_threshold = parts
-                    times_to_execute = int(times_to_execute)
-                    energy_threshold = float(energy_threshold)
-
-                    # Create a QuestCommand instance and append it to the list
-                    quest_command = QuestCommand(
-                        quest_name=quest_name,
-                        times_to_execute=times_to_execute,
-                        pirate_entity_id=pirate_entity_id,
-                        energy_threshold=energy_threshold
-                    )
-                    quest_commands.append(quest_command)
-
-            return quest_commands  # Return the list of QuestCommand instances
-
-    return None  # Token ID and generation not found in the DataFrame or quest_command_str is not a string
+    # Quest commands are parsed once when the mappings load, format is: quest_name:times_to_execute:energy_threshold,...
+    quest_specs = pn._pirate_command_mappings.get_quest_specs(pirate_token_id, generation)
+    if quest_specs is None:
+        return None  # Token ID and generation not found in the mappings or quest_command_str is not a string
+
+    # Create a QuestCommand instance for each parsed command
+    return [
+        QuestCommand(
+            quest_name=quest_name,
+            times_to_execute=times_to_execute,
+            pirate_entity_id=pirate_entity_id,
+            energy_threshold=energy_threshold
+        )
+        for quest_name, times_to_execute, energy_threshold in quest_specs
+    ]
+
+
+# Token type mapping
+TOKEN_TYPE_MAPPING = {'ERC1155':3, 'ERC721': 2,'ERC20': 1}
+
+# How long an unknown quest id is remembered before another uncached reload is tried for it, in seconds
+QUEST_MISS_RETRY = 15 * 60
+
+
+@lru_cache(maxsize=None)
+def checksum_address(address):
+    return Web3.to_checksum_address(address)
+
+
+class QuestInputIndex:
+    """
+    Index of quest id -> pre-encoded quest inputs, built once from fetch_quest_data.
+
+    Each input is an immutable tuple of (token type, checksummed contract, token id, amount, is_pirate_placeholder),
+    where is_pirate_placeholder marks the ERC721 input with token id 0 that gets the questing pirate's token id.
+    The quest data itself is never modified, so concurrent quests can share one index.
+
+    An unknown quest id triggers one reload straight from the subgraph (the cached quest list can be hours old).
+    If the id is still unknown it is remembered, and isn't reloaded for again until QUEST_MISS_RETRY has passed.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(QuestInputIndex, cls).__new__(cls)
+            cls._instance._index = None
+            cls._instance._missed = {}
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    def reload_data(self, use_cache=True):
+        all_quests_data = pn.fetch_quest_data(use_cache)
+
+        index = {}
+        for quest in all_quests_data['data']['quests']:
+            quest_inputs = []
+            for input_data in quest['inputs']:
+                token_pointer = input_data['tokenPointer']
+                token_type = TOKEN_TYPE_MAPPING.get(token_pointer['tokenType'], 0)  # Default to 0 if not found
+                token_id = int(token_pointer['tokenId'])
+                quest_inputs.append((
+                    token_type,
+                    checksum_address(token_pointer['tokenContract']['address']),
+                    token_id,
+                    int(token_pointer['amount']),
+                    token_type == 2 and token_id == 0
+                ))
+            index[quest['id']] = tuple(quest_inputs)
+
+        self._index = index
+
+    def get_inputs(self, quest_id):
+        quest_id = str(quest_id)
+        index = self._index
+        if index is not None and quest_id in index:
+            return index[quest_id]
+
+        with self._lock:
+            if self._index is None:
+                self.reload_data()
+            if quest_id in self._index:
+                return self._index[quest_id]
+
+            # a quest we haven't seen yet: reload from the subgraph itself, once per id until the retry interval passes
+            missed_at = self._missed.get(quest_id)
+            if missed_at is not None and time.time() - missed_at < QUEST_MISS_RETRY:
+                return None
+            self.reload_data(use_cache=False)
+            if quest_id not in self._index:
+                self._missed[quest_id] = time.time()
+                return None
+            self._missed.pop(quest_id, None)
+            return self._index[quest_id]
+
+
+_quest_input_index = QuestInputIndex()
 
 
 # Executed a quest
-def start_quest(address, private_key, pirate_id, quest_data, txn_cap=0.0369):
+# With fire_and_forget the transaction is handed to the background receipt tracker and the status is Pending;
+# on_success(handle) / on_failure(handle) are then called from the tracker once the quest is mined, reverts or is dropped
+def start_quest(address, private_key, pirate_id, quest_data, txn_cap=0.0369, fire_and_forget=False, on_success=None, on_failure=None):
 
     # 1. Convert the graph ID to token ID & Contract
     token_contract, token_id = pn.graph_id_to_address_and_tokenId(pirate_id)
 
-    # 2. Fetch comprehensive quest data
-    all_quests_data = pn.fetch_quest_data()
-
-    # 3. Extract input details for the specified quest ID
-    quest_inputs = None
-    for q in all_quests_data['data']['quests']:
-        if q['id'] == quest_data['id']:
-            quest_inputs = q['inputs']
-            break
+    # 2. Look up the pre-encoded inputs for the quest
+    quest_inputs = _quest_input_index.get_inputs(quest_data['id'])
 
     if not quest_inputs:
         print(f"Error: No quest inputs found for quest ID: {quest_data['id']}")
         return None, "Failed due to missing quest inputs"
 
-    # Token type mapping
-    token_type_mapping = {'ERC1155':3, 'ERC721': 2,'ERC20': 1}
-
-    # 4. Construct the input tuples for the quest
-    quest_inputs_list = []
-
-    # 5. Append required game items for the quest
-    for input_data in quest_inputs:
-        token_type_str = input_data['tokenPointer']['tokenType']
-        token_type_int = token_type_mapping.get(token_type_str, 0)  # Default to 0 if not found
-
-        # Check if this is the pirate data and replace the placeholder token ID
-        if token_type_int == 2 and int(input_data['tokenPointer']['tokenId']) == 0:
-            input_data['tokenPointer']['tokenId'] = str(token_id)
-
-        quest_inputs_list.append((
-            token_type_int,
-            Web3.to_checksum_address(input_data['tokenPointer']['tokenContract']['address']),
-            int(input_data['tokenPointer']['tokenId']),
-            int(input_data['tokenPointer']['amount'])
-        ))
-
-    # 6. Construct the quest_params_data using the input list
+    # 3. Construct the quest_params_data, substituting the pirate token ID into the pirate placeholder input
+    # and replacing the Pirate NFT contract address with whatever the NFT token address we get it, to support the starter pirates
+    pirate_contract = checksum_address(token_contract)
     quest_params_data = (
         int(quest_data['id']),  # questId
-        # Code to replace the Pirate NFT contract address with whatever the NFT token address we get it, to support the starter pirates
         [
             (
-                quest_input[0], 
-                Web3.to_checksum_address(token_contract), 
-                quest_input[2], 
-                quest_input[3]
-            ) 
-            for quest_input in quest_inputs_list
+                token_type,
+                pirate_contract,
+                token_id if is_pirate_placeholder else input_token_id,
+                amount
+            )
+            for token_type, input_contract, input_token_id, amount, is_pirate_placeholder in quest_inputs
         ]
     )
 
-    # 7. Create and attempt transaction
+    # 4. Create and attempt transaction
     try:
         txn_dict = {
             'from': address,
             'to': quest_contract.address,
             'value': 0,
-            'nonce': web3.eth.get_transaction_count(address),
-            'gasPrice': web3.eth.gas_price,
+            'gasPrice': pn.get_gas_price(),
             'data': quest_contract.encodeABI(fn_name='startQuest', args=[quest_params_data])
         }
+        txn_dict['nonce'] = pn.get_next_nonce(web3, address)
+
+        if fire_and_forget:
+            handle = pn.submit_tracked_transaction(web3, private_key, txn_dict, max_transaction_cost_usd=txn_cap, retries=1000, retry_delay=5,
+                                                   label=f"startQuest {quest_data['id']}",
+                                                   on_success=on_success, on_failure=on_failure)
+            return handle.txn_hash_hex, handle.status
 
         # Send the transaction
         txn_receipt = pn.send_web3_transaction(web3, private_key, txn_dict, max_transaction_cost_usd=txn_cap, retries=1000, retry_delay=5)